@@ -0,0 +1,13 @@
+"""
+Loads the .env file into the environment.
+
+Settings are read with os.getenv when their module is imported, so this
+module must be imported before any other app module by every entry
+point (the API in app/main.py and the command line tools). Variables
+that are already set in the environment take precedence.
+"""
+
+from dotenv import load_dotenv
+
+
+load_dotenv()
@@ -0,0 +1,335 @@
+"""
+Online backups of the SQLite database.
+
+Backups are taken with SQLite's online backup API while the API keeps
+running. Pages are copied in small steps with pauses in between, so
+writers are never blocked for long. A write by another connection makes
+SQLite restart the copy; if that happens repeatedly under sustained
+write load, the copy is retried with larger steps, and as a last resort
+done in a single step that blocks writers until it finishes. Every
+backup is checked with PRAGMA integrity_check before it is kept, and
+only the newest backups are retained.
+
+Run from the backend directory:
+    python -m app.db.backup create
+    python -m app.db.backup list
+    python -m app.db.backup restore app/db/backups/journal-20250101-120000.db
+"""
+
+import argparse
+import glob
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional
+
+import app.config  # noqa: F401  pylint: disable=unused-import
+from app.db.database import BASE_DIR, engine
+
+
+BACKUP_DIR = os.getenv("BACKUP_DIR") or os.path.join(BASE_DIR, "backups")
+# Hours between scheduled backups, 0 disables the scheduler
+BACKUP_INTERVAL_HOURS = float(os.getenv("BACKUP_INTERVAL_HOURS", "0"))
+BACKUP_RETENTION = int(os.getenv("BACKUP_RETENTION", "7"))
+# Pages copied per step and pause between steps in seconds
+BACKUP_PAGES_PER_STEP = int(os.getenv("BACKUP_PAGES_PER_STEP", "256"))
+BACKUP_STEP_SLEEP = float(os.getenv("BACKUP_STEP_SLEEP", "0.05"))
+# Restarts caused by concurrent writes before a copy attempt is given up
+MAX_RESTARTS = 3
+# Attempts with a larger page step before copying in a single step
+MAX_COPY_ATTEMPTS = 3
+STEP_GROWTH = 8
+
+logger = logging.getLogger("reflecta.backup")
+
+
+class BackupError(Exception):
+    """Raised when a backup or restore fails or a backup is corrupt."""
+
+
+class CopyRestarted(Exception):
+    """Raised from the progress callback to stop a restarting copy."""
+
+
+def database_path() -> str:
+    """
+    Returns the path of the application's SQLite database file.
+
+    Raises:
+        BackupError: If the database is not a SQLite file.
+
+    Returns:
+        str: The path of the database file.
+    """
+    if engine.url.get_backend_name() != "sqlite" or \
+            engine.url.database in (None, "", ":memory:"):
+        raise BackupError("Backups require a SQLite database file")
+    return engine.url.database
+
+
+def copy_database(source: sqlite3.Connection, target: sqlite3.Connection,
+                  pages: int = BACKUP_PAGES_PER_STEP,
+                  sleep: float = BACKUP_STEP_SLEEP) -> int:
+    """
+    Copies a database with the online backup API in small steps.
+
+    Each step holds a read lock on the source, which blocks writers in
+    rollback journal mode. When writes keep restarting the copy, it is
+    attempted again with a larger step, so fewer steps are needed and
+    writes between them restart it less often. If every attempt
+    restarts, the database is copied in a single step.
+
+    Args:
+        source (sqlite3.Connection): The database to copy.
+        target (sqlite3.Connection): The database to overwrite.
+        pages (int): The number of pages copied per step.
+        sleep (float): The pause between steps in seconds.
+
+    Returns:
+        int: The number of restarts caused by concurrent writes.
+    """
+    restarts = 0
+
+    for _ in range(MAX_COPY_ATTEMPTS):
+        state = {"remaining": None, "restarts": 0}
+
+        def progress(status, remaining, total):
+            # pylint: disable=unused-argument
+            nonlocal restarts
+            # The remaining page count grows again when SQLite restarts
+            if state["remaining"] is not None and \
+                    remaining > state["remaining"]:
+                restarts += 1
+                state["restarts"] += 1
+                if state["restarts"] >= MAX_RESTARTS:
+                    raise CopyRestarted()
+            state["remaining"] = remaining
+
+        try:
+            source.backup(target, pages=pages, progress=progress,
+                          sleep=sleep)
+            return restarts
+        except CopyRestarted:
+            pages *= STEP_GROWTH
+
+    # The single step holds the read lock for the whole copy, so writers
+    # are blocked until it finishes
+    logger.warning(
+        "Backup restarted %d times under write load, copying in a single "
+        "step; writes are blocked until the copy finishes", restarts
+    )
+    source.backup(target, pages=-1)
+    return restarts
+
+
+def check_integrity(path: str) -> None:
+    """
+    Runs PRAGMA integrity_check on a database file.
+
+    Args:
+        path (str): The database file.
+
+    Raises:
+        BackupError: If the file is missing or corrupt.
+    """
+    if not os.path.exists(path):
+        raise BackupError(f"Backup {path} does not exist")
+    connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        result = connection.execute("PRAGMA integrity_check").fetchall()
+    except sqlite3.DatabaseError as exc:
+        raise BackupError(f"Backup {path} is not a valid database: {exc}") \
+            from exc
+    finally:
+        connection.close()
+    if result != [("ok",)]:
+        problems = "; ".join(row[0] for row in result[:5])
+        raise BackupError(f"Backup {path} failed the integrity check: {problems}")
+
+
+def list_backups(backup_dir: str = BACKUP_DIR) -> List[str]:
+    """
+    Lists the backups in a directory.
+
+    Args:
+        backup_dir (str): The backup directory.
+
+    Returns:
+        List[str]: The backup paths, newest first.
+    """
+    return sorted(glob.glob(os.path.join(backup_dir, "journal-*.db")),
+                  reverse=True)
+
+
+def prune_backups(backup_dir: str = BACKUP_DIR,
+                  retention: int = BACKUP_RETENTION) -> List[str]:
+    """
+    Deletes all but the newest backups.
+
+    Args:
+        backup_dir (str): The backup directory.
+        retention (int): The number of backups to keep.
+
+    Returns:
+        List[str]: The deleted backup paths.
+    """
+    expired = list_backups(backup_dir)[max(retention, 1):]
+    for path in expired:
+        os.remove(path)
+    return expired
+
+
+def create_backup(backup_dir: str = BACKUP_DIR,
+                  retention: int = BACKUP_RETENTION,
+                  pages: int = BACKUP_PAGES_PER_STEP,
+                  sleep: float = BACKUP_STEP_SLEEP,
+                  prefix: str = "journal") -> str:
+    """
+    Creates a verified backup of the database and applies the retention.
+
+    Args:
+        backup_dir (str): The backup directory.
+        retention (int): The number of backups to keep.
+        pages (int): The number of pages copied per step.
+        sleep (float): The pause between steps in seconds.
+        prefix (str): The file name prefix, only "journal" backups count
+        towards the retention.
+
+    Raises:
+        BackupError: If the copy fails its integrity check.
+
+    Returns:
+        str: The path of the new backup.
+    """
+    os.makedirs(backup_dir, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(backup_dir, f"{prefix}-{stamp}.db")
+    tmp_path = f"{path}.tmp"
+
+    source = sqlite3.connect(database_path(), timeout=30)
+    try:
+        target = sqlite3.connect(tmp_path)
+        try:
+            copy_database(source, target, pages, sleep)
+        finally:
+            target.close()
+        check_integrity(tmp_path)
+    except Exception:
+        # Partial copies are not matched by prune_backups
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    finally:
+        source.close()
+    os.replace(tmp_path, path)
+    prune_backups(backup_dir, retention)
+    return path
+
+
+def restore_backup(path: str, backup_dir: str = BACKUP_DIR) -> str:
+    """
+    Replaces the database with a backup after verifying it. The current
+    database is backed up first. Open connections of this process are
+    closed, other processes should be stopped during the restore.
+
+    Args:
+        path (str): The backup to restore.
+        backup_dir (str): The directory for the safety backup.
+
+    Raises:
+        BackupError: If the backup is corrupt.
+
+    Returns:
+        str: The path of the safety backup of the replaced database.
+    """
+    check_integrity(path)
+    safety_path = create_backup(backup_dir, retention=10**6,
+                                pages=-1, prefix="pre-restore")
+    engine.dispose()
+    source = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    target = sqlite3.connect(database_path(), timeout=30)
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
+    check_integrity(database_path())
+    return safety_path
+
+
+class BackupScheduler:
+    """Background thread creating backups at a fixed interval."""
+
+    def __init__(self, interval_hours: float = BACKUP_INTERVAL_HOURS):
+        self.interval = interval_hours * 3600
+        self.stopped = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Starts the scheduler if an interval is configured."""
+        if self.interval <= 0 or self.thread is not None:
+            return
+        self.thread = threading.Thread(
+            target=self._run, name="backup-scheduler", daemon=True
+        )
+        self.thread.start()
+
+    def stop(self) -> None:
+        """Stops the scheduler."""
+        self.stopped.set()
+
+    def _run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            try:
+                path = create_backup()
+                logger.info("Backup created: %s", path)
+            except (BackupError, sqlite3.Error, OSError):
+                logger.exception("Scheduled backup failed")
+
+
+scheduler = BackupScheduler()
+
+
+def main():
+    """Parses command line arguments and runs the backup command."""
+    parser = argparse.ArgumentParser(
+        description="Back up, verify and restore the SQLite database."
+    )
+    parser.add_argument("--dir", default=BACKUP_DIR,
+                        help="The backup directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+    create = commands.add_parser("create", help="Create a backup")
+    create.add_argument("--retention", type=int, default=BACKUP_RETENTION,
+                        help="Number of backups to keep")
+    commands.add_parser("list", help="List backups, newest first")
+    verify = commands.add_parser("verify", help="Check a backup's integrity")
+    verify.add_argument("path")
+    restore = commands.add_parser("restore", help="Restore a backup")
+    restore.add_argument("path")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "create":
+            start = time.perf_counter()
+            path = create_backup(args.dir, args.retention)
+            print(f"Backup created: {path} "
+                  f"({time.perf_counter() - start:.1f} s)")
+        elif args.command == "list":
+            for path in list_backups(args.dir):
+                print(f"{path}  {os.path.getsize(path) // 1024} KiB")
+        elif args.command == "verify":
+            check_integrity(args.path)
+            print(f"{args.path}: ok")
+        else:
+            safety_path = restore_backup(args.path, args.dir)
+            print(f"Restored {args.path}, previous database saved to "
+                  f"{safety_path}")
+    except BackupError as exc:
+        parser.exit(1, f"Error: {exc}\n")
+
+
+if __name__ == "__main__":
+    main()
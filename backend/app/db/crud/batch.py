@@ -0,0 +1,463 @@
+"""
+Batch create, update and delete operations for goals and journal entries.
+
+The operations of a batch are validated first; rejected ones are reported
+per item and do not affect the others. All accepted operations are then
+applied in one transaction with bulk statements: one executemany INSERT
+for the creates, one executemany UPDATE per set of updated fields and one
+DELETE per table for the deletes, in that order. Entries that are created
+or whose content changes are analyzed concurrently before the
+transaction starts.
+"""
+
+import concurrent.futures
+import os
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Dict, Iterable, List, Set, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import Table, bindparam, delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.db.database import (
+    GoalModel,
+    JournalEntryModel,
+    count_words,
+    journal_goal_association,
+    priority_rank,
+)
+from app.models.entry_goal import (
+    BatchItem,
+    BatchItemResult,
+    BatchOperation,
+    BatchRequest,
+    BatchResult,
+    GoalCreate,
+    GoalUpdate,
+    JournalEntryBatchUpdate,
+    JournalEntryCreate,
+)
+from app.services.gemini_agent import analyze_entry, ANALYSIS_VERSION
+from app.services.gemini_client import GeminiUnavailableError
+from app.services.goal_catalog import goal_catalog
+
+
+# Concurrent analysis requests for created and re-written entries
+BATCH_ANALYSIS_WORKERS = int(os.getenv("BATCH_ANALYSIS_WORKERS", "4"))
+
+# An accepted operation: (index, item, validated data)
+Operation = Tuple[int, BatchItem, BaseModel]
+
+
+def error_message(exc: Exception) -> str:
+    """Formats a validation error as a single line."""
+    if isinstance(exc, ValidationError):
+        return "; ".join(
+            f"{'.'.join(map(str, error['loc']))}: {error['msg']}"
+            for error in exc.errors()
+        )
+    return str(exc)
+
+
+def column_values(model: BaseModel, table: Table,
+                  exclude: Set[str] = frozenset(),
+                  exclude_unset: bool = False) -> dict:
+    """
+    Converts validated data into column values.
+
+    Args:
+        model (BaseModel): The validated data.
+        table (Table): The table the values are written to.
+        exclude (Set[str]): Fields that are not columns.
+        exclude_unset (bool): Whether to leave out fields that were not set.
+
+    Raises:
+        ValueError: If a required column is set to null.
+
+    Returns:
+        dict: The values keyed by column name.
+    """
+    values = {
+        key: value.value if isinstance(value, Enum) else value
+        for key, value in model.model_dump(
+            exclude_unset=exclude_unset, exclude=exclude
+        ).items()
+    }
+    missing = [key for key, value in values.items()
+               if value is None and not table.c[key].nullable]
+    if missing:
+        raise ValueError(f"{', '.join(missing)} may not be null")
+    return values
+
+
+def validate_operations(
+    operations: List[BatchItem],
+    create_model: Type[BaseModel],
+    update_model: Type[BaseModel],
+    result: BatchResult
+) -> Dict[BatchOperation, List[Operation]]:
+    """
+    Validates the data of every operation and rejects invalid ones.
+
+    Args:
+        operations (List[BatchItem]): The requested operations.
+        create_model (Type[BaseModel]): The model of created items.
+        update_model (Type[BaseModel]): The model of updated items.
+        result (BatchResult): Receives the rejected operations.
+
+    Returns:
+        Dict[BatchOperation, List[Operation]]: The valid operations by kind.
+    """
+    valid = {op: [] for op in BatchOperation}
+    for index, item in enumerate(operations):
+        try:
+            if item.op == BatchOperation.CREATE:
+                data = create_model.model_validate(item.data or {})
+            elif item.id is None:
+                raise ValueError(f"id is required to {item.op.value}")
+            elif item.op == BatchOperation.UPDATE:
+                data = update_model.model_validate(item.data or {})
+            else:
+                data = None
+        except ValueError as exc:
+            reject(result, index, item, 422, error_message(exc))
+            continue
+        valid[item.op].append((index, item, data))
+    return valid
+
+
+def reject(result: BatchResult, index: int, item: BatchItem,
+           status: int, error: str) -> None:
+    """Records a rejected operation."""
+    result.failed += 1
+    result.results.append(BatchItemResult(
+        index=index, op=item.op, id=item.id, status=status, error=error
+    ))
+
+
+def accept(result: BatchResult, index: int, item: BatchItem,
+           item_id: int, status: int = 200) -> None:
+    """Records an applied operation."""
+    result.succeeded += 1
+    result.results.append(BatchItemResult(
+        index=index, op=item.op, id=item_id, status=status
+    ))
+
+
+def existing_ids(db: Session, table: Table, ids: Iterable[int]) -> Set[int]:
+    """Returns those of the IDs that exist in a table."""
+    ids = set(ids)
+    if not ids:
+        return set()
+    return set(db.scalars(select(table.c.id).where(table.c.id.in_(ids))))
+
+
+def drop_missing(db: Session, table: Table, operations: List[Operation],
+                 result: BatchResult, name: str) -> List[Operation]:
+    """
+    Rejects the operations on IDs that do not exist with a 404.
+
+    Returns:
+        List[Operation]: The operations on existing IDs.
+    """
+    found = existing_ids(db, table, (item.id for _, item, _ in operations))
+    kept = []
+    for index, item, data in operations:
+        if item.id in found:
+            kept.append((index, item, data))
+        else:
+            reject(result, index, item, 404, f"{name} not found")
+    return kept
+
+
+def insert_rows(db: Session, table: Table, rows: List[dict]) -> List[int]:
+    """
+    Inserts rows with a single executemany statement. Columns missing
+    from some of the rows are set to null in them, as executemany needs
+    the same parameters in every row.
+
+    Returns:
+        List[int]: The new IDs, in the order of the rows.
+    """
+    if not rows:
+        return []
+    columns = set().union(*rows)
+    rows = [{column: row.get(column) for column in columns} for row in rows]
+    return db.scalars(
+        insert(table).returning(table.c.id, sort_by_parameter_order=True),
+        rows,
+    ).all()
+
+
+def update_rows(db: Session, table: Table, rows: Dict[int, dict]) -> None:
+    """
+    Updates rows with one executemany statement per set of updated
+    columns. The SET clause is derived from the parameters.
+
+    Args:
+        db (Session): The database session.
+        table (Table): The table to update.
+        rows (Dict[int, dict]): The new column values keyed by ID.
+    """
+    groups: Dict[Tuple[str, ...], List[dict]] = {}
+    for row_id, values in rows.items():
+        groups.setdefault(tuple(sorted(values)), []).append(
+            {**values, "row_id": row_id}
+        )
+    statement = update(table).where(table.c.id == bindparam("row_id"))
+    for parameters in groups.values():
+        db.execute(statement, parameters)
+
+
+def delete_rows(db: Session, table: Table, link_column: str,
+                ids: Set[int]) -> None:
+    """Deletes rows and their goal links with one statement each."""
+    if not ids:
+        return
+    db.execute(delete(journal_goal_association).where(
+        journal_goal_association.c[link_column].in_(ids)
+    ))
+    db.execute(delete(table).where(table.c.id.in_(ids)))
+
+
+def finish(result: BatchResult) -> BatchResult:
+    """Sorts the results into request order."""
+    result.results.sort(key=lambda item_result: item_result.index)
+    return result
+
+
+def apply_goal_batch(db: Session,
+                     request: BatchRequest) -> Tuple[BatchResult, List[int]]:
+    """
+    Applies a batch of goal operations in one transaction.
+
+    Args:
+        db (Session): The database session.
+        request (BatchRequest): The operations.
+
+    Returns:
+        Tuple[BatchResult, List[int]]: The per-item results and the IDs
+        of the created goals and of goals whose title or description
+        changed, which need their entries re-matched.
+    """
+    goals = GoalModel.__table__
+    result = BatchResult()
+    operations = validate_operations(
+        request.operations, GoalCreate, GoalUpdate, result
+    )
+    now = datetime.now(timezone.utc)
+
+    creates, rows = [], []
+    for index, item, data in operations[BatchOperation.CREATE]:
+        try:
+            values = column_values(data, goals)
+        except ValueError as exc:
+            reject(result, index, item, 422, str(exc))
+            continue
+        creates.append((index, item))
+        rows.append({**values, "progress": 0, "created_at": now})
+
+    updates, changed = {}, []
+    for index, item, data in drop_missing(
+            db, goals, operations[BatchOperation.UPDATE], result, "Goal"):
+        try:
+            values = column_values(data, goals, exclude_unset=True)
+        except ValueError as exc:
+            reject(result, index, item, 422, str(exc))
+            continue
+        if values.get("priority") is not None:
+            # Core statements bypass the before_update event of the model
+            values["priority_rank"] = priority_rank(values["priority"])
+        updates.setdefault(item.id, {}).update(values, updated_at=now)
+        if data.model_fields_set & {"title", "description"}:
+            changed.append(item.id)
+        accept(result, index, item, item.id)
+
+    deletes = drop_missing(
+        db, goals, operations[BatchOperation.DELETE], result, "Goal"
+    )
+    deleted = {item.id for _, item, _ in deletes}
+
+    created = insert_rows(db, goals, rows)
+    update_rows(db, goals, updates)
+    delete_rows(db, goals, "goal_id", deleted)
+    db.commit()
+    if created or updates or deleted:
+        goal_catalog.invalidate()
+
+    for (index, item), goal_id in zip(creates, created):
+        accept(result, index, item, goal_id, 201)
+    for index, item, _ in deletes:
+        accept(result, index, item, item.id)
+    rematch = [goal_id for goal_id in created + changed
+               if goal_id not in deleted]
+    return finish(result), list(dict.fromkeys(rematch))
+
+
+def analyze_contents(db: Session,
+                     contents: Dict[int, str]) -> Dict[int, object]:
+    """
+    Analyzes entry contents concurrently.
+
+    Args:
+        db (Session): The database session.
+        contents (Dict[int, str]): The contents keyed by operation index.
+
+    Returns:
+        Dict[int, object]: The analysis tuples keyed by operation index,
+        or the GeminiUnavailableError of failed analyses.
+    """
+    if not contents:
+        return {}
+    catalog = goal_catalog.load(db)
+    analyses = {}
+    with concurrent.futures.ThreadPoolExecutor(
+            max_workers=BATCH_ANALYSIS_WORKERS) as executor:
+        futures = {
+            index: executor.submit(
+                analyze_entry, content, catalog.render(content)
+            )
+            for index, content in contents.items()
+        }
+        for index, future in futures.items():
+            try:
+                analyses[index] = future.result()
+            except GeminiUnavailableError as exc:
+                analyses[index] = exc
+    return analyses
+
+
+def analysis_values(analysis: tuple) -> dict:
+    """Returns the column values of an analyzed content."""
+    formatted, activities, sentiments, _ = analysis
+    return {
+        "formatted_content": formatted,
+        "activities": activities,
+        "sentiments": sentiments,
+        "analysis_version": ANALYSIS_VERSION,
+    }
+
+
+def text_stats(content: str) -> dict:
+    """
+    Returns the text statistics columns of a content. Core statements
+    bypass the text statistics event of the model, so they are set
+    whenever content is written.
+    """
+    return {"word_count": count_words(content), "char_count": len(content)}
+
+
+def apply_entry_batch(db: Session, request: BatchRequest) -> BatchResult:
+    """
+    Applies a batch of journal entry operations in one transaction.
+    Created entries and updated entries with new content are analyzed
+    like single ones. Their goal links are replaced by the given goal
+    IDs, or else by the goals matched by the analysis.
+
+    Args:
+        db (Session): The database session.
+        request (BatchRequest): The operations.
+
+    Returns:
+        BatchResult: The per-item results.
+    """
+    entries = JournalEntryModel.__table__
+    goals = GoalModel.__table__
+    result = BatchResult()
+    operations = validate_operations(
+        request.operations, JournalEntryCreate, JournalEntryBatchUpdate, result
+    )
+    updates = drop_missing(
+        db, entries, operations[BatchOperation.UPDATE], result,
+        "Journal entry"
+    )
+    deletes = drop_missing(
+        db, entries, operations[BatchOperation.DELETE], result,
+        "Journal entry"
+    )
+
+    # Reject unknown goal IDs and null required fields before any analysis
+    known_goals = existing_ids(db, goals, (
+        goal_id for _, _, data in operations[BatchOperation.CREATE] + updates
+        for goal_id in data.goals or []
+    ))
+    accepted, values = [], {}
+    for index, item, data in operations[BatchOperation.CREATE] + updates:
+        try:
+            unknown = set(data.goals or []) - known_goals
+            if unknown:
+                raise ValueError(
+                    f"Unknown goal IDs: {', '.join(map(str, sorted(unknown)))}"
+                )
+            values[index] = column_values(
+                data, entries, exclude={"goals"},
+                exclude_unset=item.op == BatchOperation.UPDATE,
+            )
+        except ValueError as exc:
+            reject(result, index, item, 422, str(exc))
+            continue
+        accepted.append((index, item, data))
+
+    analyses = analyze_contents(db, {
+        index: data.content for index, _, data in accepted
+        if data.content is not None
+    })
+    matched = existing_ids(db, goals, (
+        goal_id for analysis in analyses.values()
+        if isinstance(analysis, tuple) for goal_id in analysis[3]
+    ))
+
+    now = datetime.now(timezone.utc)
+    creates, rows, updated = [], [], {}
+    # Goal links replacing the current ones, keyed by operation index
+    links: Dict[int, Set[int]] = {}
+    for index, item, data in accepted:
+        analysis = analyses.get(index)
+        if isinstance(analysis, GeminiUnavailableError):
+            reject(result, index, item, 503,
+                   f"AI service unavailable: {analysis}")
+            continue
+        row = values[index]
+        if "content" in row:
+            row.update(text_stats(row["content"]))
+        if analysis is not None:
+            row.update(analysis_values(analysis))
+        if data.goals is not None:
+            links[index] = set(data.goals)
+        elif analysis is not None:
+            links[index] = set(analysis[3]) & matched
+        if item.op == BatchOperation.CREATE:
+            creates.append((index, item))
+            rows.append({**row, "created_at": now})
+        else:
+            updated.setdefault(item.id, {}).update(row, updated_at=now)
+            accept(result, index, item, item.id)
+
+    created = insert_rows(db, entries, rows)
+    update_rows(db, entries, updated)
+    entry_ids = {index: item.id for index, item, _ in accepted}
+    entry_ids.update(
+        (index, entry_id) for (index, _), entry_id in zip(creates, created)
+    )
+    relinked = {entry_ids[index] for index, item, _ in accepted
+                if index in links and item.op == BatchOperation.UPDATE}
+    if relinked:
+        db.execute(delete(journal_goal_association).where(
+            journal_goal_association.c.journal_id.in_(relinked)
+        ))
+    new_links = [
+        {"journal_id": entry_ids[index], "goal_id": goal_id}
+        for index, goal_ids in links.items() for goal_id in goal_ids
+    ]
+    if new_links:
+        db.execute(insert(journal_goal_association), new_links)
+    delete_rows(db, entries, "journal_id",
+                {item.id for _, item, _ in deletes})
+    db.commit()
+
+    for (index, item), entry_id in zip(creates, created):
+        accept(result, index, item, entry_id, 201)
+    for index, item, _ in deletes:
+        accept(result, index, item, item.id)
+    return finish(result)
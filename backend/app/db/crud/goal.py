@@ -2,46 +2,61 @@
 CRUD operations for goals.
 """
 
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from typing import List, Optional
 
-from sqlalchemy import case
+from sqlalchemy import Row, delete, update
 from sqlalchemy.orm import Session, joinedload
 
-from app.db.database import GoalModel
+from app.db.database import GoalModel, journal_goal_association, priority_rank
 from app.db.crud.utils import get_recent_entries
-from app.models.entry_goal import GoalCreate, GoalUpdate, GoalPriority
+from app.models.entry_goal import GoalCreate, GoalUpdate
+from app.services.goal_catalog import goal_catalog
 
 
 def get_goals(
     db: Session,
     skip: int = 0,
     limit: int = 100,
-    max_entries_per_goal: int = 5
+    max_entries_per_goal: int = 5,
+    category: Optional[str] = None,
+    goal_type: Optional[str] = None,
+    due_before: Optional[date] = None
 ) -> List[GoalModel]:
     """
-    Retrieves a list of goals with pagination, ordered by priority,
-    and filters to keep only the most recent journal entries for each goal.
+    Retrieves a list of goals with optional filtering and pagination,
+    ordered by priority and target date, and filters to keep only the
+    most recent journal entries for each goal. The order matches the
+    ix_goals_priority_rank index, so SQLite reads the goals in index
+    order instead of sorting all of them.
 
     Args:
         db (Session): The database session.
         skip (int): The number of goals to skip (for pagination).
         limit (int): The maximum number of goals to return (for pagination).
         max_entries_per_goal (int): The maximum number of recent journal entries to include per goal.
+        category (Optional[str]): If provided, only goals of this category will be returned.
+        goal_type (Optional[str]): If provided, only goals of this type will be returned.
+        due_before (Optional[date]): If provided, only goals with a target date on or before this date will be returned.
 
     Returns:
         List[GoalModel]: A list of goal SQLAlchemy models with filtered journal entries.
     """
+    query = db.query(GoalModel)
+
+    if category:
+        query = query.filter(GoalModel.category == category)
+    if goal_type:
+        query = query.filter(GoalModel.type == goal_type)
+    if due_before:
+        query = query.filter(GoalModel.target_date <= due_before)
+
     goals_with_entries = (
-        db.query(GoalModel)
-        .options(joinedload(GoalModel.journal_entries))
+        query.options(joinedload(GoalModel.journal_entries))
         .order_by(
-            case(
-                (GoalModel.priority == GoalPriority.HIGH.value, 1),
-                (GoalModel.priority == GoalPriority.MEDIUM.value, 2),
-                (GoalModel.priority == GoalPriority.LOW.value, 3),
-                else_=4
-            )
+            GoalModel.priority_rank,
+            GoalModel.target_date,
+            GoalModel.id,
         ).offset(skip)
         .limit(limit)
         .all()
@@ -103,6 +118,7 @@ def create_goal(db: Session, goal: GoalCreate) -> GoalModel:
     )
     db.add(db_goal)
     db.commit()
+    goal_catalog.invalidate()
     db.refresh(db_goal)
     return db_goal
 
@@ -111,9 +127,10 @@ def update_goal(
     db: Session,
     goal_id: int,
     goal_update: GoalUpdate
-) -> Optional[GoalModel]:
+) -> Optional[Row]:
     """
-    Updates an existing goal.
+    Updates an existing goal with a single UPDATE ... RETURNING statement.
+    The goal's journal entries are neither loaded nor returned.
 
     Args:
         db (Session): The database session.
@@ -121,28 +138,32 @@ def update_goal(
         goal_update (GoalUpdate): The Pydantic model containing the update data.
 
     Returns:
-        Optional[GoalModel]: The updated goal SQLAlchemy model if found, otherwise None.
+        Optional[Row]: The updated goal's columns if found, otherwise None.
     """
-    db_goal = get_goal(db, goal_id)
-    if db_goal:
-        update_data: dict = goal_update.model_dump(exclude_unset=True)
-
-        for key, value in update_data.items():
-            if key == 'priority' and value is not None:
-                setattr(db_goal, key, value.value)
-            else:
-                setattr(db_goal, key, value)
-
-        db_goal.updated_at = datetime.now(timezone.utc)
-
-        db.commit()
-        db.refresh(db_goal)
+    values: dict = goal_update.model_dump(exclude_unset=True)
+    if values.get("priority") is not None:
+        values["priority"] = values["priority"].value
+        # Core statements bypass the before_update event of the model
+        values["priority_rank"] = priority_rank(values["priority"])
+    values["updated_at"] = datetime.now(timezone.utc)
+
+    goals = GoalModel.__table__
+    db_goal = db.execute(
+        update(goals)
+        .where(goals.c.id == goal_id)
+        .values(values)
+        .returning(*goals.c)
+    ).first()
+    db.commit()
+    if db_goal is not None:
+        goal_catalog.invalidate()
     return db_goal
 
 
 def delete_goal(db: Session, goal_id: int) -> bool:
     """
-    Deletes a goal by its ID.
+    Deletes a goal by its ID together with its links to journal entries,
+    without loading the goal or its entries.
 
     Args:
         db (Session): The database session.
@@ -151,9 +172,15 @@ def delete_goal(db: Session, goal_id: int) -> bool:
     Returns:
         bool: True if the goal was deleted, False otherwise.
     """
-    db_goal = get_goal(db, goal_id)
-    if db_goal:
-        db.delete(db_goal)
-        db.commit()
-        return True
-    return False
+    db.execute(
+        delete(journal_goal_association)
+        .where(journal_goal_association.c.goal_id == goal_id)
+    )
+    goals = GoalModel.__table__
+    deleted = db.execute(
+        delete(goals).where(goals.c.id == goal_id)
+    ).rowcount
+    db.commit()
+    if deleted:
+        goal_catalog.invalidate()
+    return bool(deleted)
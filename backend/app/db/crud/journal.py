@@ -5,12 +5,14 @@ CRUD operations for journal entries.
 from datetime import datetime, timezone
 from typing import List, Optional
 
+from sqlalchemy import delete
 from sqlalchemy.orm import Session
 
-from app.db.database import JournalEntryModel
-from app.db.crud.utils import get_goal_info, get_goals
+from app.db.database import JournalEntryModel, journal_goal_association
+from app.db.crud.utils import get_goals
 from app.models.entry_goal import JournalEntryCreate, JournalEntryUpdate
-from app.services.gemini_agent import analyze_entry
+from app.services.gemini_agent import analyze_entry, ANALYSIS_VERSION
+from app.services.goal_catalog import goal_catalog
 
 
 def get_journal_entries(
@@ -71,9 +73,9 @@ def create_journal_entry(db: Session, entry: JournalEntryCreate) -> JournalEntry
     Returns:
         JournalEntryModel: The newly created journal entry SQLAlchemy model.
     """
-    goal_info = get_goal_info(db)
+    goal_block = goal_catalog.prompt_block(db, entry.content)
     formatted_content, activities, sentiments, goal_ids = analyze_entry(
-        entry.content, goal_info
+        entry.content, goal_block
     )
     goals = get_goals(db, goal_ids)
 
@@ -104,6 +106,7 @@ def create_journal_entry(db: Session, entry: JournalEntryCreate) -> JournalEntry
         formatted_content=formatted_content,
         activities=activities,
         sentiments=sentiments,
+        analysis_version=ANALYSIS_VERSION,
         goals=goals,
     )
 
@@ -141,15 +144,16 @@ def update_journal_entry(
                 setattr(db_entry, key, value)
 
         if entry_update.content:
-            goal_info = get_goal_info(db)
+            goal_block = goal_catalog.prompt_block(db, entry_update.content)
             formatted, activities, sentiments, goal_ids = analyze_entry(
-                entry_update.content, goal_info
+                entry_update.content, goal_block
             )
             goals = get_goals(db, goal_ids)
 
             db_entry.formatted_content = formatted
             db_entry.activities = activities
             db_entry.sentiments = sentiments
+            db_entry.analysis_version = ANALYSIS_VERSION
             db_entry.goals.clear()
             db_entry.goals.extend(goals)
 
@@ -162,7 +166,9 @@ def update_journal_entry(
 
 def delete_journal_entry(db: Session, entry_id: int) -> bool:
     """
-    Deletes a journal entry by its ID.
+    Deletes a journal entry by its ID together with its goal links,
+    without loading the entry. Its activities, sentiments and search
+    index rows are removed by triggers.
 
     Args:
         db (Session): The database session.
@@ -171,9 +177,13 @@ def delete_journal_entry(db: Session, entry_id: int) -> bool:
     Returns:
         bool: True if the entry was deleted, False otherwise.
     """
-    db_entry = get_journal_entry(db, entry_id)
-    if db_entry:
-        db.delete(db_entry)
-        db.commit()
-        return True
-    return False
+    db.execute(
+        delete(journal_goal_association)
+        .where(journal_goal_association.c.journal_id == entry_id)
+    )
+    entries = JournalEntryModel.__table__
+    deleted = db.execute(
+        delete(entries).where(entries.c.id == entry_id)
+    ).rowcount
+    db.commit()
+    return bool(deleted)
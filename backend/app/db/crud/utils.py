@@ -5,6 +5,7 @@ Utility functions for database operations related to goals and journal entries.
 from typing import List, Optional
 
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.db.database import GoalModel
 from app.models.entry_goal import Goal
@@ -16,6 +17,8 @@ def get_recent_entries(
 ) -> List[Goal]:
     """
     Filters journal entries for each goal, keeping only the most recent ones.
+    The loaded collections are replaced without being marked as changed,
+    so committing the session never deletes the links of the other entries.
 
     Args:
         goals (List[Goal]): A list of Goal Pydantic models, potentially containing journal entries.
@@ -29,27 +32,11 @@ def get_recent_entries(
             sorted_entries = sorted(goal.journal_entries,
                                     key=lambda entry: entry.date,
                                     reverse=True)
-            goal.journal_entries = sorted_entries[:max_entries_per_goal]
+            set_committed_value(goal, "journal_entries",
+                                sorted_entries[:max_entries_per_goal])
     return goals
 
 
-def get_goal_info(db: Session) -> List[dict]:
-    """
-    Retrieves basic information (id, title, description) for all goals from the database.
-
-    Args:
-        db (Session): The database session.
-
-    Returns:
-        List[dict]: A list of dictionaries, each containing 'id', 'title', and 'description' of a goal.
-    """
-    goal_info = [
-        {"id": goal.id, "title": goal.title, "description": goal.description}
-        for goal in db.query(GoalModel).all()
-    ]
-    return goal_info
-
-
 def get_goals(db: Session, goal_ids: Optional[List[int]] = None) -> List[GoalModel]:
     """
     Retrieves a list of Goal SQLAlchemy models by their IDs.
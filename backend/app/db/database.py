@@ -5,7 +5,14 @@ Database setup and SQLAlchemy models for the journal and goal application.
 import os
 from datetime import datetime, timezone
 from sqlalchemy import (
+    bindparam,
+    case,
     create_engine,
+    event,
+    inspect,
+    select,
+    update,
+    text,
     Column,
     Integer,
     String,
@@ -14,6 +21,7 @@ from sqlalchemy import (
     Date,
     Table,
     ForeignKey,
+    Index,
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
@@ -21,8 +29,10 @@ from sqlalchemy.orm import sessionmaker, relationship
 
 # Get the directory of the current file
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-# Create the database file in the same directory
-DATABASE_URL = f"sqlite:///{os.path.join(BASE_DIR, 'journal.db')}"
+# Create the database file in the same directory unless configured otherwise
+DATABASE_URL = os.getenv(
+    "DATABASE_URL", f"sqlite:///{os.path.join(BASE_DIR, 'journal.db')}"
+)
 
 # check_same_thread=False is required for SQLite to allow multiple
 # threads to use the same connection
@@ -31,6 +41,37 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+
+def count_words(content: str) -> int:
+    """Counts the whitespace-separated words of a text."""
+    return len(content.split()) if content else 0
+
+
+def default_word_count(context) -> int:
+    """Column default computing the word count of an inserted entry."""
+    return count_words(context.get_current_parameters().get("content"))
+
+
+def default_char_count(context) -> int:
+    """Column default computing the length of an inserted entry."""
+    return len(context.get_current_parameters().get("content") or "")
+
+
+# Sort order of goal priorities, unknown priorities sort last
+PRIORITY_RANKS = {"High": 1, "Medium": 2, "Low": 3}
+UNKNOWN_PRIORITY_RANK = 4
+
+
+def priority_rank(priority: str) -> int:
+    """Returns the sort rank of a goal priority."""
+    return PRIORITY_RANKS.get(priority, UNKNOWN_PRIORITY_RANK)
+
+
+def default_priority_rank(context) -> int:
+    """Column default computing the priority rank of an inserted goal."""
+    return priority_rank(context.get_current_parameters().get("priority"))
+
+
 # Association table for many-to-many relationship between
 # JournalEntryModel and GoalModel
 journal_goal_association = Table(
@@ -41,16 +82,48 @@ journal_goal_association = Table(
 )
 
 
+# Activities and sentiments of each entry, normalized from the
+# comma-separated AI fields of journal_entries by triggers
+entry_activities = Table(
+    "entry_activities",
+    Base.metadata,
+    Column("journal_id", Integer, ForeignKey("journal_entries.id"),
+           primary_key=True),
+    Column("activity_id", Integer, ForeignKey("activities.id"),
+           primary_key=True),
+    Index("ix_entry_activities_activity_id", "activity_id", "journal_id"),
+)
+
+entry_sentiments = Table(
+    "entry_sentiments",
+    Base.metadata,
+    Column("journal_id", Integer, ForeignKey("journal_entries.id"),
+           primary_key=True),
+    Column("sentiment", String, primary_key=True),
+    Index("ix_entry_sentiments_sentiment", "sentiment", "journal_id"),
+)
+
+
 class JournalEntryModel(Base):
     """SQLAlchemy model for journal entries."""
 
     __tablename__ = "journal_entries"
+    __table_args__ = (
+        # Covers the aggregate analytics queries, which then never read
+        # the table rows with their long content
+        Index("ix_journal_entries_date_stats", "date", "sentiment_level",
+              "sleep_quality", "stress_level", "social_engagement",
+              "word_count", "char_count"),
+    )
     id = Column(Integer, primary_key=True, index=True)
 
     # Main fields
     title = Column(String, nullable=False)
     date = Column(Date, nullable=False)
     content = Column(Text, nullable=False)
+    # Text statistics of content, set on insert and when content changes
+    word_count = Column(Integer, nullable=True, default=default_word_count)
+    char_count = Column(Integer, nullable=True, default=default_char_count)
 
     # Timestamps
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
@@ -64,8 +137,10 @@ class JournalEntryModel(Base):
 
     # AI-generated analysis fields
     formatted_content = Column(Text, nullable=True)
-    activities = Column(Text, nullable=True)  # Stored as JSON string
+    activities = Column(Text, nullable=True)  # Comma-separated
     sentiments = Column(String, nullable=True)
+    # Version of the analysis prompts the AI fields were generated with
+    analysis_version = Column(Integer, nullable=True)
 
     # Many-to-many relationship with goals
     goals = relationship(
@@ -75,10 +150,23 @@ class JournalEntryModel(Base):
     )
 
 
+@event.listens_for(JournalEntryModel, "before_update")
+def update_text_stats(mapper, connection, target):
+    """Recomputes the text statistics when the content of an entry changed."""
+    # pylint: disable=unused-argument
+    if inspect(target).attrs.content.history.has_changes():
+        target.word_count = count_words(target.content)
+        target.char_count = len(target.content or "")
+
+
 class GoalModel(Base):
     """SQLAlchemy model for goals."""
 
     __tablename__ = "goals"
+    __table_args__ = (
+        # Goal listings are ordered by priority and due date
+        Index("ix_goals_priority_rank", "priority_rank", "target_date"),
+    )
     id = Column(Integer, primary_key=True, index=True)
 
     # Main fields
@@ -87,6 +175,9 @@ class GoalModel(Base):
     target_date = Column(Date, nullable=True)  # Date for one-time goals
     category = Column(String, nullable=False)  # Category of the goal
     priority = Column(String, nullable=False, default="Low")
+    # Integer sort order of priority, set on insert and when it changes
+    priority_rank = Column(Integer, nullable=True,
+                           default=default_priority_rank)
     description = Column(Text, nullable=True)
     progress = Column(Integer, nullable=False, default=0)
 
@@ -102,6 +193,22 @@ class GoalModel(Base):
     )
 
 
+@event.listens_for(GoalModel, "before_update")
+def update_priority_rank(mapper, connection, target):
+    """Recomputes the priority rank when the priority of a goal changed."""
+    # pylint: disable=unused-argument
+    if inspect(target).attrs.priority.history.has_changes():
+        target.priority_rank = priority_rank(target.priority)
+
+
+class ActivityModel(Base):
+    """SQLAlchemy model for the distinct activities of all entries."""
+
+    __tablename__ = "activities"
+    id = Column(Integer, primary_key=True)
+    name = Column(String(collation="NOCASE"), nullable=False, unique=True)
+
+
 def create_tables():
     """
     Creates all defined database tables if they do not already exist.
@@ -109,9 +216,236 @@ def create_tables():
     """
     print("Creating database tables...")
     Base.metadata.create_all(bind=engine)
+    add_missing_columns()
+    add_missing_indexes()
+    create_search_index()
+    create_tag_triggers()
+    backfill_text_stats()
+    backfill_priority_ranks()
     print("Tables created.")
 
 
+def add_missing_columns():
+    """
+    Adds columns that were introduced after a table was first created.
+    create_all only creates missing tables, so new columns of existing
+    tables are added with ALTER TABLE statements.
+    """
+    inspector = inspect(engine)
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {
+                column["name"] for column in inspector.get_columns(table.name)
+            }
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                connection.execute(text(
+                    f"ALTER TABLE {table.name} "
+                    f"ADD COLUMN {column.name} {column_type}"
+                ))
+
+
+def add_missing_indexes():
+    """
+    Creates indexes that were introduced after a table was first created,
+    as create_all only creates the indexes of new tables.
+    """
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
+
+
+def backfill_text_stats(batch_size: int = 1000):
+    """
+    Computes the text statistics of entries created before the columns
+    existed. Only entries without a word count are read, one batch at a
+    time.
+
+    Args:
+        batch_size (int): The number of entries read and updated per batch.
+    """
+    entries = JournalEntryModel.__table__
+    statement = (
+        update(entries)
+        .where(entries.c.id == bindparam("entry_id"))
+        .values(word_count=bindparam("words"), char_count=bindparam("chars"))
+    )
+    with engine.begin() as connection:
+        while True:
+            rows = connection.execute(
+                select(entries.c.id, entries.c.content)
+                .where(entries.c.word_count.is_(None))
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            connection.execute(statement, [
+                {"entry_id": entry_id, "words": count_words(content),
+                 "chars": len(content or "")}
+                for entry_id, content in rows
+            ])
+
+
+def backfill_priority_ranks():
+    """
+    Sets the priority rank of goals created before the column existed.
+    """
+    goals = GoalModel.__table__
+    with engine.begin() as connection:
+        connection.execute(
+            update(goals)
+            .where(goals.c.priority_rank.is_(None))
+            .values(priority_rank=case(
+                PRIORITY_RANKS, value=goals.c.priority,
+                else_=UNKNOWN_PRIORITY_RANK,
+            ))
+        )
+
+
+def create_search_index():
+    """
+    Creates the FTS5 full-text index over journal entry titles and content.
+    Triggers keep the index in sync with the journal_entries table, and the
+    index is built from existing entries when it is first created.
+    """
+    with engine.begin() as connection:
+        exists = connection.execute(text(
+            "SELECT name FROM sqlite_master WHERE name = 'journal_entries_fts'"
+        )).first()
+        connection.execute(text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS journal_entries_fts "
+            "USING fts5(title, content, content='journal_entries', "
+            "content_rowid='id')"
+        ))
+        connection.execute(text(
+            "CREATE TRIGGER IF NOT EXISTS journal_entries_fts_insert "
+            "AFTER INSERT ON journal_entries BEGIN "
+            "INSERT INTO journal_entries_fts(rowid, title, content) "
+            "VALUES (new.id, new.title, new.content); END"
+        ))
+        connection.execute(text(
+            "CREATE TRIGGER IF NOT EXISTS journal_entries_fts_delete "
+            "AFTER DELETE ON journal_entries BEGIN "
+            "INSERT INTO journal_entries_fts"
+            "(journal_entries_fts, rowid, title, content) "
+            "VALUES ('delete', old.id, old.title, old.content); END"
+        ))
+        connection.execute(text(
+            "CREATE TRIGGER IF NOT EXISTS journal_entries_fts_update "
+            "AFTER UPDATE OF title, content ON journal_entries BEGIN "
+            "INSERT INTO journal_entries_fts"
+            "(journal_entries_fts, rowid, title, content) "
+            "VALUES ('delete', old.id, old.title, old.content); "
+            "INSERT INTO journal_entries_fts(rowid, title, content) "
+            "VALUES (new.id, new.title, new.content); END"
+        ))
+        if not exists:
+            connection.execute(text(
+                "INSERT INTO journal_entries_fts(journal_entries_fts) "
+                "VALUES ('rebuild')"
+            ))
+
+
+def split_tags(column: str) -> str:
+    """
+    Returns SQL that splits a comma-separated column into a json_each
+    table of values. The column is encoded with json_quote, which escapes
+    quotes, backslashes and control characters, so the values always form
+    a valid JSON array; commas never occur inside its escape sequences.
+
+    Args:
+        column (str): The column, e.g. new.activities.
+
+    Returns:
+        str: The table-valued function call.
+    """
+    return (
+        f"json_each('[' || replace(json_quote({column}), ',', '\",\"') "
+        "|| ']')"
+    )
+
+
+def tag_inserts(entry: str, source: str = "") -> str:
+    """
+    Returns the statements that insert the activities and sentiments of
+    entries into the normalized tables.
+
+    Args:
+        entry (str): The entry row, "new" in triggers.
+        source (str): The FROM clause of the entries, empty in triggers.
+
+    Returns:
+        str: The statements separated by semicolons.
+    """
+    activities = f"{source}{split_tags(f'{entry}.activities')} AS tag"
+    sentiments = f"{source}{split_tags(f'{entry}.sentiments')} AS tag"
+    return (
+        "INSERT OR IGNORE INTO activities (name) "
+        f"SELECT DISTINCT trim(tag.value) FROM {activities} "
+        "WHERE trim(tag.value) != ''; "
+        "INSERT OR IGNORE INTO entry_activities (journal_id, activity_id) "
+        f"SELECT {entry}.id, activities.id FROM {activities} "
+        "JOIN activities ON activities.name = trim(tag.value); "
+        "INSERT OR IGNORE INTO entry_sentiments (journal_id, sentiment) "
+        f"SELECT {entry}.id, trim(tag.value) FROM {sentiments} "
+        "WHERE trim(tag.value) != ''; "
+    )
+
+
+def create_tag_triggers():
+    """
+    Creates the triggers that keep entry_activities and entry_sentiments in
+    sync with the AI fields of journal_entries, whichever code writes them.
+    The tables are backfilled from existing entries when the triggers are
+    first created or replaced.
+    """
+    insert_body = tag_inserts("new")
+    with engine.begin() as connection:
+        existing = connection.execute(text(
+            "SELECT sql FROM sqlite_master "
+            "WHERE name = 'journal_entries_tags_insert'"
+        )).scalar()
+        if existing is not None and insert_body not in existing:
+            # Created by an older version that split the tags differently,
+            # rebuild the triggers and the tag tables
+            for trigger in ("insert", "update", "delete"):
+                connection.execute(text(
+                    f"DROP TRIGGER IF EXISTS journal_entries_tags_{trigger}"
+                ))
+            for table in ("entry_activities", "entry_sentiments",
+                          "activities"):
+                connection.execute(text(f"DELETE FROM {table}"))
+            existing = None
+        delete_tags = (
+            "DELETE FROM entry_activities WHERE journal_id = old.id; "
+            "DELETE FROM entry_sentiments WHERE journal_id = old.id; "
+        )
+        connection.execute(text(
+            "CREATE TRIGGER IF NOT EXISTS journal_entries_tags_insert "
+            f"AFTER INSERT ON journal_entries BEGIN {insert_body}END"
+        ))
+        connection.execute(text(
+            "CREATE TRIGGER IF NOT EXISTS journal_entries_tags_update "
+            "AFTER UPDATE OF activities, sentiments ON journal_entries BEGIN "
+            f"{delete_tags}{insert_body}END"
+        ))
+        connection.execute(text(
+            "CREATE TRIGGER IF NOT EXISTS journal_entries_tags_delete "
+            f"AFTER DELETE ON journal_entries BEGIN {delete_tags}END"
+        ))
+        if existing is None:
+            for statement in tag_inserts(
+                "journal_entries", "journal_entries, "
+            ).split("; "):
+                if statement.strip():
+                    connection.execute(text(statement))
+
+
 def get_db():
     """
     Dependency function to provide a database session.
@@ -3,26 +3,60 @@ Main application file for the Reflecta API.
 Configures FastAPI, CORS, and includes API routers.
 """
 
+import os
+import time
 from contextlib import asynccontextmanager
+from typing import Optional
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
 
-from app.db.database import create_tables
+import app.config  # noqa: F401  pylint: disable=unused-import
+from app.db.backup import scheduler as backup_scheduler
+from app.db.database import create_tables, engine
 from app.routes import journal, goal, chatbot, analytics
+from app.services.gemini_client import (
+    GeminiUnavailableError,
+    metrics as gemini_metrics,
+)
+from app.utils.caching import (
+    current_etag,
+    etag_matches,
+    is_cacheable,
+    track_writes,
+)
+from app.utils.metrics import (
+    RequestStats,
+    current_request,
+    instrument_engine,
+    record_request,
+    render_metrics,
+)
+from app.utils.profiling import (
+    PROFILING_ENABLED,
+    current_profile,
+    finish_profile,
+    sampler,
+    start_profile,
+)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Handles application startup and shutdown events.
-    During startup, it creates necessary database tables.
+    During startup, it creates necessary database tables and starts
+    scheduled backups if configured.
 
     Args:
         app (FastAPI): The FastAPI application instance.
     """
     create_tables()
+    backup_scheduler.start()
     yield
+    backup_scheduler.stop()
 
 
 # Create the FastAPI app
@@ -34,13 +68,103 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
-# CORS configuration to allow frontend calls from localhost:3000
+# Compress responses above GZIP_MINIMUM_SIZE bytes, e.g. entry lists with
+# their full text content
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=int(os.getenv("GZIP_MINIMUM_SIZE", "1000")),
+    compresslevel=int(os.getenv("GZIP_LEVEL", "1")),
+)
+
+# Time every SQL statement executed by the application
+instrument_engine(engine)
+# Bump the data version behind the ETags on every committed write
+track_writes(engine)
+
+
+@app.middleware("http")
+async def conditional_get(request: Request, call_next):
+    """
+    Adds ETags to cacheable GET responses and answers requests whose
+    If-None-Match header matches the current data version with a 304,
+    without running the endpoint.
+
+    Args:
+        request (Request): The incoming request.
+        call_next: The next handler in the middleware chain.
+
+    Returns:
+        Response: The response, or an empty 304 response.
+    """
+    if not is_cacheable(request.method, request.url.path):
+        return await call_next(request)
+
+    # Read the version before handling, so a concurrent write can only
+    # make the ETag stale, never the response
+    etag = current_etag()
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response = await call_next(request)
+    if response.status_code == 200:
+        response.headers.update(headers)
+    return response
+
+
+@app.middleware("http")
+async def instrument_requests(request: Request, call_next):
+    """
+    Records latency, SQL statements and LLM calls of each request and
+    reports them in a Server-Timing header. Samples the request's stacks
+    when profiling is enabled for it.
+
+    Args:
+        request (Request): The incoming request.
+        call_next: The next handler in the middleware chain.
+
+    Returns:
+        Response: The response with the Server-Timing header.
+    """
+    stats = RequestStats()
+    token = current_request.set(stats)
+    profile = start_profile(request)
+    profile_token = current_profile.set(profile)
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        current_request.reset(token)
+        current_profile.reset(profile_token)
+        if profile is not None:
+            sampler.stop(profile)
+    duration = time.perf_counter() - start
+
+    route = request.scope.get("route")
+    if route is not None:
+        route_path = route.path
+    elif response.status_code == 304:
+        # Answered from the ETag before routing
+        route_path = "not-modified"
+    else:
+        route_path = "unmatched"
+    record_request(request.method, route_path, response.status_code,
+                   duration, stats)
+    response.headers["Server-Timing"] = stats.server_timing(duration)
+    if profile is not None:
+        response = finish_profile(profile, route_path, response)
+    return response
+
+
+# CORS configuration to allow frontend calls from localhost:3000. Added
+# last so it wraps the other middleware and also applies to 304 responses
+# answered by conditional_get
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "ETag"],
 )
 
 # Register routers
@@ -50,6 +174,27 @@ app.include_router(chatbot.router)
 app.include_router(analytics.router)
 
 
+@app.exception_handler(GeminiUnavailableError)
+async def gemini_unavailable_handler(
+    request: Request,
+    exc: GeminiUnavailableError
+) -> JSONResponse:
+    """
+    Converts failed or rejected Gemini calls into 503 responses.
+
+    Args:
+        request (Request): The request that failed.
+        exc (GeminiUnavailableError): The raised error.
+
+    Returns:
+        JSONResponse: A 503 response with the error message.
+    """
+    return JSONResponse(
+        status_code=503,
+        content={"detail": f"AI service unavailable: {exc}"},
+    )
+
+
 @app.get("/")
 def read_root() -> dict:
     """
@@ -59,3 +204,42 @@ def read_root() -> dict:
         dict: A welcome message.
     """
     return {"message": "Welcome to the Reflecta API!"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def read_metrics() -> PlainTextResponse:
+    """
+    Exposes request, SQL and LLM metrics in the Prometheus text format.
+
+    Returns:
+        PlainTextResponse: The metrics exposition.
+    """
+    return PlainTextResponse(
+        render_metrics(gemini_metrics.render_prometheus()),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
+@app.get("/profiling/hot-stacks", response_class=PlainTextResponse)
+def read_hot_stacks(route: Optional[str] = None,
+                    limit: int = 50) -> PlainTextResponse:
+    """
+    Returns the hottest stacks sampled by the continuous profiler in the
+    folded format, optionally restricted to one route template.
+
+    Args:
+        route (Optional[str]): The route template, e.g. /journal/entries/.
+        limit (int): The maximum number of stacks.
+
+    Raises:
+        HTTPException: If profiling is disabled.
+
+    Returns:
+        PlainTextResponse: One "route;frame;...;frame count" line per stack.
+    """
+    if not PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    return PlainTextResponse("".join(
+        f"{name};{stack} {count}\n"
+        for name, stack, count in sampler.hot(route, limit)
+    ))
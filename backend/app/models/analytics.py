@@ -2,29 +2,66 @@
 Pydantic models for analytics data.
 """
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel
 
 
 class TsTrends(BaseModel):
     """
-    Time series trends for various metrics.
+    Time series trends for various metrics. Each point is a day, week or
+    month bucket dated by its first day, with the smoothed mean of the
+    bucket and the minimum and maximum per metric.
     """
+    resolution: str = "day"
     dates: List[str]
-    sentiment: List[Optional[int]]
-    sleep: List[Optional[int]]
-    stress: List[Optional[int]]
-    social: List[Optional[int]]
+    sentiment: List[Optional[float]]
+    sleep: List[Optional[float]]
+    stress: List[Optional[float]]
+    social: List[Optional[float]]
+    minimum: Dict[str, List[Optional[int]]] = {}
+    maximum: Dict[str, List[Optional[int]]] = {}
 
 
 class Averages(BaseModel):
     """
-    Average values for various metrics, including trends.
+    Average values for various metrics, including trends. A metric
+    average is None if no entry of the period has a value for it.
     """
-    sentiment: float
-    sleep: float
-    stress: float
-    social: float
+    sentiment: Optional[float] = None
+    sleep: Optional[float] = None
+    stress: Optional[float] = None
+    social: Optional[float] = None
     total_entries: int
     current_streak: int
     average_words_per_entry: float
+    average_chars_per_entry: float = 0.0
+
+
+class MetricAverages(BaseModel):
+    """
+    Average values of the state tracking fields, None without data.
+    """
+    sentiment: Optional[float] = None
+    sleep: Optional[float] = None
+    stress: Optional[float] = None
+    social: Optional[float] = None
+
+
+class ActivityStat(BaseModel):
+    """
+    How often an activity occurred and the averages on entries with it.
+    """
+    activity: str
+    count: int
+    frequency: float
+    averages: MetricAverages
+
+
+class ActivityStats(BaseModel):
+    """
+    Activity frequencies and conditional averages for a period, with the
+    averages over all entries of the period as a baseline.
+    """
+    total_entries: int
+    baseline: MetricAverages
+    activities: List[ActivityStat]
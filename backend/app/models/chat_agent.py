@@ -64,6 +64,30 @@ class SentimentList(BaseModel):
         description="List of sentiments extracted from the journal entry")
 
 
+class EntryAnalysis(BaseModel):
+    """
+    Pydantic model for the combined analysis of a journal entry.
+    """
+    formatted_text: str = Field(
+        description="The formatted journal entry")
+    activities: List[Activity] = Field(
+        description="List of activities extracted from the journal entry")
+    sentiments: List[Sentiment] = Field(
+        description="List of sentiments extracted from the journal entry")
+    goal_ids: List[int] = Field(
+        description="IDs of goals the journal entry shows clear, "
+        "positive progress towards")
+
+
+class EntryMatchList(BaseModel):
+    """
+    Pydantic model for the journal entries matched to a goal.
+    """
+    entry_ids: List[int] = Field(
+        description="IDs of journal entries that show clear, positive "
+        "progress towards the goal")
+
+
 class RecommendedGoal(BaseModel):
     """
     Pydantic model for a recommended goal.
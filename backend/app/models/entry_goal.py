@@ -136,6 +136,12 @@ class JournalEntryUpdate(BaseModel):
     social_engagement: Optional[SocialEngagement] = None
 
 
+class JournalEntryBatchUpdate(JournalEntryUpdate):
+    """Model for updating a journal entry in a batch,
+    optionally replacing its goal links"""
+    goals: Optional[List[int]] = None
+
+
 class JournalEntryBasic(JournalEntryBase):
     """Model for a journal entry,
     inherits all fields from JournalEntryBase and
@@ -152,8 +158,8 @@ class JournalEntryBasic(JournalEntryBase):
     model_config = ConfigDict(from_attributes=True)
 
 
-class Goal(GoalBase):
-    """Model for reading a Goal from the database."""
+class GoalSummary(GoalBase):
+    """Model for reading a Goal from the database without its entries."""
     id: int
     progress: int = Field(
         0,
@@ -161,13 +167,76 @@ class Goal(GoalBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    journal_entries: Optional[List[JournalEntryBasic]] = None
-
     model_config = ConfigDict(from_attributes=True, use_enum_values=True)
 
 
+class Goal(GoalSummary):
+    """Model for reading a Goal from the database."""
+    journal_entries: Optional[List[JournalEntryBasic]] = None
+
+
 class JournalEntry(JournalEntryBasic):
     """Model for a journal entry,
     inherits all fields from JournalEntryBasic and
     adds additional fields used in the backend"""
     goals: Optional[List[Goal]] = None
+
+
+class ImportRowError(BaseModel):
+    """Model for a row that could not be imported."""
+    location: str = Field(...,
+                          description="The line, row or file of the record")
+    error: str = Field(..., description="Why the record was rejected")
+
+
+class ImportSummary(BaseModel):
+    """Model for the result of a bulk import."""
+    imported: int = Field(0, description="The number of imported entries")
+    failed: int = Field(0, description="The number of rejected records")
+    errors: List[ImportRowError] = Field(
+        default_factory=list,
+        description="The first rejected records and their errors"
+    )
+
+
+class BatchOperation(str, Enum):
+    """Enum for the operations of a batch request."""
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+
+
+class BatchItem(BaseModel):
+    """Model for one operation of a batch request."""
+    op: BatchOperation = Field(..., description="The operation")
+    id: Optional[int] = Field(
+        None, description="The ID of the item to update or delete")
+    data: Optional[dict] = Field(
+        None, description="The fields to create or update")
+
+
+class BatchRequest(BaseModel):
+    """Model for a batch of operations applied in one transaction."""
+    operations: List[BatchItem] = Field(
+        ..., min_length=1, max_length=500,
+        description="The operations, applied as creates, updates, deletes"
+    )
+
+
+class BatchItemResult(BaseModel):
+    """Model for the result of one operation of a batch request."""
+    index: int = Field(..., description="The position of the operation")
+    op: BatchOperation = Field(..., description="The operation")
+    id: Optional[int] = Field(None, description="The ID of the item")
+    status: int = Field(..., description="The HTTP status of the operation")
+    error: Optional[str] = Field(None, description="Why the operation failed")
+
+
+class BatchResult(BaseModel):
+    """Model for the result of a batch request."""
+    succeeded: int = Field(0, description="The number of applied operations")
+    failed: int = Field(0, description="The number of rejected operations")
+    results: List[BatchItemResult] = Field(
+        default_factory=list,
+        description="The result of every operation, in request order"
+    )
@@ -2,16 +2,18 @@
 API routes for retrieving and analyzing journal entry analytics.
 """
 
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
 
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
 from app.db.database import get_db
-from app.models.analytics import TsTrends, Averages
+from app.models.analytics import ActivityStats, TsTrends, Averages
 from app.services.analytics import AnalyticsService
 from app.services.gemini_agent import summarize_journal_entries
-from app.utils.analytics import parse_period_to_days
+from app.utils.analytics import parse_period, parse_period_to_days
+from app.utils.caching import cached
 
 
 router = APIRouter(
@@ -25,16 +27,32 @@ def get_trends(
     db: Session = Depends(get_db),
     period: str = Query(
         "30days",
-        description="Period to analyze (e.g., '7days', '30days', '90days')."
-    )
+        description="Period to analyze (e.g., '7days', '5years' or "
+                    "'2024-01-01..2024-06-30')."
+    ),
+    resolution: str = Query(
+        "auto", pattern="^(auto|day|week|month)$",
+        description="Bucket size of the points, auto keeps the number of "
+                    "points bounded"
+    ),
+    from_date: Optional[date] = Query(
+        None, description="First day of the range, overrides the period"),
+    to_date: Optional[date] = Query(
+        None, description="Last day of the range, overrides the period")
 ) -> TsTrends:
     """
     Retrieves time series data for sentiment, sleep, stress, and social
-    engagement from journal entries over a specified period.
+    engagement from journal entries over a specified period, bucketed by
+    day, week or month.
     """
-    past_days = parse_period_to_days(period)
+    from_date, to_date = parse_period(period, from_date, to_date)
     analytics_service = AnalyticsService(db)
-    return analytics_service.calculate_trends(past_days)
+    return cached(
+        "trends", (from_date, to_date, resolution),
+        lambda: analytics_service.calculate_trends(
+            0, resolution, from_date, to_date
+        )
+    )
 
 
 @router.get("/stats/", response_model=Averages)
@@ -51,7 +69,42 @@ def get_stats(
     """
     past_days = parse_period_to_days(period)
     analytics_service = AnalyticsService(db)
-    return analytics_service.calculate_averages(past_days)
+    return cached("averages", past_days,
+                  lambda: analytics_service.calculate_averages(past_days))
+
+
+@router.get("/activities/", response_model=ActivityStats)
+def get_activities(
+    db: Session = Depends(get_db),
+    period: str = Query(
+        "30days",
+        description="Period to analyze (e.g., '7days', '30days')."
+    ),
+    metric: Optional[str] = Query(
+        None, pattern="^(sentiment|sleep|stress|social)$",
+        description="Only count entries with this metric in a range"
+    ),
+    min_level: Optional[int] = Query(
+        None, ge=1, le=5, description="Minimum value of the metric"),
+    max_level: Optional[int] = Query(
+        None, ge=1, le=5, description="Maximum value of the metric"),
+    limit: int = Query(20, ge=1, le=100,
+                       description="Number of activities to return")
+) -> ActivityStats:
+    """
+    Retrieves the most frequent activities of a period with the average
+    sentiment, sleep, stress and social engagement on entries with each
+    activity. With metric and min_level/max_level only entries in that
+    range count, e.g. metric=stress&min_level=4 for high-stress days.
+    """
+    past_days = parse_period_to_days(period)
+    analytics_service = AnalyticsService(db)
+    return cached(
+        "activities", (past_days, metric, min_level, max_level, limit),
+        lambda: analytics_service.calculate_activities(
+            past_days, metric, min_level, max_level, limit
+        )
+    )
 
 
 @router.get("/correlations/")
@@ -64,10 +117,36 @@ def get_correlations(
 ):
     """
     Calculates and retrieves correlations between state tracking fields.
+    Insights are served separately by /correlations/insights/.
     """
     past_days = parse_period_to_days(period)
     analytics_service = AnalyticsService(db)
-    return analytics_service.calculate_correlations(past_days)
+    return cached("correlations", past_days,
+                  lambda: analytics_service.calculate_correlations(past_days))
+
+
+@router.get("/correlations/insights/")
+def get_correlation_insights(
+    db: Session = Depends(get_db),
+    period: str = Query(
+        "30days",
+        description="Period for correlation analysis (e.g., '30days')."
+    )
+) -> Dict[str, List[str]]:
+    """
+    Generates insights for the strongest correlations of a period, keyed
+    like the correlations returned by /correlations/.
+    """
+    past_days = parse_period_to_days(period)
+    analytics_service = AnalyticsService(db)
+    correlations = cached(
+        "correlations", past_days,
+        lambda: analytics_service.calculate_correlations(past_days)
+    )
+    return cached(
+        "correlation_insights", past_days,
+        lambda: analytics_service.generate_correlation_insights(correlations)
+    )
 
 
 @router.get("/summary/")
@@ -82,14 +161,18 @@ def generate_summary(
     Generates a summary of journal entries for a specified period.
     """
     past_days = parse_period_to_days(period)
-    to_date = datetime.now()
-    from_date = to_date - timedelta(days=past_days)
-
-    analytics_service = AnalyticsService(db)
-    entry_details = analytics_service.prepare_summary_data(from_date, to_date)
-
-    if not entry_details:
-        return {"summary": "No journal entries found for the specified period."}
 
-    summary = summarize_journal_entries("\n".join(entry_details))
-    return {"summary": summary}
+    def summarize():
+        to_date = datetime.now()
+        from_date = to_date - timedelta(days=past_days)
+        analytics_service = AnalyticsService(db)
+        entry_details = analytics_service.prepare_summary_data(
+            from_date, to_date
+        )
+        if not entry_details:
+            return {
+                "summary": "No journal entries found for the specified period."
+            }
+        return {"summary": summarize_journal_entries("\n".join(entry_details))}
+
+    return cached("summary", past_days, summarize)
@@ -1,13 +1,32 @@
 """
 API routes for AI chatbot interactions and journal question generation.
 """
-from fastapi import APIRouter, Depends
+import asyncio
+import os
+import re
+import threading
+from typing import Any, Callable
+
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.services.gemini_chatbot import get_contextual_chatbot_response
 from app.services.gemini_agent import generate_journal_question
+from app.services.gemini_client import metrics as gemini_metrics
 from app.models.chat_agent import ChatRequest, ChatResponse, JournalQuestionRequest, JournalQuestionResponse
 from app.db.database import get_db
+from app.utils.caching import PrefixCache
+
+
+# Seconds a generated question is reused for similar content
+QUESTION_CACHE_TTL = float(os.getenv("QUESTION_CACHE_TTL", "120"))
+# Characters that must change before a new question is generated
+QUESTION_MIN_DELTA = int(os.getenv("QUESTION_MIN_DELTA", "40"))
+# Status code for requests whose client went away (as used by nginx)
+CLIENT_CLOSED_REQUEST = 499
+
+question_cache = PrefixCache(max_entries=256, ttl=QUESTION_CACHE_TTL)
 
 
 router = APIRouter(
@@ -33,17 +52,95 @@ async def chat_with_assistant(request: ChatRequest, db: Session = Depends(get_db
     return ChatResponse(text=chatbot_response)
 
 
+def normalize_content(content: str) -> str:
+    """Lowercases content and collapses whitespace for cache lookups."""
+    return re.sub(r"\s+", " ", content).strip().lower()
+
+
+async def wait_for_disconnect(http_request: Request) -> None:
+    """Returns once the client of a request has disconnected."""
+    while True:
+        message = await http_request.receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+async def run_until_disconnected(http_request: Request,
+                                 function: Callable[[threading.Event], Any],
+                                 on_result: Callable[[Any], None]) -> tuple:
+    """
+    Runs a blocking function in the thread pool and stops waiting for it
+    when the client disconnects. The function receives an event that is
+    set on disconnect, so it can skip work that has not started yet.
+
+    Args:
+        http_request (Request): The request whose client is watched. Its
+        body must have been read.
+        function (Callable[[threading.Event], Any]): The blocking function.
+        on_result (Callable[[Any], None]): Called with the result, also
+        when it arrives after the client disconnected.
+
+    Returns:
+        tuple: (True, result) if the function finished first, otherwise
+        (False, None).
+    """
+    cancelled = threading.Event()
+    task = asyncio.ensure_future(run_in_threadpool(function, cancelled))
+
+    def finished(done: asyncio.Future) -> None:
+        if not done.cancelled() and done.exception() is None:
+            on_result(done.result())
+
+    task.add_done_callback(finished)
+    disconnect = asyncio.ensure_future(wait_for_disconnect(http_request))
+    await asyncio.wait({task, disconnect},
+                       return_when=asyncio.FIRST_COMPLETED)
+    if task.done():
+        disconnect.cancel()
+        return True, task.result()
+    cancelled.set()
+    return False, None
+
+
 @router.post("/journal-question/", response_model=JournalQuestionResponse)
-async def get_journal_question(request: JournalQuestionRequest):
+async def get_journal_question(request: JournalQuestionRequest,
+                               http_request: Request):
     """
     Endpoint to get an AI-generated follow-up question for a journal entry.
+    A question generated for nearly the same content is reused, and the
+    model call is abandoned if the client disconnects, e.g. because the
+    user kept typing.
 
     Args:
         request (JournalQuestionRequest):
         The request containing the journal entry content.
+        http_request (Request): The HTTP request, watched for a disconnect.
 
     Returns:
         JournalQuestionResponse: The AI-generated question.
     """
-    question = generate_journal_question(request.content)
+    content = normalize_content(request.content)
+    hit, question = question_cache.find(content, QUESTION_MIN_DELTA)
+    if hit:
+        return JournalQuestionResponse(question=question)
+
+    finished, question = await run_until_disconnected(
+        http_request,
+        lambda cancelled: generate_journal_question(request.content, cancelled),
+        lambda result: question_cache.set(content, result),
+    )
+    if not finished:
+        return Response(status_code=CLIENT_CLOSED_REQUEST)
     return JournalQuestionResponse(question=question)
+
+
+@router.get("/metrics/", response_model=dict)
+def get_ai_metrics() -> dict:
+    """
+    Endpoint to get call, retry, rate limit and token counters of the
+    Gemini client together with the circuit breaker state.
+
+    Returns:
+        dict: The current Gemini client metrics.
+    """
+    return gemini_metrics.snapshot()
@@ -3,11 +3,15 @@ API routes for managing goals, including CRUD operations
 and AI-driven recommendations.
 """
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from datetime import date
+from typing import List, Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from fastapi.responses import Response
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
 from app.db.database import get_db
+from app.db.crud.batch import apply_goal_batch
 from app.db.crud.goal import (
     create_goal,
     get_goal,
@@ -16,13 +20,22 @@ from app.db.crud.goal import (
     delete_goal
 )
 from app.db.crud.journal import get_journal_entries
-from app.models.entry_goal import GoalCreate, Goal, GoalUpdate
+from app.models.entry_goal import (
+    BatchRequest,
+    BatchResult,
+    GoalCreate,
+    Goal,
+    GoalSummary,
+    GoalUpdate
+)
 from app.models.chat_agent import EnhanceDescriptionRequest
 from app.services.gemini_agent import (
     recommend_goals,
     RecommendedGoal,
     enhance_goal_description,
 )
+from app.services.goal_matching import rematch_goal
+from app.utils.responses import json_response
 
 
 router = APIRouter(
@@ -31,6 +44,10 @@ router = APIRouter(
     responses={404: {"description": "Goal not found"}},
 )
 
+GOAL_ADAPTER = TypeAdapter(Goal)
+GOAL_LIST_ADAPTER = TypeAdapter(List[Goal])
+GOAL_SUMMARY_ADAPTER = TypeAdapter(GoalSummary)
+
 
 @router.get("/", response_model=List[Goal])
 def read_goals(
@@ -38,27 +55,39 @@ def read_goals(
         0, ge=0, description="Number of items to skip (for pagination)"),
     limit: int = Query(100, ge=1, le=100,
                        description="Max number of items to return"),
+    category: Optional[str] = Query(
+        None, description="Only goals of this category"),
+    goal_type: Optional[str] = Query(
+        None, alias="type", description="Only goals of this type"),
+    due_before: Optional[date] = Query(
+        None, description="Only goals with a target date on or before this date"),
     db: Session = Depends(get_db)
-) -> List[Goal]:
+) -> Response:
     """
-    Retrieves a list of goals with pagination.
+    Retrieves a list of goals with optional filtering and pagination,
+    ordered by priority and target date.
 
     Args:
         skip (int): The number of goals to skip.
         limit (int): The maximum number of goals to return.
+        category (Optional[str]): Filter by category.
+        goal_type (Optional[str]): Filter by goal type.
+        due_before (Optional[date]): Filter by latest target date.
         db (Session): The database session dependency.
 
     Returns:
-        List[Goal]: A list of goals.
+        Response: The list of goals as JSON.
     """
-    return get_goals(db, skip=skip, limit=limit)
+    goals = get_goals(db, skip=skip, limit=limit, category=category,
+                      goal_type=goal_type, due_before=due_before)
+    return json_response(GOAL_LIST_ADAPTER, goals)
 
 
 @router.get("/{goal_id}", response_model=Goal)
 def read_goal(
     goal_id: int,
     db: Session = Depends(get_db)
-) -> Goal:
+) -> Response:
     """
     Retrieves a specific goal by its ID.
 
@@ -70,56 +99,92 @@ def read_goal(
         HTTPException: If the goal is not found.
 
     Returns:
-        Goal: The retrieved goal.
+        Response: The retrieved goal as JSON.
     """
     db_goal = get_goal(db, goal_id)
     if db_goal is None:
         raise HTTPException(status_code=404, detail="Goal not found")
-    return db_goal
+    return json_response(GOAL_ADAPTER, db_goal)
 
 
 @router.post("/", response_model=Goal)
 def create_goal_route(
     goal: GoalCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
-) -> Goal:
+) -> Response:
     """
-    Creates a new goal.
+    Creates a new goal. Existing journal entries are matched to the
+    goal in the background.
 
     Args:
         goal (GoalCreate): The goal data to create.
+        background_tasks (BackgroundTasks): Tasks run after the response.
+        db (Session): The database session dependency.
+
+    Returns:
+        Response: The newly created goal as JSON.
+    """
+    db_goal = create_goal(db, goal)
+    background_tasks.add_task(rematch_goal, db_goal.id)
+    return json_response(GOAL_ADAPTER, db_goal)
+
+
+@router.post("/batch", response_model=BatchResult)
+def batch_goals(
+    request: BatchRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+) -> BatchResult:
+    """
+    Creates, updates and deletes several goals in one transaction.
+    Journal entries are re-matched in the background to created goals
+    and to goals whose title or description changed.
+
+    Args:
+        request (BatchRequest): The operations.
+        background_tasks (BackgroundTasks): Tasks run after the response.
         db (Session): The database session dependency.
 
     Returns:
-        Goal: The newly created goal.
+        BatchResult: The result of every operation.
     """
-    return create_goal(db, goal)
+    result, rematch = apply_goal_batch(db, request)
+    for goal_id in rematch:
+        background_tasks.add_task(rematch_goal, goal_id)
+    return result
 
 
-@router.put("/{goal_id}", response_model=Goal)
+@router.put("/{goal_id}", response_model=GoalSummary)
 def update_goal_route(
     goal_id: int,
     goal_update: GoalUpdate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
-) -> Goal:
+) -> Response:
     """
-    Updates an existing goal.
+    Updates an existing goal. If the title or description changed,
+    journal entries are re-matched to the goal in the background.
+    The response contains the goal without its journal entries.
 
     Args:
         goal_id (int): The ID of the goal to update.
         goal_update (GoalUpdate): The updated goal data.
+        background_tasks (BackgroundTasks): Tasks run after the response.
         db (Session): The database session dependency.
 
     Raises:
         HTTPException: If the goal is not found.
 
     Returns:
-        Goal: The updated goal.
+        Response: The updated goal as JSON.
     """
     db_goal = update_goal(db, goal_id, goal_update)
     if db_goal is None:
         raise HTTPException(status_code=404, detail="Goal not found")
-    return db_goal
+    if goal_update.model_fields_set & {"title", "description"}:
+        background_tasks.add_task(rematch_goal, goal_id)
+    return json_response(GOAL_SUMMARY_ADAPTER, db_goal)
 
 
 @router.delete("/{goal_id}", response_model=dict)
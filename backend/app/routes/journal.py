@@ -2,12 +2,19 @@
 API routes for managing journal entries.
 """
 
-from typing import List
+import io
+import tempfile
+from datetime import date
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
 from app.db.database import get_db
+from app.db.crud.batch import apply_entry_batch
 from app.db.crud.journal import (
     create_journal_entry,
     get_journal_entry,
@@ -16,10 +23,16 @@ from app.db.crud.journal import (
     delete_journal_entry
 )
 from app.models.entry_goal import (
+    BatchRequest,
+    BatchResult,
+    ImportSummary,
     JournalEntryCreate,
     JournalEntry,
     JournalEntryUpdate
 )
+from app.services.exporter import FORMATS, export, parquet_available
+from app.services.importer import BATCH_SIZE, import_file
+from app.utils.responses import json_response
 
 router = APIRouter(
     prefix="/journal",
@@ -27,6 +40,9 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
+ENTRY_ADAPTER = TypeAdapter(JournalEntry)
+ENTRY_LIST_ADAPTER = TypeAdapter(List[JournalEntry])
+
 
 @router.get("/entries/", response_model=List[JournalEntry])
 def read_entries(
@@ -35,7 +51,7 @@ def read_entries(
     limit: int = Query(100, ge=1, le=100,
                        description="Max number of items to return"),
     db: Session = Depends(get_db)
-) -> List[JournalEntry]:
+) -> Response:
     """
     Retrieves a list of journal entries with pagination.
 
@@ -45,20 +61,17 @@ def read_entries(
         db (Session): The database session dependency.
 
     Returns:
-        List[JournalEntry]: A list of journal entries.
+        Response: The list of journal entries as JSON.
     """
     entries = get_journal_entries(db, skip=skip, limit=limit)
-    return [
-        JournalEntry.model_validate(entry, from_attributes=True)
-        for entry in entries
-    ]
+    return json_response(ENTRY_LIST_ADAPTER, entries)
 
 
 @router.get("/entries/{entry_id}", response_model=JournalEntry)
 def read_entry(
     entry_id: int,
     db: Session = Depends(get_db)
-) -> JournalEntry:
+) -> Response:
     """
     Retrieves a specific journal entry by its ID.
 
@@ -70,20 +83,20 @@ def read_entry(
         HTTPException: If the journal entry is not found.
 
     Returns:
-        JournalEntry: The retrieved journal entry.
+        Response: The retrieved journal entry as JSON.
     """
     db_entry = get_journal_entry(db, entry_id)
     if db_entry is None:
         raise HTTPException(status_code=404, detail="Journal entry not found")
 
-    return JournalEntry.model_validate(db_entry, from_attributes=True)
+    return json_response(ENTRY_ADAPTER, db_entry)
 
 
 @router.post("/entries/", response_model=JournalEntry)
 def create_entry(
     entry: JournalEntryCreate,
     db: Session = Depends(get_db)
-) -> JournalEntry:
+) -> Response:
     """
     Creates a new journal entry.
 
@@ -92,10 +105,112 @@ def create_entry(
         db (Session): The database session dependency.
 
     Returns:
-        JournalEntry: The newly created journal entry.
+        Response: The newly created journal entry as JSON.
     """
     db_entry = create_journal_entry(db, entry)
-    return JournalEntry.model_validate(db_entry, from_attributes=True)
+    return json_response(ENTRY_ADAPTER, db_entry)
+
+
+@router.post("/entries/batch", response_model=BatchResult)
+def batch_entries(
+    request: BatchRequest,
+    db: Session = Depends(get_db)
+) -> BatchResult:
+    """
+    Creates, updates and deletes several journal entries in one
+    transaction. Updates may replace the goal links of an entry with
+    a "goals" list of goal IDs.
+
+    Args:
+        request (BatchRequest): The operations.
+        db (Session): The database session dependency.
+
+    Returns:
+        BatchResult: The result of every operation.
+    """
+    return apply_entry_batch(db, request)
+
+
+@router.post("/entries/import", response_model=ImportSummary)
+async def import_entries(
+    request: Request,
+    file_format: Optional[str] = Query(
+        None, alias="format", pattern="^(ndjson|csv)$",
+        description="Format of the body, by default from the content type"),
+    batch_size: int = Query(BATCH_SIZE, ge=1, le=10000,
+                            description="Entries per insert transaction")
+) -> ImportSummary:
+    """
+    Imports journal entries from an NDJSON or CSV export in the request
+    body. The body is streamed to a temporary file, then validated record
+    by record and inserted in batches. The entries are not analyzed, run
+    the re-analysis job afterwards.
+
+    Args:
+        request (Request): The request with the export as its body.
+        file_format (Optional[str]): "ndjson" or "csv".
+        batch_size (int): The number of entries per transaction.
+
+    Returns:
+        ImportSummary: The number of imported and rejected records and
+        the errors of the first rejected ones.
+    """
+    if file_format is None:
+        content_type = request.headers.get("content-type", "")
+        file_format = "csv" if "csv" in content_type else "ndjson"
+
+    with tempfile.TemporaryFile() as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+        text = io.TextIOWrapper(spool, encoding="utf-8-sig", newline="")
+        try:
+            return await run_in_threadpool(
+                import_file, text, file_format, batch_size
+            )
+        except UnicodeDecodeError as exc:
+            raise HTTPException(
+                status_code=400, detail=f"Body is not valid UTF-8: {exc}"
+            ) from exc
+
+
+@router.get("/export")
+def export_entries(
+    file_format: str = Query(
+        "ndjson", alias="format", pattern="^(ndjson|csv|parquet)$",
+        description="Export format: ndjson, csv or parquet"),
+    from_date: Optional[date] = Query(
+        None, description="Only export entries on or after this date"),
+    to_date: Optional[date] = Query(
+        None, description="Only export entries on or before this date")
+) -> StreamingResponse:
+    """
+    Streams all journal entries with their goal links and AI fields.
+    Entries are read and serialized in chunks, so the export runs in
+    constant memory.
+
+    Args:
+        file_format (str): "ndjson", "csv" or "parquet".
+        from_date (Optional[date]): The first date to export.
+        to_date (Optional[date]): The last date to export.
+
+    Raises:
+        HTTPException: If Parquet is requested but pyarrow is missing.
+
+    Returns:
+        StreamingResponse: The export as a file download.
+    """
+    if file_format == "parquet" and not parquet_available():
+        raise HTTPException(
+            status_code=501, detail="Parquet export requires pyarrow"
+        )
+    media_type, extension, _ = FORMATS[file_format]
+    filename = f"journal-{date.today().isoformat()}.{extension}"
+    return StreamingResponse(
+        export(file_format, from_date, to_date),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @router.put("/entries/{entry_id}", response_model=JournalEntry)
@@ -103,7 +218,7 @@ def update_entry(
     entry_id: int,
     entry_update: JournalEntryUpdate,
     db: Session = Depends(get_db)
-) -> JournalEntry:
+) -> Response:
     """
     Updates an existing journal entry.
 
@@ -116,13 +231,13 @@ def update_entry(
         HTTPException: If the journal entry is not found.
 
     Returns:
-        JournalEntry: The updated journal entry.
+        Response: The updated journal entry as JSON.
     """
     db_entry = update_journal_entry(db, entry_id, entry_update)
     if db_entry is None:
         raise HTTPException(status_code=404, detail="Journal entry not found")
 
-    return JournalEntry.model_validate(db_entry, from_attributes=True)
+    return json_response(ENTRY_ADAPTER, db_entry)
 
 
 @router.delete("/entries/{entry_id}", response_model=dict)
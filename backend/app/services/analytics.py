@@ -2,45 +2,78 @@
 Analytics service for calculating journal entry metrics and patterns.
 """
 
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 from typing import List, Dict, Any, Optional
 import json
+import os
 
-import numpy as np
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from app.db.crud.journal import get_journal_entries
-from app.models.analytics import TsTrends, Averages
+from app.db.database import (
+    ActivityModel,
+    JournalEntryModel,
+    entry_activities,
+)
+from app.models.analytics import (
+    ActivityStat,
+    ActivityStats,
+    Averages,
+    MetricAverages,
+    TsTrends,
+)
 from app.services.gemini_agent import generate_correlation_insights
 
 
-def calculate_moving_average(data: List[float], window: int) -> List[float]:
+# Maximum number of trend points in auto resolution
+TRENDS_MAX_POINTS = int(os.getenv("TRENDS_MAX_POINTS", "120"))
+
+# Resolution -> (SQL expression for the first day of a bucket, days per bucket)
+TREND_BUCKETS = {
+    "day": (JournalEntryModel.date, 1),
+    "week": (func.date(JournalEntryModel.date, "weekday 0", "-6 days"), 7),
+    "month": (func.strftime("%Y-%m-01", JournalEntryModel.date), 30),
+}
+
+# Names of the state tracking fields in analytics results
+METRIC_COLUMNS = {
+    "sentiment": JournalEntryModel.sentiment_level,
+    "sleep": JournalEntryModel.sleep_quality,
+    "stress": JournalEntryModel.stress_level,
+    "social": JournalEntryModel.social_engagement,
+}
+
+
+def calculate_moving_average(
+    data: List[Optional[float]], window: int
+) -> List[Optional[float]]:
     """
     Calculate centered moving average for a data series.
-    
+    Missing values are skipped and stay missing.
+
     Args:
-        data (List[float]): Input data series
+        data (List[Optional[float]]): Input data series
         window (int): Size of the moving window
-        
+
     Returns:
-        List[float]: Moving averages with same length as input data
+        List[Optional[float]]: Moving averages with same length as input data
     """
     if len(data) < window:
         return data  # Return original data if not enough points
-    
+
     result = []
     half_window = window // 2
-    
-    for i in range(len(data)):
+
+    for i, value in enumerate(data):
         # Calculate window bounds, ensuring we stay within data bounds
         start = max(0, i - half_window)
         end = min(len(data), i + half_window + 1)
-        
-        # Calculate average of current window
-        window_data = data[start:end]
-        avg = sum(window_data) / len(window_data)
-        result.append(avg)
-    
+        window_data = [x for x in data[start:end] if x is not None]
+        result.append(
+            sum(window_data) / len(window_data) if value is not None else None
+        )
+
     return result
 
 
@@ -50,33 +83,80 @@ class AnalyticsService:
     def __init__(self, db: Session):
         self.db = db
 
-    def calculate_trends(self, past_days: int) -> TsTrends:
-        cutoff_date = datetime.now(timezone.utc) - timedelta(days=past_days)
-        entries = sorted(get_journal_entries(
-            self.db, from_date=cutoff_date), key=lambda x: x.date)
-        if not entries:
-            return TsTrends(dates=[], sentiment=[], sleep=[], stress=[], social=[])
-        
+    def calculate_trends(
+        self,
+        past_days: int,
+        resolution: str = "auto",
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None
+    ) -> TsTrends:
+        """
+        Calculate the trends of the state tracking fields, bucketed by day,
+        week or month in SQL with the mean, minimum and maximum of each
+        bucket. The means are smoothed with a centered moving average
+        over 3 to 21 days.
+
+        Args:
+            past_days (int): Number of past days, used without from_date.
+            resolution (str): "day", "week", "month" or "auto", which picks
+            the finest resolution with at most TRENDS_MAX_POINTS buckets.
+            from_date (Optional[date]): First day of the range.
+            to_date (Optional[date]): Last day of the range, default today.
+
+        Returns:
+            TsTrends: The trend series.
+        """
+        to_date = to_date or date.today()
+        from_date = from_date or to_date - timedelta(days=past_days)
+        days = (to_date - from_date).days + 1
+        if resolution == "auto":
+            resolution = next(
+                (name for name, (_, bucket_days) in TREND_BUCKETS.items()
+                 if days / bucket_days <= TRENDS_MAX_POINTS),
+                "month",
+            )
+        bucket, bucket_days = TREND_BUCKETS[resolution]
+        bucket = bucket.label("bucket")
+
+        columns = [bucket]
+        for name, column in METRIC_COLUMNS.items():
+            columns += [func.avg(column).label(f"{name}_mean"),
+                        func.min(column).label(f"{name}_min"),
+                        func.max(column).label(f"{name}_max")]
+        rows = self.db.execute(
+            select(*columns)
+            .where(JournalEntryModel.date.between(from_date, to_date))
+            .group_by(bucket)
+            .order_by(bucket)
+        ).all()
+
         # Auto window size: 3-21 days based on period
-        window = min(21, max(3, past_days // 7))
-        
-        # Calculate moving averages
-        sentiment_ma = calculate_moving_average([e.sentiment_level for e in entries], window)
-        sleep_ma = calculate_moving_average([e.sleep_quality for e in entries], window)
-        stress_ma = calculate_moving_average([e.stress_level for e in entries], window)
-        social_ma = calculate_moving_average([e.social_engagement for e in entries], window)
-        
+        window = max(1, round(min(21, max(3, days // 7)) / bucket_days))
+        series = {
+            name: [
+                None if mean is None else round(mean, 2)
+                for mean in calculate_moving_average(
+                    [getattr(row, f"{name}_mean") for row in rows], window
+                )
+            ]
+            for name in METRIC_COLUMNS
+        }
         return TsTrends(
-            dates=[e.date.strftime("%Y-%m-%d") for e in entries],
-            sentiment=[round(x) for x in sentiment_ma],
-            sleep=[round(x) for x in sleep_ma],
-            stress=[round(x) for x in stress_ma],
-            social=[round(x) for x in social_ma],
+            resolution=resolution,
+            dates=[str(row.bucket) for row in rows],
+            **series,
+            minimum={name: [getattr(row, f"{name}_min") for row in rows]
+                     for name in METRIC_COLUMNS},
+            maximum={name: [getattr(row, f"{name}_max") for row in rows]
+                     for name in METRIC_COLUMNS},
         )
 
     def calculate_averages(self, past_days: int) -> Averages:
         """
         Calculate average values for sentiment, sleep, stress, and social engagement.
+        All averages are computed in a single aggregate query. SQL AVG
+        skips NULL values, so each metric is averaged over the entries
+        that have a value for it.
 
         Args:
             past_days (int): Number of past days to include in calculation.
@@ -84,41 +164,35 @@ class AnalyticsService:
         Returns:
             Averages: Object containing average values for each metric.
         """
-        cutoff_date = datetime.now(timezone.utc) - timedelta(days=past_days)
-        entries = get_journal_entries(self.db, from_date=cutoff_date)
-
-        # Calculate averages, handling cases where lists are empty to avoid zero division
-        num_entries = len(entries)
-
-        if num_entries == 0:
-            return Averages(sentiment=0.0, sleep=0.0, stress=0.0, social=0.0, total_entries=0, current_streak=0, average_words_per_entry=0.0)
-
-        sentiment_avg = sum(
-            e.sentiment_level for e in entries if e.sentiment_level is not None) / num_entries
-        sleep_avg = sum(
-            e.sleep_quality for e in entries if e.sleep_quality is not None) / num_entries
-        stress_avg = sum(
-            e.stress_level for e in entries if e.stress_level is not None) / num_entries
-        social_avg = sum(
-            e.social_engagement for e in entries if e.social_engagement is not None) / num_entries
-        total_entries = len(entries)
-        current_streak = self._calculate_current_streak()
-        average_words_per_entry = (sum(len(e.content.split(
-        )) for e in entries if e.content)) / (num_entries if num_entries > 0 else 0.0)
+        cutoff_date = (
+            datetime.now(timezone.utc) - timedelta(days=past_days)
+        ).date()
+        row = self.db.execute(
+            select(
+                func.count(JournalEntryModel.id).label("total_entries"),
+                *(func.avg(column).label(name)
+                  for name, column in METRIC_COLUMNS.items()),
+                func.avg(JournalEntryModel.word_count).label("words"),
+                func.avg(JournalEntryModel.char_count).label("chars"),
+            )
+            .where(JournalEntryModel.date >= cutoff_date)
+        ).one()
 
         return Averages(
-            sentiment=sentiment_avg,
-            sleep=sleep_avg,
-            stress=stress_avg,
-            social=social_avg,
-            total_entries=total_entries,
-            current_streak=current_streak,
-            average_words_per_entry=average_words_per_entry,
+            sentiment=row.sentiment,
+            sleep=row.sleep,
+            stress=row.stress,
+            social=row.social,
+            total_entries=row.total_entries,
+            current_streak=self._calculate_current_streak(),
+            average_words_per_entry=row.words or 0.0,
+            average_chars_per_entry=row.chars or 0.0,
         )
 
     def calculate_correlations(self, past_days: int) -> Dict[str, Any]:
         """
         Calculate correlations between different metrics and return the 2 strongest correlations.
+        Only numeric data is computed, see generate_correlation_insights.
 
         Args:
             past_days (int): Number of past days to consider for correlation analysis.
@@ -126,6 +200,8 @@ class AnalyticsService:
         Returns:
             Dict[str, Any]: Dictionary containing the 2 strongest correlations with their data points.
         """
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
         cutoff_date = datetime.now(timezone.utc) - timedelta(days=past_days)
         entries = sorted(get_journal_entries(
             self.db, from_date=cutoff_date), key=lambda x: x.date)
@@ -224,20 +300,113 @@ class AnalyticsService:
 
         top_correlations = dict(sorted_correlations[:2])
 
-        for key, value in top_correlations.items():
+        return {
+            "strongest_correlations": top_correlations,
+            "total_data_points": len(aligned_data)
+        }
+
+    def generate_correlation_insights(
+        self, correlations: Dict[str, Any]
+    ) -> Dict[str, List[str]]:
+        """
+        Generates insights for the strongest correlations. Kept apart from
+        calculate_correlations, as it calls the model once per correlation.
+
+        Args:
+            correlations (Dict[str, Any]): The result of calculate_correlations.
+
+        Returns:
+            Dict[str, List[str]]: The insights for each correlation key.
+        """
+        insights = {}
+        for key, value in correlations.get("strongest_correlations", {}).items():
             chart_data = json.dumps({
                 "x_label": value["x_label"],
                 "y_label": value["y_label"],
                 "correlation": value["correlation"],
                 "data": value["data"]
             })
-            insights = generate_correlation_insights(chart_data)
-            top_correlations[key]["insights"] = insights
+            insights[key] = generate_correlation_insights(chart_data)
+        return insights
 
-        return {
-            "strongest_correlations": top_correlations,
-            "total_data_points": len(aligned_data)
-        }
+    def calculate_activities(
+        self,
+        past_days: int,
+        metric: Optional[str] = None,
+        min_level: Optional[int] = None,
+        max_level: Optional[int] = None,
+        limit: int = 20
+    ) -> ActivityStats:
+        """
+        Calculates how often each activity occurred and the average state
+        tracking values on entries with it, in SQL over the normalized
+        activity tables. Entries can be restricted to a range of one
+        metric, e.g. stress >= 4 for activities co-occurring with high
+        stress.
+
+        Args:
+            past_days (int): Number of past days to consider.
+            metric (Optional[str]): A key of METRIC_COLUMNS to filter on.
+            min_level (Optional[int]): The minimum value of the metric.
+            max_level (Optional[int]): The maximum value of the metric.
+            limit (int): The maximum number of activities, most frequent first.
+
+        Returns:
+            ActivityStats: The activity statistics.
+        """
+        cutoff_date = (
+            datetime.now(timezone.utc) - timedelta(days=past_days)
+        ).date()
+        conditions = [JournalEntryModel.date >= cutoff_date]
+        if metric is not None:
+            column = METRIC_COLUMNS[metric]
+            if min_level is not None:
+                conditions.append(column >= min_level)
+            if max_level is not None:
+                conditions.append(column <= max_level)
+
+        averages = [
+            func.avg(column).label(name)
+            for name, column in METRIC_COLUMNS.items()
+        ]
+        baseline = self.db.execute(
+            select(func.count(JournalEntryModel.id).label("count"), *averages)
+            .where(*conditions)
+        ).one()
+        rows = self.db.execute(
+            select(ActivityModel.name,
+                   func.count(JournalEntryModel.id).label("count"),
+                   *averages)
+            .select_from(entry_activities)
+            .join(ActivityModel,
+                  ActivityModel.id == entry_activities.c.activity_id)
+            .join(JournalEntryModel,
+                  JournalEntryModel.id == entry_activities.c.journal_id)
+            .where(*conditions)
+            .group_by(ActivityModel.id)
+            .order_by(func.count(JournalEntryModel.id).desc(),
+                      ActivityModel.name)
+            .limit(limit)
+        ).all()
+
+        def metric_averages(row) -> MetricAverages:
+            return MetricAverages(**{
+                name: getattr(row, name) for name in METRIC_COLUMNS
+            })
+
+        return ActivityStats(
+            total_entries=baseline.count,
+            baseline=metric_averages(baseline),
+            activities=[
+                ActivityStat(
+                    activity=row.name,
+                    count=row.count,
+                    frequency=row.count / baseline.count,
+                    averages=metric_averages(row),
+                )
+                for row in rows
+            ],
+        )
 
     def prepare_summary_data(
         self,
@@ -281,31 +450,16 @@ class AnalyticsService:
         Returns:
             int: Number of consecutive days with entries (starting from today).
         """
-        # Hole alle Einträge der letzten z.B. 365 Tage
-        cutoff_date = datetime.now(timezone.utc) - timedelta(days=365)
-        entries = get_journal_entries(self.db, from_date=cutoff_date)
-        
-        if not entries:
-            return 0
-        
-        # Sortiere Einträge nach Datum (neueste zuerst)
-        entries = sorted(entries, key=lambda x: x.date, reverse=True)
-        
-        # Extrahiere nur die Datumsteile (ohne Zeit) als Set für schnelle Lookups
-        entry_dates = set()
-        for entry in entries:
-            # Konvertiere das Datum zu einem date() Objekt
-            if isinstance(entry.date, datetime):
-                entry_dates.add(entry.date.date())
-            else:
-                entry_dates.add(entry.date)
-        
-        # Berechne Streak ab heute
         current_date = datetime.now(timezone.utc).date()
+        # Only the distinct dates of the past year are read
+        entry_dates = set(self.db.scalars(
+            select(JournalEntryModel.date).distinct()
+            .where(JournalEntryModel.date >= current_date - timedelta(days=365))
+        ))
+
         streak = 0
-        
         while current_date in entry_dates:
             streak += 1
             current_date -= timedelta(days=1)
-        
-        return streak
\ No newline at end of file
+
+        return streak
@@ -0,0 +1,251 @@
+"""
+Streaming export of the full journal.
+
+Reads the entries with their goal links and AI fields in chunks, paging
+by ID with a short session per chunk, and serializes each chunk as soon
+as it is read, so memory use is independent of the size of the journal.
+No read lock is held while a chunk is sent, so a slow download does not
+block writers; entries written during an export may or may not be
+included. NDJSON and
+CSV exports use the field names of the importer and can be imported
+again. Parquet export requires the optional pyarrow package.
+
+Run from the backend directory:
+    python -m app.services.exporter journal.ndjson
+    python -m app.services.exporter journal.parquet --from-date 2024-01-01
+"""
+
+import argparse
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy import Select, func, select
+
+import app.config  # noqa: F401  pylint: disable=unused-import
+from app.db.database import (
+    SessionLocal,
+    JournalEntryModel,
+    journal_goal_association,
+)
+
+
+CHUNK_SIZE = 1000
+
+EXPORT_COLUMNS = [
+    "id", "title", "date", "content", "sentiment_level", "sleep_quality",
+    "stress_level", "social_engagement", "formatted_content", "activities",
+    "sentiments", "analysis_version", "created_at", "updated_at",
+]
+
+
+def export_query(from_date: Optional[date] = None,
+                 to_date: Optional[date] = None) -> Select:
+    """
+    Builds the query for the exported entries with their goal IDs.
+    Entries are ordered by ID, which SQLite reads in index order without
+    sorting the result.
+
+    Args:
+        from_date (Optional[date]): Only export entries on or after it.
+        to_date (Optional[date]): Only export entries on or before it.
+
+    Returns:
+        Select: The query.
+    """
+    query = (
+        select(
+            *(getattr(JournalEntryModel, column) for column in EXPORT_COLUMNS),
+            func.group_concat(journal_goal_association.c.goal_id, ";")
+            .label("goals"),
+        )
+        .outerjoin(journal_goal_association,
+                   journal_goal_association.c.journal_id == JournalEntryModel.id)
+        .group_by(JournalEntryModel.id)
+        .order_by(JournalEntryModel.id)
+    )
+    if from_date:
+        query = query.where(JournalEntryModel.date >= from_date)
+    if to_date:
+        query = query.where(JournalEntryModel.date <= to_date)
+    return query
+
+
+def iter_chunks(from_date: Optional[date] = None,
+                to_date: Optional[date] = None,
+                chunk_size: int = CHUNK_SIZE) -> Iterator[List[dict]]:
+    """
+    Reads the exported entries in chunks. Each chunk is read in its own
+    short session continuing after the last ID of the previous one, so
+    the database is not locked while the caller processes a chunk.
+
+    Args:
+        from_date (Optional[date]): Only export entries on or after it.
+        to_date (Optional[date]): Only export entries on or before it.
+        chunk_size (int): The number of entries per chunk.
+
+    Yields:
+        List[dict]: The entries of a chunk, goals as a list of IDs.
+    """
+    query = export_query(from_date, to_date).limit(chunk_size)
+    last_id = 0
+    while True:
+        with SessionLocal() as db:
+            rows = db.execute(
+                query.where(JournalEntryModel.id > last_id)
+            ).all()
+        if not rows:
+            return
+        chunk = []
+        for row in rows:
+            entry = row._asdict()
+            entry["goals"] = sorted(
+                int(goal_id) for goal_id in (entry["goals"] or "").split(";")
+                if goal_id
+            )
+            chunk.append(entry)
+        yield chunk
+        if len(rows) < chunk_size:
+            return
+        last_id = rows[-1].id
+
+
+def json_default(value):
+    """Serializes dates for json.dumps."""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def stream_ndjson(chunks: Iterator[List[dict]]) -> Iterator[bytes]:
+    """Serializes chunks of entries as NDJSON, one object per line."""
+    for chunk in chunks:
+        yield "".join(
+            json.dumps(entry, default=json_default) + "\n" for entry in chunk
+        ).encode()
+
+
+def stream_csv(chunks: Iterator[List[dict]]) -> Iterator[bytes]:
+    """Serializes chunks of entries as CSV with goal IDs separated by ';'."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS + ["goals"])
+    writer.writeheader()
+    for chunk in chunks:
+        writer.writerows(
+            {**entry, "goals": ";".join(map(str, entry["goals"]))}
+            for entry in chunk
+        )
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class ChunkSink(io.RawIOBase):
+    """Write-only stream that hands written bytes out in chunks."""
+
+    def __init__(self):
+        super().__init__()
+        self.parts: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.parts.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        """Returns and forgets the bytes written so far."""
+        data = b"".join(self.parts)
+        self.parts = []
+        return data
+
+
+def parquet_available() -> bool:
+    """Checks whether the optional pyarrow package is installed."""
+    try:
+        import pyarrow  # pylint: disable=import-outside-toplevel,unused-import
+    except ImportError:
+        return False
+    return True
+
+
+def stream_parquet(chunks: Iterator[List[dict]]) -> Iterator[bytes]:
+    """Serializes chunks of entries as Parquet, one row group per chunk."""
+    # pylint: disable=import-outside-toplevel
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("id", pa.int64()), ("title", pa.string()), ("date", pa.date32()),
+        ("content", pa.string()), ("sentiment_level", pa.int8()),
+        ("sleep_quality", pa.int8()), ("stress_level", pa.int8()),
+        ("social_engagement", pa.int8()), ("formatted_content", pa.string()),
+        ("activities", pa.string()), ("sentiments", pa.string()),
+        ("analysis_version", pa.int32()), ("created_at", pa.timestamp("us")),
+        ("updated_at", pa.timestamp("us")), ("goals", pa.list_(pa.int64())),
+    ])
+    sink = ChunkSink()
+    with pq.ParquetWriter(sink, schema, compression="zstd") as writer:
+        for chunk in chunks:
+            writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+# format -> (media type, file extension, serializer)
+FORMATS: Dict[str, tuple] = {
+    "ndjson": ("application/x-ndjson", "ndjson", stream_ndjson),
+    "csv": ("text/csv", "csv", stream_csv),
+    "parquet": ("application/vnd.apache.parquet", "parquet", stream_parquet),
+}
+
+
+def export(file_format: str, from_date: Optional[date] = None,
+           to_date: Optional[date] = None) -> Iterator[bytes]:
+    """
+    Streams the journal in the given format.
+
+    Args:
+        file_format (str): One of FORMATS.
+        from_date (Optional[date]): Only export entries on or after it.
+        to_date (Optional[date]): Only export entries on or before it.
+
+    Returns:
+        Iterator[bytes]: The serialized export.
+    """
+    serializer: Callable = FORMATS[file_format][2]
+    return serializer(iter_chunks(from_date, to_date))
+
+
+def main():
+    """Parses command line arguments and writes the export."""
+    parser = argparse.ArgumentParser(
+        description="Export the journal as NDJSON, CSV or Parquet."
+    )
+    parser.add_argument("path", help="The output file")
+    parser.add_argument("--format", choices=list(FORMATS),
+                        help="The export format (default: from the path)")
+    parser.add_argument("--from-date", type=date.fromisoformat)
+    parser.add_argument("--to-date", type=date.fromisoformat)
+    args = parser.parse_args()
+
+    file_format = args.format or next(
+        (name for name, (_, extension, _) in FORMATS.items()
+         if args.path.lower().endswith(f".{extension}")),
+        "ndjson",
+    )
+    if file_format == "parquet" and not parquet_available():
+        parser.error("Parquet export requires pyarrow (pip install pyarrow)")
+    with open(args.path, "wb") as file:
+        for data in export(file_format, args.from_date, args.to_date):
+            file.write(data)
+    print(f"Exported to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
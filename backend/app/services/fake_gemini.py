@@ -0,0 +1,230 @@
+"""
+Deterministic fake of the Gemini client for load tests and local
+development without an API key.
+
+Responses honor the requested response schema: every field of the
+pydantic model is filled with values derived from a hash of the prompt,
+so the same prompt always produces the same response. Latency and
+injected errors follow configurable distributions.
+
+Enable with GEMINI_PROVIDER=fake. Settings:
+    FAKE_GEMINI_LATENCY_MS      median latency per call (default 200)
+    FAKE_GEMINI_LATENCY_SIGMA   log-normal spread of the latency (default 0.5)
+    FAKE_GEMINI_ERROR_RATE      share of calls failing with 503 (default 0)
+    FAKE_GEMINI_RATE_LIMIT_RATE share of calls failing with 429 (default 0)
+    FAKE_GEMINI_SEED            seed for latency and error sampling
+"""
+
+import enum
+import hashlib
+import os
+import random
+import re
+import threading
+import time
+import typing
+from types import SimpleNamespace
+from typing import Any, List, Optional
+
+from pydantic import BaseModel
+
+
+WORDS = [
+    "morning", "walk", "coffee", "meeting", "project", "reading", "friends",
+    "dinner", "running", "music", "focus", "rest", "planning", "cooking",
+]
+
+
+class FakeModels:
+    """Fake of genai_client.models with schema-aware responses."""
+
+    def __init__(
+        self,
+        latency_ms: float = 200.0,
+        latency_sigma: float = 0.5,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        seed: Optional[int] = None
+    ):
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def _sample(self) -> tuple:
+        with self.lock:
+            latency = self.random.lognormvariate(0, self.latency_sigma)
+            roll = self.random.random()
+        return self.latency_ms * latency / 1000, roll
+
+    def generate_content(
+        self,
+        model: str,
+        contents: Any,
+        config: Optional[dict] = None
+    ) -> SimpleNamespace:
+        """
+        Simulates a generate_content call.
+
+        Args:
+            model (str): The model name (ignored).
+            contents (Any): The prompt.
+            config (Optional[dict]): The generation config.
+
+        Raises:
+            google.genai.errors.APIError: For injected errors.
+
+        Returns:
+            SimpleNamespace: A response with parsed, text and usage_metadata.
+        """
+        latency, roll = self._sample()
+        time.sleep(latency)
+        if roll < self.error_rate + self.rate_limit_rate:
+            # pylint: disable=import-outside-toplevel
+            from google.genai import errors
+            code = 503 if roll < self.error_rate else 429
+            raise errors.APIError(code, {"error": {
+                "code": code,
+                "message": "Injected fake error",
+                "status": "UNAVAILABLE" if code == 503 else "RESOURCE_EXHAUSTED",
+            }})
+        return build_response(str(contents), (config or {}).get("response_schema"))
+
+
+class FakeBatches:
+    """Fake of genai_client.batches that completes jobs immediately."""
+
+    def __init__(self, models: FakeModels):
+        self.models = models
+        self.jobs = {}
+
+    def create(self, model: str, src: List[dict], config: Optional[dict] = None):
+        """Runs all inlined requests and stores the finished job."""
+        name = f"batches/fake-{len(self.jobs) + 1}"
+        responses = []
+        for request in src:
+            prompt = request["contents"][0]["parts"][0]["text"]
+            schema = request.get("config", {}).get("response_schema")
+            responses.append(SimpleNamespace(
+                metadata=request.get("metadata"),
+                error=None,
+                response=build_response(prompt, schema),
+            ))
+        self.jobs[name] = SimpleNamespace(
+            name=name,
+            state="JOB_STATE_SUCCEEDED",
+            dest=SimpleNamespace(inlined_responses=responses),
+        )
+        return self.jobs[name]
+
+    def get(self, name: str):
+        """Returns a previously created job."""
+        return self.jobs[name]
+
+
+class FakeGeminiClient:
+    """Fake of genai.Client exposing models and batches."""
+
+    def __init__(self, **kwargs):
+        self.models = FakeModels(**kwargs)
+        self.batches = FakeBatches(self.models)
+
+
+def create_fake_client() -> FakeGeminiClient:
+    """
+    Creates a fake client configured from FAKE_GEMINI_* variables.
+
+    Returns:
+        FakeGeminiClient: The fake client.
+    """
+    seed = os.getenv("FAKE_GEMINI_SEED")
+    return FakeGeminiClient(
+        latency_ms=float(os.getenv("FAKE_GEMINI_LATENCY_MS", "200")),
+        latency_sigma=float(os.getenv("FAKE_GEMINI_LATENCY_SIGMA", "0.5")),
+        error_rate=float(os.getenv("FAKE_GEMINI_ERROR_RATE", "0")),
+        rate_limit_rate=float(os.getenv("FAKE_GEMINI_RATE_LIMIT_RATE", "0")),
+        seed=int(seed) if seed else None,
+    )
+
+
+def build_response(prompt: str, schema: Optional[type]) -> SimpleNamespace:
+    """
+    Builds a deterministic response for a prompt.
+
+    Args:
+        prompt (str): The prompt.
+        schema (Optional[type]): The pydantic response schema, if any.
+
+    Returns:
+        SimpleNamespace: A response with parsed, text and usage_metadata.
+    """
+    rng = random.Random(hashlib.sha256(prompt.encode()).hexdigest())
+    ids = prompt_ids(prompt)
+    if schema is None:
+        # Free-text call, e.g. comma-separated goal IDs
+        parsed = None
+        text = ", ".join(str(i) for i in pick_ids(ids, rng))
+    else:
+        parsed = schema.model_validate(build_value(schema, "", rng, ids))
+        text = parsed.model_dump_json()
+    usage = SimpleNamespace(
+        prompt_token_count=max(1, len(prompt) // 4),
+        candidates_token_count=max(1, len(text) // 4),
+    )
+    return SimpleNamespace(parsed=parsed, text=text, usage_metadata=usage)
+
+
+def prompt_ids(prompt: str) -> List[int]:
+    """Finds the goal and entry IDs listed in a prompt."""
+    found = set()
+    for found_id in re.findall(r"\[(?:Goal|Entry) (\d+)\]", prompt):
+        found.add(int(found_id))
+    return sorted(found)
+
+
+def pick_ids(ids: List[int], rng: random.Random) -> List[int]:
+    """Picks a deterministic subset of IDs."""
+    return [i for i in ids if rng.random() < 0.3]
+
+
+def build_value(annotation: Any, name: str, rng: random.Random,
+                ids: List[int]) -> Any:
+    """
+    Builds a JSON-compatible value for a type annotation.
+
+    Args:
+        annotation (Any): The type to build a value for.
+        name (str): The field name, used for ID fields.
+        rng (random.Random): The prompt-seeded random generator.
+        ids (List[int]): IDs found in the prompt.
+
+    Returns:
+        Any: The generated value.
+    """
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    if origin is typing.Union:
+        return build_value(
+            next(arg for arg in args if arg is not type(None)), name, rng, ids
+        )
+    if origin in (list, List):
+        if args and args[0] is int and name.endswith("ids"):
+            return pick_ids(ids, rng)
+        return [build_value(args[0], name, rng, ids)
+                for _ in range(rng.randint(1, 3))]
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return {
+            field: build_value(info.annotation, field, rng, ids)
+            for field, info in annotation.model_fields.items()
+        }
+    if isinstance(annotation, type) and issubclass(annotation, enum.Enum):
+        return rng.choice(list(annotation)).value
+    if annotation is int:
+        return rng.randint(1, 5)
+    if annotation is float:
+        return round(rng.random(), 2)
+    if annotation is bool:
+        return rng.random() < 0.5
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 12))).capitalize()
@@ -7,29 +7,32 @@ activities and sentiments, and generating follow-up questions.
 
 import os
 import concurrent.futures
+import threading
 from typing import List, Optional
 
-from dotenv import load_dotenv
-from google import genai
-
 from app.models.chat_agent import (
     FormattedText,
     ActivityList,
     SentimentList,
+    EntryAnalysis,
+    EntryMatchList,
     RecommendedGoal,
     RecommendedGoalList,
     InsightList,
 )
+from app.services.gemini_client import get_client
 
 
-# Load environment variables
-load_dotenv()
-api_key = os.getenv("GEMINI_API_KEY")
-
-# Initialize Gemini client
-genai_client = genai.Client(api_key=api_key)
 model = "gemini-2.0-flash"
 
+# Bump whenever the analysis prompts change so that existing entries
+# are picked up by the re-analysis job
+ANALYSIS_VERSION = 1
+
+# "combined" analyzes an entry with a single request,
+# "split" uses one request per analysis step
+analysis_mode = os.getenv("GEMINI_ANALYSIS_MODE", "combined")
+
 
 def recommend_goals(entries: str) -> List[RecommendedGoal]:
     """
@@ -41,7 +44,7 @@ def recommend_goals(entries: str) -> List[RecommendedGoal]:
     Returns:
         List[RecommendedGoal]: A list of recommended goals.
     """
-    response = genai_client.models.generate_content(
+    response = get_client().models.generate_content(
         model=model,
         contents=f"""You are an AI assistant that helps users set meaningful goals based on their journal entries.
 
@@ -90,7 +93,7 @@ def format_journal_content(content: str) -> str:
     Returns:
         str: The formatted journal entry content.
     """
-    response = genai_client.models.generate_content(
+    response = get_client().models.generate_content(
         model=model,
         contents=f"""This is a journal entry:\n\n{content}
 
@@ -133,7 +136,7 @@ def extract_activities(content: str, amount: int) -> str:
     Returns:
         str: A comma-separated string of extracted activities.
     """
-    response = genai_client.models.generate_content(
+    response = get_client().models.generate_content(
         model=model,
         contents=f"""This is a journal entry. \n\n{content}.
         Extract up to {amount} key activities mentioned in the text.
@@ -162,7 +165,7 @@ def extract_sentiments(content: str, amount: int) -> str:
     Returns:
         str: A comma-separated string of extracted sentiments.
     """
-    response = genai_client.models.generate_content(
+    response = get_client().models.generate_content(
         model=model,
         contents=f"""This is a journal entry. \n\n{content}.
         Identify the main emotions or feelings expressed in
@@ -184,13 +187,13 @@ def extract_goals(content: str, goals: str) -> List[int]:
 
     Args:
         content (str): The journal entry content.
-        goals (str): A string representation of available goals
-        with their IDs, titles, and descriptions.
+        goals (str): The available goals, one "[Goal ID] Title: Description"
+        line per goal.
 
     Returns:
         List[int]: A list of integer IDs of matched goals.
     """
-    response = genai_client.models.generate_content(
+    response = get_client().models.generate_content(
         model=model,
         contents=f"""You are a goal-matching assistant.
 
@@ -236,12 +239,65 @@ If the entry says something like “I’m trying to improve X” or “I made an
         return []
 
 
-def generate_journal_question(current_content: str) -> str:
+def match_entries_to_goal(goal: dict, entries: List[dict]) -> List[int]:
+    """
+    Identifies the journal entries that show clear, positive progress
+    toward a single goal.
+
+    Args:
+        goal (dict): The goal with its title and description.
+        entries (List[dict]): The candidate entries with their IDs,
+        dates and content.
+
+    Returns:
+        List[int]: The IDs of the matched journal entries.
+    """
+    entry_block = "\n\n".join(
+        f"[Entry {entry['id']}] ({entry['date']})\n{entry['content']}"
+        for entry in entries
+    )
+    response = get_client().models.generate_content(
+        model=model,
+        contents=f"""You are a goal-matching assistant.
+
+Goal:
+Title: {goal['title']}
+Description: {goal['description'] or "None provided."}
+
+Journal entries:
+{entry_block}
+
+Your task:
+Return the IDs of the journal entries that show **clear, positive progress** toward the goal.
+
+⚠️ Strict Rules:
+- Match an entry ONLY if it shows clear **positive action**, effort, or success related to the goal.
+- Do NOT match entries that mention doubt, hesitation, failure, opposite behavior, plans without action or only neutral mentions of the topic.
+- Return an empty list if no entry matches.
+""",
+        config={
+            "response_mime_type": "application/json",
+            "response_schema": EntryMatchList,
+        },
+    )
+    known_ids = {entry["id"] for entry in entries}
+    return [
+        entry_id for entry_id in response.parsed.entry_ids
+        if entry_id in known_ids
+    ]
+
+
+def generate_journal_question(
+    current_content: str,
+    cancelled: Optional[threading.Event] = None
+) -> str:
     """
     Generates a thoughtful, open-ended follow-up question for a journal entry.
 
     Args:
         current_content (str): The current journal entry content.
+        cancelled (Optional[threading.Event]): Cancels the call before
+        its next attempt when set.
 
     Returns:
         str: An AI-generated question to deepen reflection.
@@ -272,13 +328,14 @@ Examples:
   Question: "Outside of academics, what has been helping you unwind lately?"
 
 Question:"""
-    response = genai_client.models.generate_content(
+    response = get_client().models.generate_content(
         model=model,
         contents=prompt,
         config={
             "response_mime_type": "application/json",
             "response_schema": FormattedText,
         },
+        cancelled=cancelled,
     )
     return response.parsed.text.strip()
 
@@ -318,7 +375,7 @@ Title: "Learn a new skill"
 Current Description: "None provided."
 Output: "Embark on a journey to master a new skill that aligns with your personal or professional growth. Dedicate regular time to practice and learn."
 """
-    response = genai_client.models.generate_content(
+    response = get_client().models.generate_content(
         model=model,
         contents=prompt,
         config={
@@ -339,7 +396,7 @@ def summarize_journal_entries(entries: str) -> str:
     Returns:
         str: A detailed summary of the journal entries.
     """
-    response = genai_client.models.generate_content(
+    response = get_client().models.generate_content(
         model=model,
         contents=f"""You are a thoughtful journaling assistant.
 
@@ -370,14 +427,114 @@ Do NOT include any introductory explanations or additional metadata.
     return response.parsed.text.strip()
 
 
-def analyze_entry(content: str, goals: str) -> tuple:
+def build_analysis_prompt(
+    content: str,
+    goals: str,
+    activity_amount: int = 8,
+    sentiment_amount: int = 5
+) -> str:
+    """
+    Builds the prompt for the combined analysis of a journal entry.
+
+    Args:
+        content (str): The journal entry content to analyze.
+        goals (str): The available goals, one line per goal.
+        activity_amount (int): The maximum number of activities to extract.
+        sentiment_amount (int): The maximum number of sentiments to extract.
+
+    Returns:
+        str: The analysis prompt.
+    """
+    return f"""You are a journaling assistant. Analyze the journal entry below and fill in every field of the response.
+
+Journal entry:
+{content}
+
+Goals (IDs, titles and descriptions):
+{goals}
+
+**formatted_text:**
+- Format the entry with bold section headers for different times of day (e.g. **Morning** ☀️, **Afternoon** ☕, **Evening** 🌙), **only if the content naturally contains events from multiple times of day**. Do NOT force extra sections on short entries.
+- Insert a line break before every section like this: `\\n\\n` (exactly two newlines, no extra characters).
+- Improve unclear phrasing or fix language mistakes carefully, without changing the original personal tone or meaning.
+- Add a few relevant emojis inside the text (subtly), but don't overuse them.
+- Never add content that is not in the entry.
+
+**activities:**
+- Extract up to {activity_amount} key activities mentioned in the entry.
+- Only include an activity if it's clearly present and meaningful. Prioritize QUALITY and clarity over quantity.
+
+**sentiments:**
+- Select up to {sentiment_amount} sentiments that best match the emotional tone of the entry.
+
+**goal_ids:**
+- Return the IDs of goals toward which the entry shows **clear, positive progress** (concrete positive action, effort or success).
+- Do NOT match goals on doubt, hesitation, failure, opposite behavior, plans without action or neutral mentions of the topic.
+- Example: "I went to the gym." → Match 'Exercise regularly'. "I was planning to exercise but didn't." → No match.
+- Return an empty list if no goal matches.
+"""
+
+
+def unpack_analysis(analysis: EntryAnalysis) -> tuple:
+    """
+    Converts a combined analysis into the values stored on a journal entry.
+
+    Args:
+        analysis (EntryAnalysis): The parsed analysis response.
+
+    Returns:
+        tuple: A tuple containing:
+        (formatted_content, activities, sentiments, goal_ids).
+    """
+    return (
+        analysis.formatted_text.strip(),
+        ", ".join([activity.value for activity in analysis.activities]),
+        ", ".join([sentiment.value for sentiment in analysis.sentiments]),
+        analysis.goal_ids,
+    )
+
+
+def analyze_entry_combined(
+    content: str,
+    goals: str,
+    activity_amount: int = 8,
+    sentiment_amount: int = 5
+) -> tuple:
+    """
+    Analyzes the journal entry content with a single request that formats
+    the entry, extracts activities and sentiments and matches goals.
+
+    Args:
+        content (str): The journal entry content to analyze.
+        goals (str): The available goals, one line per goal.
+        activity_amount (int): The maximum number of activities to extract.
+        sentiment_amount (int): The maximum number of sentiments to extract.
+
+    Returns:
+        tuple: A tuple containing:
+        (formatted_content, activities, sentiments, goal_ids).
+    """
+    response = get_client().models.generate_content(
+        model=model,
+        contents=build_analysis_prompt(
+            content, goals, activity_amount, sentiment_amount
+        ),
+        config={
+            "response_mime_type": "application/json",
+            "response_schema": EntryAnalysis,
+        },
+    )
+    return unpack_analysis(response.parsed)
+
+
+def analyze_entry_split(content: str, goals: str) -> tuple:
     """
     Analyzes the journal entry content using concurrent tasks to extract
     formatted content, activities, sentiments, and associated goals.
 
     Args:
         content (str): The journal entry content to analyze.
-        goals (str): A string representation of available goals for extraction.
+        goals (str): The available goals, one line per goal.
 
     Returns:
         tuple: A tuple containing:
@@ -391,6 +548,26 @@ def analyze_entry(content: str, goals: str) -> tuple:
         return f1.result(), f2.result(), f3.result(), f4.result()
 
 
+def analyze_entry(content: str, goals: str) -> tuple:
+    """
+    Analyzes the journal entry content to extract formatted content,
+    activities, sentiments, and associated goals. Depending on the
+    GEMINI_ANALYSIS_MODE setting this uses a single combined request
+    (default) or one request per analysis step.
+
+    Args:
+        content (str): The journal entry content to analyze.
+        goals (str): The available goals, one line per goal.
+
+    Returns:
+        tuple: A tuple containing:
+        (formatted_content, activities, sentiments, goal_ids).
+    """
+    if analysis_mode == "split":
+        return analyze_entry_split(content, goals)
+    return analyze_entry_combined(content, goals)
+
+
 def generate_correlation_insights(chart_data: str) -> List[str]:
     """
     Generates three insights for a given correlation chart.
@@ -401,7 +578,7 @@ def generate_correlation_insights(chart_data: str) -> List[str]:
     Returns:
         List[str]: A list of three insight strings.
     """
-    response = genai_client.models.generate_content(
+    response = get_client().models.generate_content(
         model=model,
         contents=f"""You are an AI assistant that generates insights for correlation charts.
 Here is the data for a correlation chart:
@@ -3,23 +3,15 @@ Module for a simple Gemini-powered chatbot assistant.
 Handles user messages and provides responses based on a defined system prompt.
 """
 
-import os
-
-from dotenv import load_dotenv
-from google import genai
 from sqlalchemy.orm import Session
 
 from app.db.crud.goal import get_goals
 from app.db.crud.journal import get_journal_entries
 from app.db.database import get_db
 from app.models.chat_agent import ChatResponse
+from app.services.gemini_client import get_client
 
 
-# Load environment variables
-load_dotenv()
-api_key = os.getenv("GEMINI_API_KEY")
-# Initialize Gemini client
-genai_client = genai.Client(api_key=api_key)
 model = "gemini-2.0-flash"
 
 
@@ -72,7 +64,7 @@ def get_contextual_chatbot_response(user_message: str, db: Session) -> str:
     if context:
         system_prompt += f"\n\nHere is some additional context about the user:\n{context}"
 
-    chat_message = genai_client.models.generate_content(
+    chat_message = get_client().models.generate_content(
         model=model,
         config={"system_instruction": system_prompt,
                 "response_mime_type": "application/json",
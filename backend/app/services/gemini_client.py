@@ -0,0 +1,467 @@
+"""
+Shared Gemini client provider and the resilience layer around it.
+
+The genai.Client is created lazily on first use and shared by all
+services, so importing the application does not load the google-genai
+stack. The client is wrapped so that every generate_content call goes
+through a token-bucket rate limiter (requests and tokens per minute), is
+retried with jittered exponential backoff on rate-limit and server
+errors, is bounded by a per-call deadline and is rejected early while a
+circuit breaker is open after repeated failures.
+"""
+
+import os
+import random
+import threading
+import time
+from typing import Any, Optional
+
+from app.utils.metrics import record_llm_call
+
+
+REQUESTS_PER_MINUTE = int(os.getenv("GEMINI_REQUESTS_PER_MINUTE", "60"))
+TOKENS_PER_MINUTE = int(os.getenv("GEMINI_TOKENS_PER_MINUTE", "1000000"))
+CALL_TIMEOUT = float(os.getenv("GEMINI_TIMEOUT", "30"))
+MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", "3"))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("GEMINI_CIRCUIT_THRESHOLD", "5"))
+CIRCUIT_RESET_TIMEOUT = float(os.getenv("GEMINI_CIRCUIT_RESET", "30"))
+
+MAX_CONNECTIONS = int(os.getenv("GEMINI_MAX_CONNECTIONS", "20"))
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+_client = None
+_client_lock = threading.Lock()
+
+
+class GeminiUnavailableError(Exception):
+    """
+    Raised when a Gemini call is rejected by the circuit breaker, cannot
+    acquire rate limit capacity or exhausts its deadline or retries.
+    """
+
+
+class GeminiCallCancelled(GeminiUnavailableError):
+    """
+    Raised when a call is cancelled before an attempt, e.g. because the
+    client that requested it disconnected.
+    """
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at a per-minute rate.
+    The balance may become negative to account for usage that is only
+    known after a call finished.
+    """
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = float(per_minute)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated) * self.rate
+        )
+        self.updated = now
+
+    def acquire(self, amount: float, deadline: float) -> bool:
+        """
+        Blocks until the amount is available or the deadline passes.
+
+        Args:
+            amount (float): The number of tokens to take.
+            deadline (float): time.monotonic() value to give up at.
+
+        Returns:
+            bool: True if the tokens were taken, False on timeout.
+        """
+        amount = min(amount, self.capacity)
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return True
+                wait = (amount - self.tokens) / self.rate
+            if time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    def refund(self, amount: float) -> None:
+        """
+        Returns tokens taken for a call that was not made.
+
+        Args:
+            amount (float): The number of tokens to return.
+        """
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.capacity,
+                              self.tokens + min(amount, self.capacity))
+
+    def consume(self, amount: float) -> None:
+        """
+        Takes tokens without waiting, possibly going into debt.
+
+        Args:
+            amount (float): The number of tokens to take.
+        """
+        with self.lock:
+            self._refill()
+            self.tokens -= amount
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker that opens after a number of consecutive failures and
+    lets a single trial call through once the reset timeout has passed.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.lock = threading.Lock()
+
+    def is_open(self) -> bool:
+        """
+        Checks whether calls are rejected without changing the state.
+
+        Returns:
+            bool: True while the circuit is open and the reset timeout
+            has not passed.
+        """
+        with self.lock:
+            return (self.state == self.OPEN and
+                    time.monotonic() - self.opened_at < self.reset_timeout)
+
+    def allow(self) -> bool:
+        """
+        Checks whether a call may be attempted.
+
+        Returns:
+            bool: False while the circuit is open.
+        """
+        with self.lock:
+            if self.state == self.CLOSED:
+                return True
+            if (self.state == self.OPEN and
+                    time.monotonic() - self.opened_at >= self.reset_timeout):
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Closes the circuit after a successful call."""
+        with self.lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        """Counts a failed call and opens the circuit at the threshold."""
+        with self.lock:
+            self.failures += 1
+            if (self.state == self.HALF_OPEN or
+                    self.failures >= self.failure_threshold):
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+class GeminiMetrics:
+    """Thread-safe counters describing the Gemini calls of this process."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {
+            "calls": 0,
+            "successes": 0,
+            "failures": 0,
+            "retries": 0,
+            "rate_limited": 0,
+            "circuit_rejections": 0,
+            "cancelled": 0,
+            "prompt_tokens": 0,
+            "response_tokens": 0,
+            "latency_seconds": 0.0,
+        }
+
+    def increment(self, name: str, value: float = 1) -> None:
+        """Adds a value to a counter."""
+        with self.lock:
+            self.counters[name] += value
+
+    def snapshot(self) -> dict:
+        """Returns a copy of all counters and the circuit state."""
+        with self.lock:
+            return {**self.counters, "circuit_state": circuit_breaker.state}
+
+    def render_prometheus(self) -> str:
+        """Renders the resilience counters in the Prometheus text format."""
+        snapshot = self.snapshot()
+        lines = []
+        for name in ("retries", "rate_limited", "circuit_rejections",
+                     "cancelled"):
+            lines += [f"# TYPE gemini_{name}_total counter",
+                      f"gemini_{name}_total {snapshot[name]}"]
+        lines += ["# TYPE gemini_circuit_open gauge",
+                  f"gemini_circuit_open "
+                  f"{int(snapshot['circuit_state'] != CircuitBreaker.CLOSED)}"]
+        return "\n".join(lines)
+
+
+request_bucket = TokenBucket(REQUESTS_PER_MINUTE)
+token_bucket = TokenBucket(TOKENS_PER_MINUTE)
+circuit_breaker = CircuitBreaker(
+    CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT
+)
+metrics = GeminiMetrics()
+
+
+def estimate_tokens(contents: Any) -> int:
+    """Approximates the prompt size in tokens (~4 characters per token)."""
+    return max(1, len(str(contents)) // 4)
+
+
+def is_retryable(error: Exception) -> bool:
+    """Checks whether a failed call is worth retrying."""
+    # pylint: disable=import-outside-toplevel
+    import httpx
+    from google.genai import errors
+
+    if isinstance(error, errors.APIError):
+        return error.code in RETRYABLE_STATUS_CODES
+    return isinstance(error, (httpx.TimeoutException, httpx.TransportError))
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 20.0) -> float:
+    """Returns a full-jitter exponential backoff delay in seconds."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class ResilientModels:
+    """
+    Drop-in replacement for genai_client.models that applies rate
+    limiting, retries, deadlines and the circuit breaker.
+    """
+
+    def __init__(self, models: Any):
+        self._models = models
+
+    def generate_content(
+        self,
+        *,
+        model: str,
+        contents: Any,
+        config: Optional[dict] = None,
+        timeout: float = CALL_TIMEOUT,
+        cancelled: Optional[threading.Event] = None
+    ) -> Any:
+        """
+        Calls generate_content on the wrapped client.
+
+        Args:
+            model (str): The model name.
+            contents (Any): The prompt.
+            config (Optional[dict]): The generation config.
+            timeout (float): Deadline in seconds for the call including
+            rate limit waits and retries.
+            cancelled (Optional[threading.Event]): When set, no further
+            attempt is made. An attempt already in flight is not aborted.
+
+        Raises:
+            GeminiCallCancelled: If the call was cancelled.
+            GeminiUnavailableError: If the call cannot be completed.
+
+        Returns:
+            Any: The model response.
+        """
+        start = time.monotonic()
+        prompt_tokens = estimate_tokens(contents)
+        metrics.increment("calls")
+        try:
+            response = self._call_with_retries(
+                model, contents, config, prompt_tokens, start + timeout,
+                cancelled
+            )
+        except GeminiCallCancelled:
+            record_llm_call(time.monotonic() - start, "cancelled")
+            raise
+        except Exception:
+            record_llm_call(time.monotonic() - start, "failure")
+            raise
+
+        actual_prompt, response_tokens = prompt_tokens, 0
+        usage = getattr(response, "usage_metadata", None)
+        if usage is not None:
+            actual_prompt = usage.prompt_token_count or prompt_tokens
+            response_tokens = usage.candidates_token_count or 0
+        metrics.increment("prompt_tokens", actual_prompt)
+        metrics.increment("response_tokens", response_tokens)
+        token_bucket.consume(actual_prompt + response_tokens - prompt_tokens)
+        record_llm_call(
+            time.monotonic() - start, "success", actual_prompt, response_tokens
+        )
+        return response
+
+    def _call_with_retries(
+        self,
+        model: str,
+        contents: Any,
+        config: Optional[dict],
+        prompt_tokens: int,
+        deadline: float,
+        cancelled: Optional[threading.Event] = None
+    ) -> Any:
+        """Attempts the call until it succeeds, fails or runs out of time."""
+        for attempt in range(MAX_RETRIES + 1):
+            if cancelled is not None and cancelled.is_set():
+                metrics.increment("cancelled")
+                raise GeminiCallCancelled("Gemini call was cancelled")
+            # An open circuit fails fast without waiting for capacity.
+            # Otherwise capacity is taken before allow(): once allow() has
+            # let a half-open trial through, the attempt must be made so
+            # that its outcome closes or reopens the circuit
+            if circuit_breaker.is_open():
+                metrics.increment("circuit_rejections")
+                raise GeminiUnavailableError(
+                    "Gemini circuit breaker is open")
+            if not request_bucket.acquire(1, deadline):
+                metrics.increment("rate_limited")
+                raise GeminiUnavailableError(
+                    "Gemini rate limit exceeded for the call deadline")
+            if not token_bucket.acquire(prompt_tokens, deadline):
+                request_bucket.refund(1)
+                metrics.increment("rate_limited")
+                raise GeminiUnavailableError(
+                    "Gemini rate limit exceeded for the call deadline")
+            if not circuit_breaker.allow():
+                # Another call is making the half-open trial
+                request_bucket.refund(1)
+                token_bucket.refund(prompt_tokens)
+                metrics.increment("circuit_rejections")
+                raise GeminiUnavailableError(
+                    "Gemini circuit breaker is open")
+
+            remaining = deadline - time.monotonic()
+            call_config = dict(config or {})
+            call_config["http_options"] = {
+                "timeout": max(1, int(remaining * 1000))
+            }
+            start = time.monotonic()
+            try:
+                response = self._models.generate_content(
+                    model=model, contents=contents, config=call_config
+                )
+            except Exception as e:  # pylint: disable=broad-except
+                metrics.increment("latency_seconds", time.monotonic() - start)
+                if not is_retryable(e):
+                    # The upstream answered, so it counts as healthy
+                    circuit_breaker.record_success()
+                    metrics.increment("failures")
+                    raise
+                circuit_breaker.record_failure()
+                delay = backoff_delay(attempt)
+                if (attempt == MAX_RETRIES or
+                        time.monotonic() + delay >= deadline):
+                    metrics.increment("failures")
+                    raise GeminiUnavailableError(str(e)) from e
+                metrics.increment("retries")
+                if cancelled is not None:
+                    cancelled.wait(delay)
+                else:
+                    time.sleep(delay)
+                continue
+
+            metrics.increment("latency_seconds", time.monotonic() - start)
+            circuit_breaker.record_success()
+            metrics.increment("successes")
+            return response
+
+        raise GeminiUnavailableError("Gemini call failed")
+
+
+class ResilientClient:
+    """
+    Wraps a genai.Client so that model calls go through ResilientModels.
+    Other attributes (e.g. batches) are passed through unchanged.
+    """
+
+    def __init__(self, client: Any):
+        self._client = client
+        self.models = ResilientModels(client.models)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+
+def create_client() -> ResilientClient:
+    """
+    Creates the Gemini client from the environment. The client keeps a
+    pool of HTTP connections that is reused by all calls.
+    With GEMINI_PROVIDER=fake a deterministic local fake is used instead.
+
+    Returns:
+        ResilientClient: The wrapped Gemini client.
+    """
+    # pylint: disable=import-outside-toplevel
+    if os.getenv("GEMINI_PROVIDER", "gemini") == "fake":
+        from app.services.fake_gemini import create_fake_client
+        return ResilientClient(create_fake_client())
+
+    import httpx
+    from google import genai
+
+    http_options = {
+        "client_args": {
+            "limits": httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_CONNECTIONS,
+            )
+        }
+    }
+    base_url = os.getenv("GEMINI_BASE_URL")
+    if base_url:
+        http_options["base_url"] = base_url
+    return ResilientClient(genai.Client(
+        api_key=os.getenv("GEMINI_API_KEY"),
+        http_options=http_options,
+    ))
+
+
+def get_client() -> Any:
+    """
+    Returns the shared Gemini client, creating it on first use.
+
+    Returns:
+        Any: The shared client.
+    """
+    global _client  # pylint: disable=global-statement
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = create_client()
+    return _client
+
+
+def set_client(client: Any) -> None:
+    """
+    Replaces the shared Gemini client, e.g. with a stub in benchmarks.
+    Passing None makes the next get_client call create a new client.
+
+    Args:
+        client (Any): The client to use for all Gemini calls.
+    """
+    global _client  # pylint: disable=global-statement
+    with _client_lock:
+        _client = client
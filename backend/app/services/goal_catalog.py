@@ -0,0 +1,201 @@
+"""
+In-memory catalog of the goals offered to the model for goal matching.
+
+Creating or updating a journal entry sends the goals to the model. The
+catalog loads them once, renders one compact prompt line per goal and
+keeps the result until a goal is created, updated or deleted, which
+bumps the catalog version. Writes made by other processes are picked up
+after GOAL_CATALOG_TTL seconds.
+
+Large catalogs are pre-filtered per entry: goals are ranked by the
+keywords they share with the entry, active goals before completed
+one-time goals, then by priority, and only the best GOAL_PROMPT_MAX_GOALS
+are included in the prompt.
+"""
+
+import bisect
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.database import GoalModel, UNKNOWN_PRIORITY_RANK
+from app.services.goal_matching import extract_keywords
+
+
+GOAL_CATALOG_TTL = float(os.getenv("GOAL_CATALOG_TTL", "300"))
+GOAL_PROMPT_MAX_GOALS = int(os.getenv("GOAL_PROMPT_MAX_GOALS", "30"))
+# Characters of a goal description included in the prompt
+GOAL_PROMPT_DESCRIPTION_LENGTH = int(
+    os.getenv("GOAL_PROMPT_DESCRIPTION_LENGTH", "200")
+)
+
+NO_GOALS = "No goals."
+
+
+def format_goal(goal_id: int, title: str, description: Optional[str]) -> str:
+    """
+    Formats a goal as a single prompt line.
+
+    Args:
+        goal_id (int): The goal ID.
+        title (str): The goal title.
+        description (Optional[str]): The goal description.
+
+    Returns:
+        str: The line, e.g. "[Goal 3] Run a marathon: Train three times a week".
+    """
+    line = f"[Goal {goal_id}] {' '.join(title.split())}"
+    description = " ".join((description or "").split())
+    if description:
+        if len(description) > GOAL_PROMPT_DESCRIPTION_LENGTH:
+            description = \
+                description[:GOAL_PROMPT_DESCRIPTION_LENGTH].rstrip() + "…"
+        line += f": {description}"
+    return line
+
+
+def shares_keyword(stem: str, content_stems: Set[str],
+                   sorted_stems: List[str]) -> bool:
+    """
+    Checks whether a goal keyword matches an entry keyword, treating the
+    stems as prefixes of each other like the full-text search does.
+
+    Args:
+        stem (str): The goal keyword stem.
+        content_stems (Set[str]): The entry keyword stems.
+        sorted_stems (List[str]): The same stems, sorted.
+
+    Returns:
+        bool: True if an entry keyword starts with the stem or vice versa.
+    """
+    index = bisect.bisect_left(sorted_stems, stem)
+    if index < len(sorted_stems) and sorted_stems[index].startswith(stem):
+        return True
+    return any(stem[:length] in content_stems
+               for length in range(3, len(stem)))
+
+
+class GoalCatalogSnapshot:
+    """The goals of one catalog version with their rendered prompt lines."""
+
+    def __init__(self, version: int, rows: list):
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.goal_ids = [row.id for row in rows]
+        self.lines: Dict[int, str] = {
+            row.id: format_goal(row.id, row.title, row.description)
+            for row in rows
+        }
+        self.keywords: Dict[int, List[str]] = {
+            row.id: extract_keywords(f"{row.title} {row.description or ''}")
+            for row in rows
+        }
+        # Active goals first, then by priority and newest first
+        self.ranks: Dict[int, tuple] = {
+            row.id: (
+                row.type == "One-time" and row.progress >= 100,
+                row.priority_rank or UNKNOWN_PRIORITY_RANK,
+                -row.id,
+            )
+            for row in rows
+        }
+        self.goal_ids.sort(key=self.ranks.__getitem__)
+        self.block = "\n".join(
+            self.lines[goal_id] for goal_id in self.goal_ids
+        ) or NO_GOALS
+
+    def render(self, content: str,
+               max_goals: int = GOAL_PROMPT_MAX_GOALS) -> str:
+        """
+        Renders the prompt block for an entry. Catalogs with at most
+        max_goals goals are rendered once per version; larger ones are
+        pre-filtered by the keywords shared with the entry.
+
+        Args:
+            content (str): The entry content.
+            max_goals (int): The maximum number of goals in the block.
+
+        Returns:
+            str: One line per goal, or "No goals.".
+        """
+        if len(self.goal_ids) <= max_goals:
+            return self.block
+        content_stems = set(extract_keywords(content))
+        sorted_stems = sorted(content_stems)
+
+        def score(goal_id: int) -> tuple:
+            shared = sum(
+                1 for stem in self.keywords[goal_id]
+                if shares_keyword(stem, content_stems, sorted_stems)
+            )
+            inactive, priority, newest = self.ranks[goal_id]
+            return (inactive, -shared, priority, newest)
+
+        selected = sorted(self.goal_ids, key=score)[:max_goals]
+        return "\n".join(self.lines[goal_id] for goal_id in selected)
+
+
+class GoalCatalog:
+    """Versioned cache of the goal catalog, shared by all requests."""
+
+    def __init__(self, ttl: float = GOAL_CATALOG_TTL):
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.version = 0
+        self.snapshot: Optional[GoalCatalogSnapshot] = None
+
+    def invalidate(self) -> None:
+        """Marks the catalog as changed, call after a goal write commits."""
+        with self.lock:
+            self.version += 1
+
+    def load(self, db: Session) -> GoalCatalogSnapshot:
+        """
+        Returns the current snapshot, loading the goals if the catalog
+        changed or the snapshot expired.
+
+        Args:
+            db (Session): The database session.
+
+        Returns:
+            GoalCatalogSnapshot: The goals of the current version.
+        """
+        with self.lock:
+            version = self.version
+            snapshot = self.snapshot
+        if snapshot is not None and snapshot.version == version and \
+                time.monotonic() - snapshot.loaded_at < self.ttl:
+            return snapshot
+
+        rows = db.execute(select(
+            GoalModel.id, GoalModel.title, GoalModel.description,
+            GoalModel.type, GoalModel.priority_rank, GoalModel.progress,
+        )).all()
+        # Tagged with the version read before the query, so a write that
+        # commits meanwhile makes the next call load again
+        snapshot = GoalCatalogSnapshot(version, rows)
+        with self.lock:
+            if self.snapshot is None or \
+                    self.snapshot.loaded_at <= snapshot.loaded_at:
+                self.snapshot = snapshot
+        return snapshot
+
+    def prompt_block(self, db: Session, content: str) -> str:
+        """
+        Renders the goals for the goal matching prompt of an entry.
+
+        Args:
+            db (Session): The database session.
+            content (str): The entry content.
+
+        Returns:
+            str: One line per goal, or "No goals.".
+        """
+        return self.load(db).render(content)
+
+
+goal_catalog = GoalCatalog()
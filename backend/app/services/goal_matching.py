@@ -0,0 +1,191 @@
+"""
+Incremental matching of historical journal entries to a goal.
+
+When a goal is created or its title or description changes, candidate
+entries are pre-filtered with the full-text index, only those candidates
+are sent to the model in batched prompts, and the goal's rows in
+journal_goal_association are replaced in bulk for the candidates. Entries
+linked to the goal that are not candidates keep their links and are not
+sent to the model, so the cost of an edit does not grow with the number
+of linked entries.
+"""
+
+import re
+from typing import List, Set
+
+from sqlalchemy import delete, insert, select, text
+from sqlalchemy.orm import Session
+
+from app.db.database import (
+    SessionLocal,
+    GoalModel,
+    JournalEntryModel,
+    journal_goal_association,
+)
+from app.services.gemini_agent import match_entries_to_goal
+
+
+STOPWORDS = {
+    "the", "and", "for", "with", "that", "this", "from", "your", "you",
+    "are", "was", "were", "have", "has", "more", "less", "into", "over",
+    "each", "every", "least", "most", "about", "what", "when", "will",
+    "day", "days", "week", "weeks", "time", "times", "goal", "goals",
+}
+
+SUFFIXES = ("ing", "ly", "ed", "es", "s", "e", "y")
+
+# Characters of an entry sent to the model per candidate
+MAX_CONTENT_LENGTH = 1500
+
+
+def extract_keywords(text_value: str) -> List[str]:
+    """
+    Extracts the distinct keywords of a text, reduced to a crude stem.
+    Stopwords and words shorter than three letters are skipped.
+
+    Args:
+        text_value (str): The text.
+
+    Returns:
+        List[str]: The stems in order of appearance.
+    """
+    stems = []
+    for word in re.findall(r"[a-z]+", text_value.lower()):
+        if len(word) < 3 or word in STOPWORDS:
+            continue
+        for suffix in SUFFIXES:
+            if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+                word = word[:-len(suffix)]
+                break
+        if word not in stems:
+            stems.append(word)
+    return stems
+
+
+def build_search_query(goal_text: str) -> str:
+    """
+    Builds an FTS5 query that matches any keyword of the goal text.
+    Keywords are reduced to a crude stem and matched as prefixes, so
+    "running" also finds "runs" and "exercise" finds "exercised".
+
+    Args:
+        goal_text (str): The goal title and description.
+
+    Returns:
+        str: The FTS5 query, or an empty string if there are no keywords.
+    """
+    return " OR ".join(f'"{stem}"*' for stem in extract_keywords(goal_text))
+
+
+def find_candidate_entries(
+    db: Session,
+    goal: GoalModel,
+    limit: int = 100
+) -> List[int]:
+    """
+    Finds the entries most likely related to a goal using the full-text
+    index, ranked by relevance.
+
+    Args:
+        db (Session): The database session.
+        goal (GoalModel): The goal to find entries for.
+        limit (int): The maximum number of candidates.
+
+    Returns:
+        List[int]: The IDs of the candidate entries.
+    """
+    query = build_search_query(f"{goal.title} {goal.description or ''}")
+    if not query:
+        return []
+    rows = db.execute(
+        text(
+            "SELECT rowid FROM journal_entries_fts "
+            "WHERE journal_entries_fts MATCH :query "
+            "ORDER BY rank LIMIT :limit"
+        ),
+        {"query": query, "limit": limit},
+    )
+    return [row[0] for row in rows]
+
+
+def rematch_goal(
+    goal_id: int,
+    batch_size: int = 20,
+    candidate_limit: int = 100
+) -> Set[int]:
+    """
+    Re-evaluates which journal entries show progress toward a goal.
+    Candidates from the full-text index are sent to the model in
+    batches, and the links of the candidates are replaced with the
+    result. Linked entries that are not candidates were linked by their
+    own analysis or by hand; they keep their links without a model call.
+
+    Runs with its own database session so it can be used as a
+    background task.
+
+    Args:
+        goal_id (int): The ID of the goal.
+        batch_size (int): The number of entries per model request.
+        candidate_limit (int): The maximum number of candidates.
+
+    Returns:
+        Set[int]: The IDs of the entries now linked to the goal.
+    """
+    db = SessionLocal()
+    try:
+        goal = db.get(GoalModel, goal_id)
+        if goal is None:
+            return set()
+
+        linked_ids = set(db.scalars(
+            select(journal_goal_association.c.journal_id)
+            .where(journal_goal_association.c.goal_id == goal_id)
+        ))
+        candidate_ids = find_candidate_entries(db, goal, candidate_limit)
+        if not candidate_ids:
+            return linked_ids
+
+        rows = db.execute(
+            select(
+                JournalEntryModel.id,
+                JournalEntryModel.date,
+                JournalEntryModel.content,
+            ).where(JournalEntryModel.id.in_(candidate_ids))
+        ).all()
+        entries = [
+            {
+                "id": row.id,
+                "date": row.date.isoformat(),
+                "content": row.content[:MAX_CONTENT_LENGTH],
+            }
+            for row in rows
+        ]
+
+        evaluated_ids = {entry["id"] for entry in entries}
+
+        goal_data = {"title": goal.title, "description": goal.description}
+        matched_ids = set()
+        for start in range(0, len(entries), batch_size):
+            matched_ids.update(match_entries_to_goal(
+                goal_data, entries[start:start + batch_size]
+            ))
+        matched_ids &= evaluated_ids
+
+        db.execute(
+            delete(journal_goal_association).where(
+                journal_goal_association.c.goal_id == goal_id,
+                journal_goal_association.c.journal_id.in_(evaluated_ids),
+            )
+        )
+        if matched_ids:
+            db.execute(
+                insert(journal_goal_association),
+                [
+                    {"journal_id": entry_id, "goal_id": goal_id}
+                    for entry_id in matched_ids
+                ],
+            )
+        db.commit()
+        return matched_ids | (linked_ids - evaluated_ids)
+    finally:
+        db.close()
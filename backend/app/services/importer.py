@@ -0,0 +1,336 @@
+"""
+Bulk import of journal history exported from other journaling apps.
+
+Reads NDJSON, CSV or a folder of Markdown files record by record,
+validates each record and inserts the valid ones in batched transactions
+with executemany. AI analysis is deferred: imported entries have no
+analysis version and are picked up by the re-analysis job.
+
+Run from the backend directory:
+    python -m app.services.importer export.ndjson
+    python -m app.services.importer journal/ --format markdown
+    python -m app.services.reanalysis --mode batch
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+from datetime import date, datetime, timezone
+from enum import Enum
+from typing import Iterable, Iterator, List, TextIO, Tuple, Union
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+import app.config  # noqa: F401  pylint: disable=unused-import
+from app.db.database import (
+    SessionLocal,
+    GoalModel,
+    JournalEntryModel,
+    create_tables,
+    journal_goal_association,
+)
+from app.models.entry_goal import (
+    ImportRowError,
+    ImportSummary,
+    JournalEntryCreate,
+)
+
+
+FORMATS = ("ndjson", "csv", "markdown")
+BATCH_SIZE = 500
+# Rejected records beyond this number are counted but not listed
+MAX_REPORTED_ERRORS = 100
+
+FRONT_MATTER = re.compile(r"\A---\s*\n(.*?)\n---\s*\n", re.DOTALL)
+HEADING = re.compile(r"^#\s+(.+)$", re.MULTILINE)
+DATE_PREFIX = re.compile(r"^(\d{4}-\d{2}-\d{2})")
+
+# A record is a raw row, or the error raised while parsing it
+Record = Tuple[str, Union[dict, Exception]]
+
+
+def read_ndjson(file: TextIO) -> Iterator[Record]:
+    """
+    Reads one JSON object per line.
+
+    Args:
+        file (TextIO): The NDJSON file.
+
+    Yields:
+        Record: The line number and the parsed object.
+    """
+    for line_number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+            if not isinstance(row, dict):
+                raise ValueError("Expected a JSON object")
+        except ValueError as exc:
+            row = exc
+        yield f"line {line_number}", row
+
+
+def read_csv(file: TextIO) -> Iterator[Record]:
+    """
+    Reads a CSV file with a header row naming the entry fields.
+    Goals can be given as IDs separated by semicolons.
+
+    Args:
+        file (TextIO): The CSV file.
+
+    Yields:
+        Record: The row number and the row.
+    """
+    reader = csv.DictReader(file)
+    for row_number, row in enumerate(reader, start=1):
+        yield f"row {row_number}", row
+
+
+def read_markdown_folder(path: str) -> Iterator[Record]:
+    """
+    Reads a folder of Markdown files, one entry per file.
+    Fields can be set in a front matter block of "key: value" lines.
+    Otherwise the title is taken from the first heading or the file name
+    and the date from a YYYY-MM-DD file name prefix or the file's
+    modification time.
+
+    Args:
+        path (str): The folder, searched recursively.
+
+    Yields:
+        Record: The file path and the entry fields.
+    """
+    files = sorted(
+        os.path.join(directory, name)
+        for directory, _, names in os.walk(path)
+        for name in names if name.lower().endswith((".md", ".markdown"))
+    )
+    for file_path in files:
+        location = os.path.relpath(file_path, path)
+        try:
+            with open(file_path, encoding="utf-8") as file:
+                text = file.read()
+        except (OSError, UnicodeDecodeError) as exc:
+            yield location, exc
+            continue
+
+        row = {}
+        match = FRONT_MATTER.match(text)
+        if match:
+            for line in match.group(1).splitlines():
+                key, _, value = line.partition(":")
+                if value.strip():
+                    row[key.strip()] = value.strip().strip("\"'")
+            text = text[match.end():]
+
+        stem = os.path.splitext(os.path.basename(file_path))[0]
+        heading = HEADING.search(text)
+        if "title" not in row:
+            row["title"] = heading.group(1).strip() if heading \
+                else DATE_PREFIX.sub("", stem).strip(" -_") or stem
+        if "date" not in row:
+            prefix = DATE_PREFIX.match(stem)
+            row["date"] = prefix.group(1) if prefix else date.fromtimestamp(
+                os.path.getmtime(file_path)
+            ).isoformat()
+        row["content"] = text.strip()
+        yield location, row
+
+
+def parse_record(row: dict) -> JournalEntryCreate:
+    """
+    Validates a raw record as a journal entry. Empty values are treated
+    as missing and goal IDs may be a separated string.
+
+    Args:
+        row (dict): The raw record.
+
+    Raises:
+        ValidationError: If the record is not a valid entry.
+
+    Returns:
+        JournalEntryCreate: The validated entry.
+    """
+    row = {key: value for key, value in row.items()
+           if key and value not in ("", None)}
+    if isinstance(row.get("goals"), str):
+        row["goals"] = [int(goal_id)
+                        for goal_id in re.split(r"[;,\s]+", row["goals"])
+                        if goal_id]
+    return JournalEntryCreate.model_validate(row)
+
+
+def insert_batch(db: Session, entries: List[JournalEntryCreate],
+                 created_at: datetime) -> None:
+    """
+    Inserts a batch of entries and their goal links in one transaction.
+
+    Args:
+        db (Session): The database session.
+        entries (List[JournalEntryCreate]): The validated entries.
+        created_at (datetime): The creation timestamp of the entries.
+    """
+    rows = []
+    for entry in entries:
+        row = entry.model_dump(exclude={"goals"})
+        rows.append({
+            **{key: value.value if isinstance(value, Enum) else value
+               for key, value in row.items()},
+            "created_at": created_at,
+        })
+    if any(entry.goals for entry in entries):
+        # Ordered RETURNING runs one statement per row on SQLite, so it is
+        # only used when the new IDs are needed for goal links
+        entry_ids = db.scalars(
+            insert(JournalEntryModel).returning(
+                JournalEntryModel.id, sort_by_parameter_order=True
+            ),
+            rows,
+        ).all()
+        links = [
+            {"journal_id": entry_id, "goal_id": goal_id}
+            for entry_id, entry in zip(entry_ids, entries)
+            for goal_id in set(entry.goals or [])
+        ]
+        if links:
+            db.execute(insert(journal_goal_association), links)
+    else:
+        db.execute(insert(JournalEntryModel), rows)
+    db.commit()
+
+
+def import_records(db: Session, records: Iterable[Record],
+                   batch_size: int = BATCH_SIZE) -> ImportSummary:
+    """
+    Validates records one by one and inserts the valid ones in batches.
+
+    Args:
+        db (Session): The database session.
+        records (Iterable[Record]): The records to import.
+        batch_size (int): The number of entries per transaction.
+
+    Returns:
+        ImportSummary: The number of imported and rejected records and
+        the errors of the first rejected ones.
+    """
+    goal_ids = set(db.scalars(select(GoalModel.id)))
+    created_at = datetime.now(timezone.utc)
+    summary = ImportSummary()
+    batch = []
+    for location, row in records:
+        try:
+            if isinstance(row, Exception):
+                raise row
+            entry = parse_record(row)
+            unknown = set(entry.goals or []) - goal_ids
+            if unknown:
+                raise ValueError(
+                    f"Unknown goal IDs: {', '.join(map(str, sorted(unknown)))}"
+                )
+        except (ValueError, OSError) as exc:
+            summary.failed += 1
+            if len(summary.errors) < MAX_REPORTED_ERRORS:
+                message = "; ".join(
+                    f"{'.'.join(map(str, error['loc']))}: {error['msg']}"
+                    for error in exc.errors()
+                ) if isinstance(exc, ValidationError) else str(exc)
+                summary.errors.append(
+                    ImportRowError(location=location, error=message)
+                )
+            continue
+
+        batch.append(entry)
+        if len(batch) >= batch_size:
+            insert_batch(db, batch, created_at)
+            summary.imported += len(batch)
+            batch = []
+    if batch:
+        insert_batch(db, batch, created_at)
+        summary.imported += len(batch)
+    return summary
+
+
+def read_records(source: Union[str, TextIO], file_format: str) -> Iterator[Record]:
+    """
+    Reads the records of a file or folder in the given format.
+
+    Args:
+        source (Union[str, TextIO]): A folder for Markdown, otherwise an
+        open text file.
+        file_format (str): One of FORMATS.
+
+    Returns:
+        Iterator[Record]: The records.
+    """
+    if file_format == "markdown":
+        return read_markdown_folder(source)
+    if file_format == "csv":
+        return read_csv(source)
+    return read_ndjson(source)
+
+
+def import_file(source: Union[str, TextIO], file_format: str,
+                batch_size: int = BATCH_SIZE) -> ImportSummary:
+    """
+    Imports a file or folder with its own database session.
+
+    Args:
+        source (Union[str, TextIO]): A folder for Markdown, otherwise an
+        open text file.
+        file_format (str): One of FORMATS.
+        batch_size (int): The number of entries per transaction.
+
+    Returns:
+        ImportSummary: The result of the import.
+    """
+    db = SessionLocal()
+    try:
+        return import_records(db, read_records(source, file_format),
+                              batch_size)
+    finally:
+        db.close()
+
+
+def detect_format(path: str) -> str:
+    """Guesses the format of an export from its path."""
+    if os.path.isdir(path):
+        return "markdown"
+    if path.lower().endswith(".csv"):
+        return "csv"
+    return "ndjson"
+
+
+def main():
+    """Parses command line arguments and runs the import."""
+    parser = argparse.ArgumentParser(
+        description="Import journal entries from NDJSON, CSV or Markdown."
+    )
+    parser.add_argument("path", help="The export file or Markdown folder")
+    parser.add_argument("--format", choices=FORMATS,
+                        help="The export format (default: from the path)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
+                        help="Entries per insert transaction")
+    args = parser.parse_args()
+
+    create_tables()
+    file_format = args.format or detect_format(args.path)
+    if file_format == "markdown":
+        summary = import_file(args.path, file_format, args.batch_size)
+    else:
+        with open(args.path, encoding="utf-8-sig", newline="") as file:
+            summary = import_file(file, file_format, args.batch_size)
+
+    for error in summary.errors:
+        print(f"{error.location}: {error.error}")
+    print(f"Done. {summary.imported} entries imported, "
+          f"{summary.failed} rejected. Run python -m app.services.reanalysis "
+          "to analyze them.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,422 @@
+"""
+Batch re-analysis job for existing journal entries.
+
+Selects entries whose AI fields are missing or were generated with an
+older version of the analysis prompts, analyzes them in bulk through the
+Gemini Batch API (or a throttled worker pool, which is also used when the
+Batch API fails) and writes the results back in chunked transactions. Progress is stored in a checkpoint file so an
+interrupted run can be resumed.
+
+Run from the backend directory:
+    python -m app.services.reanalysis --mode batch
+"""
+
+import argparse
+import concurrent.futures
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+import app.config  # noqa: F401  pylint: disable=unused-import
+from app.db.database import SessionLocal, JournalEntryModel, create_tables
+from app.db.crud.utils import get_goals
+from app.models.chat_agent import EntryAnalysis
+from app.services import gemini_agent
+from app.services.gemini_client import get_client
+from app.services.goal_catalog import GoalCatalogSnapshot, goal_catalog
+
+
+DEFAULT_CHECKPOINT = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "db",
+    "reanalysis_checkpoint.json",
+)
+
+FAILED_BATCH_STATES = {
+    "JOB_STATE_FAILED",
+    "JOB_STATE_CANCELLED",
+    "JOB_STATE_EXPIRED",
+}
+FINISHED_BATCH_STATES = {
+    "JOB_STATE_SUCCEEDED",
+    "JOB_STATE_PARTIALLY_SUCCEEDED",
+} | FAILED_BATCH_STATES
+
+
+class BatchJobFailed(Exception):
+    """Raised when a batch job finished without results."""
+
+
+def load_checkpoint(path: str) -> dict:
+    """
+    Loads the checkpoint of a previous run.
+
+    Args:
+        path (str): The path of the checkpoint file.
+
+    Returns:
+        dict: The checkpoint, or an empty checkpoint if none exists.
+    """
+    if not os.path.exists(path):
+        return {"last_id": 0, "pending_batch": None}
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def save_checkpoint(path: str, checkpoint: dict) -> None:
+    """
+    Atomically writes the checkpoint file.
+
+    Args:
+        path (str): The path of the checkpoint file.
+        checkpoint (dict): The checkpoint to store.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(checkpoint, file)
+    os.replace(tmp_path, path)
+
+
+def select_entries(
+    db: Session,
+    after_id: int = 0,
+    limit: int = 100,
+    reanalyze_all: bool = False
+) -> List[JournalEntryModel]:
+    """
+    Selects the next chunk of journal entries that need (re-)analysis.
+
+    Args:
+        db (Session): The database session.
+        after_id (int): Only entries with a higher ID are selected.
+        limit (int): The maximum number of entries to select.
+        reanalyze_all (bool): If True, every entry is selected regardless
+        of its analysis version.
+
+    Returns:
+        List[JournalEntryModel]: The selected entries ordered by ID.
+    """
+    query = db.query(JournalEntryModel).filter(JournalEntryModel.id > after_id)
+    if not reanalyze_all:
+        query = query.filter(or_(
+            JournalEntryModel.analysis_version.is_(None),
+            JournalEntryModel.analysis_version < gemini_agent.ANALYSIS_VERSION,
+        ))
+    return query.order_by(JournalEntryModel.id).limit(limit).all()
+
+
+def analyze_with_pool(
+    entries: Dict[int, str],
+    goals: GoalCatalogSnapshot,
+    workers: int = 4,
+    requests_per_minute: int = 60
+) -> Dict[int, tuple]:
+    """
+    Analyzes entries with a pool of concurrent workers, spacing out
+    requests so the configured request rate is not exceeded.
+
+    Args:
+        entries (Dict[int, str]): Entry contents keyed by entry ID.
+        goals (GoalCatalogSnapshot): The goals available for matching.
+        workers (int): The number of concurrent requests.
+        requests_per_minute (int): The maximum request rate.
+
+    Returns:
+        Dict[int, tuple]: The analysis results keyed by entry ID. Entries
+        whose analysis failed are left out.
+    """
+    interval = 60.0 / requests_per_minute
+    lock = threading.Lock()
+    next_slot = [time.monotonic()]
+
+    def analyze(content: str) -> tuple:
+        with lock:
+            wait = next_slot[0] - time.monotonic()
+            next_slot[0] = max(next_slot[0], time.monotonic()) + interval
+        if wait > 0:
+            time.sleep(wait)
+        return gemini_agent.analyze_entry_combined(
+            content, goals.render(content)
+        )
+
+    results = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(analyze, content): entry_id
+            for entry_id, content in entries.items()
+        }
+        for future in concurrent.futures.as_completed(futures):
+            entry_id = futures[future]
+            try:
+                results[entry_id] = future.result()
+            except Exception as e:  # pylint: disable=broad-except
+                print(f"Analysis of entry {entry_id} failed: {e}")
+    return results
+
+
+def submit_batch(entries: Dict[int, str],
+                 goals: GoalCatalogSnapshot) -> str:
+    """
+    Submits the entries as a single job to the Gemini Batch API.
+
+    Args:
+        entries (Dict[int, str]): Entry contents keyed by entry ID.
+        goals (GoalCatalogSnapshot): The goals available for matching.
+
+    Returns:
+        str: The name of the created batch job.
+    """
+    requests = [
+        {
+            "contents": [{
+                "role": "user",
+                "parts": [{
+                    "text": gemini_agent.build_analysis_prompt(
+                        content, goals.render(content)
+                    )
+                }],
+            }],
+            "metadata": {"entry_id": str(entry_id)},
+            "config": {
+                "response_mime_type": "application/json",
+                "response_schema": EntryAnalysis,
+            },
+        }
+        for entry_id, content in entries.items()
+    ]
+    batch_job = get_client().batches.create(
+        model=gemini_agent.model,
+        src=requests,
+        config={"display_name": f"reflecta-reanalysis-{int(time.time())}"},
+    )
+    return batch_job.name
+
+
+def collect_batch(
+    name: str,
+    entry_ids: List[int],
+    poll_interval: float = 30.0
+) -> Dict[int, tuple]:
+    """
+    Waits for a batch job to finish and collects its results.
+
+    Args:
+        name (str): The name of the batch job.
+        entry_ids (List[int]): The entry IDs in the order they were submitted.
+        poll_interval (float): Seconds between status checks.
+
+    Raises:
+        BatchJobFailed: If the job failed, was cancelled or expired.
+
+    Returns:
+        Dict[int, tuple]: The analysis results keyed by entry ID. Entries
+        whose analysis failed are left out.
+    """
+    batch_job = get_client().batches.get(name=name)
+    state = getattr(batch_job.state, "value", batch_job.state)
+    while state not in FINISHED_BATCH_STATES:
+        time.sleep(poll_interval)
+        batch_job = get_client().batches.get(name=name)
+        state = getattr(batch_job.state, "value", batch_job.state)
+    if state in FAILED_BATCH_STATES:
+        raise BatchJobFailed(f"Batch job {name} ended with {state}")
+
+    results = {}
+    responses = batch_job.dest.inlined_responses if batch_job.dest else None
+    for index, inlined in enumerate(responses or []):
+        metadata = inlined.metadata or {}
+        entry_id = int(metadata.get("entry_id", entry_ids[index]))
+        if inlined.error or inlined.response is None:
+            print(f"Analysis of entry {entry_id} failed: {inlined.error}")
+            continue
+        try:
+            analysis = EntryAnalysis.model_validate_json(inlined.response.text)
+        except ValueError as e:
+            print(f"Analysis of entry {entry_id} is invalid: {e}")
+            continue
+        results[entry_id] = gemini_agent.unpack_analysis(analysis)
+    return results
+
+
+def write_results(
+    db: Session,
+    results: Dict[int, tuple],
+    submitted_at: Optional[datetime] = None
+) -> int:
+    """
+    Writes analysis results back to their entries in a single transaction.
+
+    Args:
+        db (Session): The database session.
+        results (Dict[int, tuple]): The analysis results keyed by entry ID.
+        submitted_at (Optional[datetime]): When the analysis was requested.
+        Entries edited afterwards already carry a fresh analysis and are
+        skipped.
+
+    Returns:
+        int: The number of updated entries.
+    """
+    if not results:
+        return 0
+    entries = db.query(JournalEntryModel).filter(
+        JournalEntryModel.id.in_(list(results))
+    ).all()
+
+    updated = 0
+    for entry in entries:
+        if (submitted_at and entry.updated_at and
+                entry.updated_at.replace(tzinfo=timezone.utc) > submitted_at):
+            continue
+        formatted, activities, sentiments, goal_ids = results[entry.id]
+        entry.formatted_content = formatted
+        entry.activities = activities
+        entry.sentiments = sentiments
+        entry.analysis_version = gemini_agent.ANALYSIS_VERSION
+        entry.goals = get_goals(db, goal_ids)
+        updated += 1
+    db.commit()
+    return updated
+
+
+def run(
+    mode: str = "batch",
+    chunk_size: int = 100,
+    workers: int = 4,
+    requests_per_minute: int = 60,
+    reanalyze_all: bool = False,
+    checkpoint_path: str = DEFAULT_CHECKPOINT,
+    poll_interval: float = 30.0
+) -> int:
+    """
+    Runs the re-analysis job until no entries are left, resuming from the
+    checkpoint of a previous run if present.
+
+    Args:
+        mode (str): "batch" to use the Batch API, "pool" to use a
+        throttled worker pool. If the Batch API fails, the job continues
+        with the worker pool.
+        chunk_size (int): Entries per batch job and write transaction.
+        workers (int): Concurrent requests in pool mode.
+        requests_per_minute (int): Request rate limit in pool mode.
+        reanalyze_all (bool): Re-analyze every entry, not only outdated ones.
+        checkpoint_path (str): Path of the checkpoint file.
+        poll_interval (float): Seconds between batch status checks.
+
+    Returns:
+        int: The number of updated entries.
+    """
+    checkpoint = load_checkpoint(checkpoint_path)
+    updated = 0
+    db = SessionLocal()
+    try:
+        pending = checkpoint.get("pending_batch")
+        if pending:
+            print(f"Resuming batch job {pending['name']}...")
+            try:
+                results = collect_batch(
+                    pending["name"], pending["entry_ids"], poll_interval
+                )
+            except Exception as e:  # pylint: disable=broad-except
+                # The entries are selected again below
+                print(f"Batch job {pending['name']} failed ({e}), "
+                      "continuing with the worker pool")
+                mode = "pool"
+                checkpoint["pending_batch"] = None
+            else:
+                updated += write_results(
+                    db, results,
+                    datetime.fromisoformat(pending["submitted_at"])
+                )
+                checkpoint = {
+                    "last_id": max(pending["entry_ids"]),
+                    "pending_batch": None,
+                }
+            save_checkpoint(checkpoint_path, checkpoint)
+
+        goals = goal_catalog.load(db)
+        while True:
+            entries = select_entries(
+                db, checkpoint["last_id"], chunk_size, reanalyze_all
+            )
+            if not entries:
+                break
+            contents = {entry.id: entry.content for entry in entries}
+            submitted_at = datetime.now(timezone.utc)
+
+            results = None
+            if mode == "batch":
+                try:
+                    name = submit_batch(contents, goals)
+                    checkpoint["pending_batch"] = {
+                        "name": name,
+                        "entry_ids": list(contents),
+                        "submitted_at": submitted_at.isoformat(),
+                    }
+                    save_checkpoint(checkpoint_path, checkpoint)
+                    results = collect_batch(
+                        name, list(contents), poll_interval
+                    )
+                except Exception as e:  # pylint: disable=broad-except
+                    print(f"Batch API unavailable ({e}), continuing with "
+                          "the worker pool")
+                    mode = "pool"
+            if results is None:
+                results = analyze_with_pool(
+                    contents, goals, workers, requests_per_minute
+                )
+
+            updated += write_results(db, results, submitted_at)
+            checkpoint = {"last_id": max(contents), "pending_batch": None}
+            save_checkpoint(checkpoint_path, checkpoint)
+            print(f"Re-analyzed entries up to id {checkpoint['last_id']} "
+                  f"({updated} updated)")
+    finally:
+        db.close()
+
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    return updated
+
+
+def main():
+    """Parses command line arguments and runs the job."""
+    parser = argparse.ArgumentParser(
+        description="Re-analyze journal entries in bulk."
+    )
+    parser.add_argument("--mode", choices=["batch", "pool"], default="batch",
+                        help="Use the Gemini Batch API or a worker pool")
+    parser.add_argument("--chunk-size", type=int, default=100,
+                        help="Entries per batch job and write transaction")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="Concurrent requests in pool mode")
+    parser.add_argument("--rpm", type=int, default=60,
+                        help="Maximum requests per minute in pool mode")
+    parser.add_argument("--all", action="store_true",
+                        help="Re-analyze all entries, not only outdated ones")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT,
+                        help="Path of the checkpoint file")
+    parser.add_argument("--poll-interval", type=float, default=30.0,
+                        help="Seconds between batch job status checks")
+    args = parser.parse_args()
+
+    create_tables()
+    updated = run(
+        mode=args.mode,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        requests_per_minute=args.rpm,
+        reanalyze_all=args.all,
+        checkpoint_path=args.checkpoint,
+        poll_interval=args.poll_interval,
+    )
+    print(f"Done. {updated} entries re-analyzed.")
+
+
+if __name__ == "__main__":
+    main()
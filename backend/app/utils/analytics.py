@@ -2,6 +2,9 @@
 utility functions for analytics and data processing.
 """
 
+from datetime import date, timedelta
+from typing import Optional, Tuple
+
 from fastapi import HTTPException
 
 
@@ -17,3 +20,50 @@ def parse_period_to_days(period: str) -> int:
         return int(period)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid period format.")
+
+
+def parse_period(
+    period: str,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None
+) -> Tuple[date, date]:
+    """
+    Converts a period to an inclusive date range. The period may be
+    relative to today (e.g. '90days', '5years') or an explicit range
+    'YYYY-MM-DD..YYYY-MM-DD'. An open end ('2024-01-01..') means today;
+    the start may only be left open ('..2024-06-30') if from_date is
+    given. Explicit from_date and to_date take precedence over the period.
+
+    Args:
+        period (str): The period string.
+        from_date (Optional[date]): The first day of the range.
+        to_date (Optional[date]): The last day of the range.
+
+    Raises:
+        HTTPException: If the period is invalid, the range has no start
+        or the range is empty.
+
+    Returns:
+        Tuple[date, date]: The first and last day of the range.
+    """
+    today = date.today()
+    if ".." in period:
+        start, _, end = period.partition("..")
+        try:
+            period_from = date.fromisoformat(start) if start else None
+            period_to = date.fromisoformat(end) if end else today
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid period format.")
+        if period_from is None and from_date is None:
+            raise HTTPException(
+                status_code=400, detail="A period range needs a start date.")
+    else:
+        period_to = today
+        period_from = today - timedelta(days=parse_period_to_days(period))
+
+    from_date = from_date or period_from
+    to_date = to_date or period_to
+    if from_date > to_date:
+        raise HTTPException(
+            status_code=400, detail="from_date must not be after to_date.")
+    return from_date, to_date
@@ -0,0 +1,356 @@
+"""
+Caching for read endpoints.
+
+A data version is bumped whenever a transaction that wrote to the
+database commits. It is used for two layers of caching:
+- GET responses of the journal, goal and analytics endpoints carry a
+  weak ETag derived from the data version, so a client revalidating
+  with If-None-Match gets a 304 without the endpoint running. The ETag
+  is weak because it identifies the data, not the bytes: the same data
+  is sent gzip-compressed or uncompressed.
+- Analytics results are kept in a TTL+LRU cache keyed by endpoint,
+  period and data version, so other clients and views share them.
+
+By default the version and the results live in memory: the version
+starts from a random per-process token, so ETags from before a restart
+never match. With CACHE_BACKEND=sqlite both are kept in a SQLite file
+shared by all workers on the host. Writes made by processes that do not
+track writes (e.g. the re-analysis job) are only noticed once the
+cached results expire or the version is bumped by the API.
+"""
+
+import os
+import pickle
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Callable, Hashable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.utils.metrics import CACHE_LOOKUPS
+
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+CACHE_PATH = os.getenv("CACHE_PATH", os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "db", "cache.db"
+))
+CACHE_TTL = float(os.getenv("CACHE_TTL", "300"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "256"))
+
+# GET routes whose responses only depend on the stored data and the date
+CACHEABLE_PREFIXES = ("/journal/entries", "/goals", "/analytics")
+WRITE_STATEMENTS = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+
+
+class DataVersion:
+    """Counter identifying the current state of the database."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.token = secrets.token_hex(4)
+        self.value = 0
+
+    def bump(self) -> None:
+        """Marks the data as changed."""
+        with self.lock:
+            self.value += 1
+
+    def current(self) -> str:
+        """Returns the current version as a string."""
+        return f"{self.token}.{self.value}"
+
+
+class SharedDataVersion:
+    """Data version stored in a SQLite file shared by several workers."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with connect(path) as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS data_version "
+                "(id INTEGER PRIMARY KEY CHECK (id = 1), token TEXT, value INTEGER)"
+            )
+            connection.execute(
+                "INSERT OR IGNORE INTO data_version VALUES (1, ?, 0)",
+                (secrets.token_hex(4),),
+            )
+
+    def bump(self) -> None:
+        """Marks the data as changed for all workers."""
+        with connect(self.path) as connection:
+            connection.execute(
+                "UPDATE data_version SET value = value + 1 WHERE id = 1"
+            )
+
+    def current(self) -> str:
+        """Returns the current version as a string."""
+        with connect(self.path) as connection:
+            token, value = connection.execute(
+                "SELECT token, value FROM data_version WHERE id = 1"
+            ).fetchone()
+        return f"{token}.{value}"
+
+
+class ResultCache:
+    """In-memory cache with a time to live and least recently used eviction."""
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES,
+                 ttl: float = CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # key -> (expiry time, value)
+        self.entries: OrderedDict = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: Hashable) -> tuple:
+        """
+        Looks up a value.
+
+        Args:
+            key (Hashable): The cache key.
+
+        Returns:
+            tuple: (True, value) on a hit, (False, None) on a miss.
+        """
+        with self.lock:
+            item = self.entries.get(key)
+            if item is None:
+                return False, None
+            if item[0] < time.monotonic():
+                del self.entries[key]
+                return False, None
+            self.entries.move_to_end(key)
+            return True, item[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Stores a value and evicts the least recently used ones."""
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+
+class PrefixCache(ResultCache):
+    """
+    In-memory TTL+LRU cache of text keys that also answers lookups for
+    texts that differ from a cached key only by a short suffix, e.g. text
+    that is still being typed.
+    """
+
+    def find(self, text: str, max_delta: int) -> tuple:
+        """
+        Looks up the value of the closest key that is a prefix of the text,
+        or that the text is a prefix of, and differs by less than
+        max_delta characters.
+
+        Args:
+            text (str): The text to look up.
+            max_delta (int): The maximum difference in length.
+
+        Returns:
+            tuple: (True, value) on a hit, (False, None) on a miss.
+        """
+        now = time.monotonic()
+        best = None
+        with self.lock:
+            for key, (expires, value) in list(self.entries.items()):
+                if expires < now:
+                    del self.entries[key]
+                    continue
+                delta = abs(len(text) - len(key))
+                if delta < max_delta and \
+                        (text.startswith(key) or key.startswith(text)) and \
+                        (best is None or delta < best[0]):
+                    best = (delta, key, value)
+            if best is None:
+                return False, None
+            self.entries.move_to_end(best[1])
+            return True, best[2]
+
+
+class SQLiteResultCache:
+    """Result cache stored in a SQLite file shared by several workers."""
+
+    def __init__(self, path: str, max_entries: int = CACHE_MAX_ENTRIES,
+                 ttl: float = CACHE_TTL):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        with connect(path) as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, "
+                "value BLOB, expires REAL, used REAL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS ix_results_used ON results (used)"
+            )
+
+    def get(self, key: Hashable) -> tuple:
+        """
+        Looks up a value.
+
+        Args:
+            key (Hashable): The cache key.
+
+        Returns:
+            tuple: (True, value) on a hit, (False, None) on a miss.
+        """
+        now = time.time()
+        with connect(self.path) as connection:
+            row = connection.execute(
+                "SELECT value FROM results WHERE key = ? AND expires >= ?",
+                (repr(key), now),
+            ).fetchone()
+            if row is None:
+                return False, None
+            connection.execute(
+                "UPDATE results SET used = ? WHERE key = ?", (now, repr(key))
+            )
+        return True, pickle.loads(row[0])
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Stores a value and evicts expired and least recently used ones."""
+        now = time.time()
+        with connect(self.path) as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                (repr(key), pickle.dumps(value), now + self.ttl, now),
+            )
+            connection.execute("DELETE FROM results WHERE expires < ?", (now,))
+            connection.execute(
+                "DELETE FROM results WHERE key NOT IN "
+                "(SELECT key FROM results ORDER BY used DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+
+
+_connections = threading.local()
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """
+    Returns the calling thread's connection to the shared cache file,
+    opening it on first use. Connections are not reused across forks.
+    Use it as a context manager to commit; it stays open for later calls.
+    """
+    if getattr(_connections, "pid", None) != os.getpid():
+        _connections.pid = os.getpid()
+        _connections.by_path = {}
+    connection = _connections.by_path.get(path)
+    if connection is None:
+        connection = sqlite3.connect(path, timeout=5)
+        connection.execute("PRAGMA journal_mode=WAL")
+        _connections.by_path[path] = connection
+    return connection
+
+
+if CACHE_BACKEND == "sqlite":
+    data_version = SharedDataVersion(CACHE_PATH)
+    result_cache = SQLiteResultCache(CACHE_PATH)
+else:
+    data_version = DataVersion()
+    result_cache = ResultCache()
+
+
+def cached(endpoint: str, period: Hashable, compute: Callable[[], Any]) -> Any:
+    """
+    Returns a cached result for the current data version, or computes and
+    stores it. Keys include today's date, as periods are relative to it.
+
+    Args:
+        endpoint (str): The name of the cached endpoint.
+        period (Hashable): The requested period.
+        compute (Callable[[], Any]): Computes the result on a miss.
+
+    Returns:
+        Any: The cached or computed result.
+    """
+    key = (endpoint, period, data_version.current(), date.today().isoformat())
+    hit, value = result_cache.get(key)
+    CACHE_LOOKUPS.inc(endpoint=endpoint, result="hit" if hit else "miss")
+    if hit:
+        return value
+    value = compute()
+    result_cache.set(key, value)
+    return value
+
+
+def track_writes(engine: Engine) -> None:
+    """
+    Registers SQLAlchemy engine events that bump the data version when a
+    transaction containing write statements commits.
+
+    Args:
+        engine (Engine): The engine to track.
+    """
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters,
+                             context, executemany):
+        # pylint: disable=unused-argument,too-many-arguments
+        if statement.lstrip()[:7].upper().startswith(WRITE_STATEMENTS):
+            conn.info["wrote"] = True
+
+    @event.listens_for(engine, "commit")
+    def commit(conn):
+        if conn.info.pop("wrote", False):
+            data_version.bump()
+            # The event fires before the commit is visible to readers, bump
+            # again afterwards so results computed in between are dropped
+            conn.info["committed"] = True
+
+    @event.listens_for(engine, "begin")
+    def begin(conn):
+        if conn.info.pop("committed", False):
+            data_version.bump()
+
+    @event.listens_for(engine.pool, "checkin")
+    def checkin(dbapi_connection, connection_record):
+        # pylint: disable=unused-argument
+        if connection_record is not None and \
+                connection_record.info.pop("committed", False):
+            data_version.bump()
+
+    @event.listens_for(engine, "rollback")
+    def rollback(conn):
+        conn.info.pop("wrote", None)
+
+
+def is_cacheable(method: str, path: str) -> bool:
+    """Checks whether a request may be answered from an ETag."""
+    return method == "GET" and path.startswith(CACHEABLE_PREFIXES)
+
+
+def current_etag() -> str:
+    """
+    Builds the ETag for the current data version. Includes the date, as
+    analytics periods and streaks are relative to today.
+
+    Returns:
+        str: The weak ETag, valid for every content coding.
+    """
+    return f'W/"{data_version.current()}.{date.today().isoformat()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Checks an If-None-Match header against an ETag.
+
+    Args:
+        if_none_match (Optional[str]): The header value.
+        etag (str): The current ETag.
+
+    Returns:
+        bool: True if the client's cached representation is current.
+    """
+    if not if_none_match:
+        return False
+    # If-None-Match uses the weak comparison, ignore W/ prefixes
+    candidates = [tag.strip().removeprefix("W/")
+                  for tag in if_none_match.split(",")]
+    return "*" in candidates or etag.removeprefix("W/") in candidates
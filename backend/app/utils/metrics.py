@@ -0,0 +1,248 @@
+"""
+Request, SQL and LLM instrumentation.
+
+Keeps process-wide counters and latency histograms that are rendered in
+the Prometheus text format, and per-request statistics (SQL statements,
+LLM calls) used for Server-Timing headers and slow request logs.
+"""
+
+import contextvars
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "1000"))
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))
+
+LATENCY_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+logger = logging.getLogger("reflecta.metrics")
+
+
+class Counter:
+    """Thread-safe counter with optional labels."""
+
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+        self.values: Dict[Tuple, float] = {}
+        self.lock = threading.Lock()
+
+    def inc(self, value: float = 1, **labels: str) -> None:
+        """Increments the counter for the given labels."""
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + value
+
+    def render(self) -> str:
+        """Renders the counter in the Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.description}",
+                 f"# TYPE {self.name} counter"]
+        with self.lock:
+            for key, value in sorted(self.values.items()):
+                lines.append(f"{self.name}{format_labels(key)} {value}")
+        return "\n".join(lines)
+
+
+class Histogram:
+    """Thread-safe histogram with fixed buckets and optional labels."""
+
+    def __init__(self, name: str, description: str,
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.description = description
+        self.buckets = buckets
+        # labels -> (bucket counts, sum, count)
+        self.values: Dict[Tuple, list] = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Records an observation for the given labels."""
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            counts, total, count = self.values.get(
+                key, [[0] * len(self.buckets), 0.0, 0]
+            )
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+            self.values[key] = [counts, total + value, count + 1]
+
+    def render(self) -> str:
+        """Renders the histogram in the Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.description}",
+                 f"# TYPE {self.name} histogram"]
+        with self.lock:
+            for key, (counts, total, count) in sorted(self.values.items()):
+                for bound, bucket_count in zip(self.buckets, counts):
+                    labels = format_labels(key + (("le", str(bound)),))
+                    lines.append(f"{self.name}_bucket{labels} {bucket_count}")
+                labels = format_labels(key + (("le", "+Inf"),))
+                lines.append(f"{self.name}_bucket{labels} {count}")
+                lines.append(f"{self.name}_sum{format_labels(key)} {total}")
+                lines.append(f"{self.name}_count{format_labels(key)} {count}")
+        return "\n".join(lines)
+
+
+def format_labels(key: Tuple) -> str:
+    """Formats label pairs as {name="value",...}."""
+    if not key:
+        return ""
+    pairs = ",".join(
+        f'{name}="{str(value).replace(chr(34), chr(39))}"' for name, value in key
+    )
+    return "{" + pairs + "}"
+
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route")
+REQUESTS = Counter("http_requests_total", "HTTP requests by route and status")
+SQL_DURATION = Histogram(
+    "sql_statement_duration_seconds", "SQL statement execution time")
+SQL_STATEMENTS_PER_REQUEST = Histogram(
+    "sql_statements_per_request", "SQL statements executed per request",
+    buckets=(1, 2, 5, 10, 20, 50, 100, 500, 1000))
+LLM_DURATION = Histogram(
+    "llm_call_duration_seconds", "Gemini call latency including retries")
+LLM_CALLS = Counter("llm_calls_total", "Gemini calls by outcome")
+LLM_TOKENS = Counter("llm_tokens_total", "Gemini tokens by kind")
+CACHE_LOOKUPS = Counter(
+    "analytics_cache_lookups_total", "Analytics result cache lookups by result")
+
+REGISTRY = [
+    REQUEST_DURATION, REQUESTS, SQL_DURATION, SQL_STATEMENTS_PER_REQUEST,
+    LLM_DURATION, LLM_CALLS, LLM_TOKENS, CACHE_LOOKUPS,
+]
+
+
+class RequestStats:
+    """Statistics collected while a single request is handled."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.llm_count = 0
+        self.llm_time = 0.0
+        self.llm_tokens = 0
+
+    def server_timing(self, total: float) -> str:
+        """
+        Formats the statistics as a Server-Timing header value.
+
+        Args:
+            total (float): The total request duration in seconds.
+
+        Returns:
+            str: The header value.
+        """
+        return ", ".join([
+            f"app;dur={total * 1000:.1f}",
+            f'db;dur={self.sql_time * 1000:.1f};desc="{self.sql_count} queries"',
+            f'llm;dur={self.llm_time * 1000:.1f};desc="{self.llm_count} calls, '
+            f'{self.llm_tokens} tokens"',
+        ])
+
+
+current_request: contextvars.ContextVar[Optional[RequestStats]] = \
+    contextvars.ContextVar("current_request", default=None)
+
+
+def record_request(method: str, route: str, status: int,
+                   duration: float, stats: RequestStats) -> None:
+    """
+    Records a finished request and logs it if it was slow.
+
+    Args:
+        method (str): The HTTP method.
+        route (str): The route template, e.g. /journal/entries/{entry_id}.
+        status (int): The response status code.
+        duration (float): The request duration in seconds.
+        stats (RequestStats): The statistics collected for the request.
+    """
+    REQUEST_DURATION.observe(duration, method=method, route=route)
+    REQUESTS.inc(method=method, route=route, status=str(status))
+    SQL_STATEMENTS_PER_REQUEST.observe(stats.sql_count, route=route)
+    if duration * 1000 >= SLOW_REQUEST_MS:
+        logger.warning(
+            "Slow request %s %s: %.0f ms (%d queries in %.0f ms, "
+            "%d LLM calls in %.0f ms)",
+            method, route, duration * 1000, stats.sql_count,
+            stats.sql_time * 1000, stats.llm_count, stats.llm_time * 1000,
+        )
+
+
+def record_llm_call(duration: float, outcome: str,
+                    prompt_tokens: int = 0, response_tokens: int = 0) -> None:
+    """
+    Records a Gemini call.
+
+    Args:
+        duration (float): The call duration in seconds, including retries.
+        outcome (str): "success", "failure" or "cancelled".
+        prompt_tokens (int): The number of prompt tokens.
+        response_tokens (int): The number of response tokens.
+    """
+    LLM_DURATION.observe(duration, outcome=outcome)
+    LLM_CALLS.inc(outcome=outcome)
+    LLM_TOKENS.inc(prompt_tokens, kind="prompt")
+    LLM_TOKENS.inc(response_tokens, kind="response")
+    stats = current_request.get()
+    if stats is not None:
+        with stats.lock:
+            stats.llm_count += 1
+            stats.llm_time += duration
+            stats.llm_tokens += prompt_tokens + response_tokens
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Registers SQLAlchemy engine events that time every SQL statement.
+
+    Args:
+        engine (Engine): The engine to instrument.
+    """
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters,
+                              context, executemany):
+        # pylint: disable=unused-argument,too-many-arguments
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters,
+                             context, executemany):
+        # pylint: disable=unused-argument,too-many-arguments
+        duration = time.perf_counter() - conn.info["query_start"].pop()
+        SQL_DURATION.observe(duration)
+        stats = current_request.get()
+        if stats is not None:
+            with stats.lock:
+                stats.sql_count += 1
+                stats.sql_time += duration
+        if duration * 1000 >= SLOW_QUERY_MS:
+            logger.warning("Slow query (%.0f ms): %s",
+                           duration * 1000, " ".join(statement.split()))
+
+
+def render_metrics(extra: str = "") -> str:
+    """
+    Renders all metrics in the Prometheus text format.
+
+    Args:
+        extra (str): Additional pre-rendered metric lines.
+
+    Returns:
+        str: The metrics exposition.
+    """
+    parts = [metric.render() for metric in REGISTRY]
+    if extra:
+        parts.append(extra)
+    return "\n".join(parts) + "\n"
@@ -0,0 +1,248 @@
+"""
+Sampling profiler for requests.
+
+A background thread periodically captures the stacks of all threads and
+attributes each stack to the request it is working on, so that sync
+endpoints running in the thread pool are profiled as well. Stacks are
+aggregated in the collapsed ("folded") format understood by flamegraph.pl,
+speedscope and similar tools.
+
+Two modes are supported, both disabled unless PROFILING_ENABLED is set:
+- On demand: a request with ?profile=1 or an "X-Profile: 1" header is
+  sampled and the profile is returned instead of the response, or saved
+  to PROFILE_DIR if configured.
+- Continuous: with CONTINUOUS_PROFILING set, every request is sampled at
+  a low rate and the hot stacks are aggregated per route. Only the
+  PROFILE_MAX_STACKS most sampled stacks of each route are kept.
+"""
+
+import collections
+import contextvars
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from fastapi import Request
+from fastapi.responses import PlainTextResponse
+
+
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "") == "1"
+CONTINUOUS_PROFILING = os.getenv("CONTINUOUS_PROFILING", "") == "1"
+PROFILE_DIR = os.getenv("PROFILE_DIR")
+# Sampling intervals in milliseconds
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+CONTINUOUS_INTERVAL_MS = float(os.getenv("CONTINUOUS_INTERVAL_MS", "50"))
+# Distinct stacks kept per route by continuous profiling
+PROFILE_MAX_STACKS = int(os.getenv("PROFILE_MAX_STACKS", "500"))
+
+# Functions that run request work inside the request's context:
+# anyio worker threads (sync endpoints) and asyncio handles (async code)
+CONTEXT_RUNNERS = {"run", "_run"}
+
+
+class RequestProfile:
+    """Stack samples collected for a single request."""
+
+    def __init__(self, on_demand: bool):
+        self.on_demand = on_demand
+        self.samples: collections.Counter = collections.Counter()
+        self.started = time.perf_counter()
+
+
+current_profile: contextvars.ContextVar[Optional[RequestProfile]] = \
+    contextvars.ContextVar("current_profile", default=None)
+
+
+class Sampler:
+    """
+    Background thread sampling the stacks of all threads while at least
+    one profiled request is active.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active: Dict[int, RequestProfile] = {}
+        self.hot_stacks: Dict[str, collections.Counter] = \
+            collections.defaultdict(collections.Counter)
+        self.wakeup = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self, profile: RequestProfile) -> None:
+        """Registers a profiled request and starts the thread if needed."""
+        with self.lock:
+            self.active[id(profile)] = profile
+            if self.thread is None:
+                self.thread = threading.Thread(
+                    target=self._run, name="profiler-sampler", daemon=True
+                )
+                self.thread.start()
+        self.wakeup.set()
+
+    def stop(self, profile: RequestProfile) -> None:
+        """Unregisters a profiled request."""
+        with self.lock:
+            self.active.pop(id(profile), None)
+
+    def record(self, route: str, profile: RequestProfile) -> None:
+        """
+        Adds the samples of a finished request to its route's hot stacks.
+        Once a route has twice PROFILE_MAX_STACKS distinct stacks, only
+        the most sampled PROFILE_MAX_STACKS are kept.
+        """
+        with self.lock:
+            counter = self.hot_stacks[route]
+            counter.update(profile.samples)
+            if len(counter) >= 2 * PROFILE_MAX_STACKS:
+                self.hot_stacks[route] = collections.Counter(
+                    dict(counter.most_common(PROFILE_MAX_STACKS))
+                )
+
+    def hot(self, route: Optional[str] = None, limit: int = 50) -> List[tuple]:
+        """
+        Returns the most frequently sampled stacks.
+
+        Args:
+            route (Optional[str]): Restrict to a single route template.
+            limit (int): The maximum number of stacks.
+
+        Returns:
+            List[tuple]: (route, folded stack, sample count) tuples.
+        """
+        with self.lock:
+            stacks = [
+                (name, stack, count)
+                for name, counter in self.hot_stacks.items()
+                if route is None or name == route
+                for stack, count in counter.items()
+            ]
+        return sorted(stacks, key=lambda x: x[2], reverse=True)[:limit]
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while True:
+            with self.lock:
+                active = list(self.active.values())
+            if not active:
+                self.wakeup.wait()
+                self.wakeup.clear()
+                continue
+            on_demand = any(profile.on_demand for profile in active)
+            interval = PROFILE_INTERVAL_MS if on_demand \
+                else CONTINUOUS_INTERVAL_MS
+            time.sleep(interval / 1000)
+
+            for thread_id, frame in sys._current_frames().items():  # pylint: disable=protected-access
+                if thread_id == own_id:
+                    continue
+                profile, stack = attribute_stack(frame)
+                if profile is not None and stack:
+                    profile.samples[stack] += 1
+
+
+def attribute_stack(frame) -> tuple:
+    """
+    Finds the request a thread is working on and its folded stack.
+    Walks from the innermost frame outwards until a frame that runs code
+    inside a context holding a RequestProfile.
+
+    Args:
+        frame: The innermost frame of a thread.
+
+    Returns:
+        tuple: (RequestProfile or None, folded stack from the context
+        runner to the innermost frame).
+    """
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        if code.co_name in CONTEXT_RUNNERS:
+            for value in frame.f_locals.values():
+                context = value if isinstance(value, contextvars.Context) \
+                    else getattr(value, "_context", None)
+                if isinstance(context, contextvars.Context):
+                    profile = context.get(current_profile, None)
+                    if profile is not None:
+                        return profile, ";".join(reversed(names))
+        name = getattr(code, "co_qualname", code.co_name)
+        module = frame.f_globals.get("__name__", "?")
+        names.append(f"{module}:{name}")
+        frame = frame.f_back
+    return None, ""
+
+
+sampler = Sampler()
+
+
+def wants_profile(request: Request) -> bool:
+    """Checks whether a request asks for an on-demand profile."""
+    return (request.query_params.get("profile") == "1" or
+            request.headers.get("x-profile") == "1")
+
+
+def start_profile(request: Request) -> Optional[RequestProfile]:
+    """
+    Starts sampling a request if profiling applies to it.
+
+    Args:
+        request (Request): The incoming request.
+
+    Returns:
+        Optional[RequestProfile]: The profile, or None if the request is
+        not profiled.
+    """
+    if not PROFILING_ENABLED:
+        return None
+    on_demand = wants_profile(request)
+    if not (on_demand or CONTINUOUS_PROFILING):
+        return None
+    profile = RequestProfile(on_demand)
+    sampler.start(profile)
+    return profile
+
+
+def finish_profile(profile: RequestProfile, route: str, response):
+    """
+    Records the samples of a finished request and produces the on-demand
+    profile.
+
+    Args:
+        profile (RequestProfile): The request's profile.
+        route (str): The route template of the request.
+        response (Response): The original response.
+
+    Returns:
+        Response: The original response, or the profile for on-demand
+        requests unless it was saved to PROFILE_DIR.
+    """
+    if CONTINUOUS_PROFILING:
+        sampler.record(route, profile)
+    if not profile.on_demand:
+        return response
+
+    folded = "\n".join(
+        f"{stack} {count}" for stack, count in profile.samples.most_common()
+    ) + "\n"
+    duration_ms = (time.perf_counter() - profile.started) * 1000
+    if PROFILE_DIR:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        name = route.strip("/").replace("/", "_").replace("{", "") \
+            .replace("}", "") or "root"
+        path = os.path.join(
+            PROFILE_DIR,
+            f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}-{name}.folded",
+        )
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(folded)
+        response.headers["X-Profile-File"] = path
+        return response
+    return PlainTextResponse(
+        folded,
+        headers={
+            "X-Profile-Samples": str(sum(profile.samples.values())),
+            "X-Profile-Duration-Ms": f"{duration_ms:.1f}",
+            "X-Profile-Status": str(response.status_code),
+        },
+    )
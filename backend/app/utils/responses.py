@@ -0,0 +1,33 @@
+"""
+Utility functions for building API responses.
+"""
+
+from typing import Any
+
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+
+
+def json_response(adapter: TypeAdapter, value: Any) -> Response:
+    """
+    Serializes ORM objects to a JSON response in a single pass.
+    The objects are validated against the adapter's type from attributes
+    and dumped to JSON bytes by pydantic-core, instead of building
+    pydantic models in the endpoint that FastAPI validates and serializes
+    again. Fields are dumped by alias, as FastAPI does for response
+    models.
+
+    Args:
+        adapter (TypeAdapter): The adapter of the response model.
+        value (Any): The ORM object(s) to serialize.
+
+    Returns:
+        Response: The JSON response.
+    """
+    return Response(
+        content=adapter.dump_json(
+            adapter.validate_python(value, from_attributes=True),
+            by_alias=True,
+        ),
+        media_type="application/json",
+    )
@@ -0,0 +1,151 @@
+"""
+Benchmark for the journal entry analysis pipeline.
+Compares the combined single-request analysis with the split
+four-request analysis against a stubbed model and reports latency,
+request count and input tokens per entry.
+
+Run from the backend directory:
+    python -m benchmarks.analyze_entry --entries 20
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from types import SimpleNamespace
+
+from app.models.chat_agent import (
+    FormattedText,
+    ActivityList,
+    SentimentList,
+    EntryAnalysis,
+)
+from app.services import gemini_agent
+from app.services.gemini_client import set_client
+
+
+SAMPLE_ENTRY = (
+    "Woke up early and went for a run before work. The morning was "
+    "productive, I finished the API integration I was stuck on. "
+    "In the afternoon I felt a bit overwhelmed by meetings, but a short "
+    "walk helped. In the evening I cooked dinner with Sarah and read "
+    "a few chapters of my book before going to bed early."
+)
+
+SAMPLE_GOALS = [
+    {"id": 1, "title": "Exercise regularly",
+     "description": "Run or go to the gym three times a week."},
+    {"id": 2, "title": "Read more books",
+     "description": "Read at least 15 minutes every day."},
+    {"id": 3, "title": "Get enough sleep",
+     "description": "Go to bed before 11pm."},
+]
+
+
+def count_tokens(text: str) -> int:
+    """Approximates the token count of a prompt (~4 characters per token)."""
+    return max(1, len(text) // 4)
+
+
+class StubModels:
+    """
+    Stand-in for genai_client.models that sleeps for a latency derived
+    from the prompt size and returns schema-conforming responses.
+    """
+
+    def __init__(self, base_latency: float, latency_per_token: float):
+        self.base_latency = base_latency
+        self.latency_per_token = latency_per_token
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.input_tokens = 0
+
+    def generate_content(self, model: str, contents: str, config=None):
+        """Simulates a generate_content call."""
+        tokens = count_tokens(contents)
+        with self.lock:
+            self.requests += 1
+            self.input_tokens += tokens
+        time.sleep(self.base_latency + tokens * self.latency_per_token)
+
+        schema = (config or {}).get("response_schema")
+        activities = [{"value": "Running"}, {"value": "Reading"}]
+        sentiments = ["Content", "Tired"]
+        if schema is FormattedText:
+            parsed = FormattedText(text=SAMPLE_ENTRY)
+        elif schema is ActivityList:
+            parsed = ActivityList(activities=activities)
+        elif schema is SentimentList:
+            parsed = SentimentList(sentiments=sentiments)
+        elif schema is EntryAnalysis:
+            parsed = EntryAnalysis(
+                formatted_text=SAMPLE_ENTRY,
+                activities=activities,
+                sentiments=sentiments,
+                goal_ids=[1, 2],
+            )
+        else:
+            return SimpleNamespace(parsed=None, text="1, 2")
+        return SimpleNamespace(parsed=parsed, text=parsed.model_dump_json())
+
+
+def run(mode: str, entries: int, stub: StubModels) -> dict:
+    """
+    Analyzes the sample entry repeatedly with the given analysis mode.
+
+    Args:
+        mode (str): Either "combined" or "split".
+        entries (int): Number of entries to analyze.
+        stub (StubModels): The stubbed model.
+
+    Returns:
+        dict: Latency, request and token figures per entry.
+    """
+    stub.requests = 0
+    stub.input_tokens = 0
+    gemini_agent.analysis_mode = mode
+    latencies = []
+    for _ in range(entries):
+        start = time.perf_counter()
+        gemini_agent.analyze_entry(SAMPLE_ENTRY, SAMPLE_GOALS)
+        latencies.append(time.perf_counter() - start)
+    return {
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "p95_ms": sorted(latencies)[int(0.95 * (len(latencies) - 1))] * 1000,
+        "requests": stub.requests / entries,
+        "input_tokens": stub.input_tokens / entries,
+    }
+
+
+def main():
+    """Runs the benchmark and prints a comparison table."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=20)
+    parser.add_argument("--base-latency", type=float, default=0.3,
+                        help="Fixed latency per request in seconds")
+    parser.add_argument("--latency-per-token", type=float, default=0.0002,
+                        help="Additional latency per input token in seconds")
+    args = parser.parse_args()
+
+    stub = StubModels(args.base_latency, args.latency_per_token)
+    set_client(SimpleNamespace(models=stub))
+
+    results = {mode: run(mode, args.entries, stub)
+               for mode in ("split", "combined")}
+
+    print(f"{'mode':<10}{'mean ms':>10}{'p95 ms':>10}"
+          f"{'requests':>10}{'in tokens':>11}")
+    for mode, result in results.items():
+        print(f"{mode:<10}{result['mean_ms']:>10.1f}{result['p95_ms']:>10.1f}"
+              f"{result['requests']:>10.1f}{result['input_tokens']:>11.0f}")
+
+    split, combined = results["split"], results["combined"]
+    print(f"\nlatency saved per entry: "
+          f"{split['mean_ms'] - combined['mean_ms']:.1f} ms")
+    print(f"input tokens saved per entry: "
+          f"{split['input_tokens'] - combined['input_tokens']:.0f} "
+          f"({1 - combined['input_tokens'] / split['input_tokens']:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Backup under concurrent write load.
+
+Seeds a temporary database, keeps writer threads inserting entries while
+an online backup runs, and checks that the backup passes the integrity
+check and holds a consistent snapshot. Reports how long writers were
+stalled during the backup. Exits with status 1 if a check fails.
+
+Run from the backend directory:
+    python -m benchmarks.backup_under_load --entries 20000 --writers 4
+"""
+
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime
+
+
+def writer(path: str, stop: threading.Event, latencies: list) -> None:
+    """Inserts entries in separate transactions until stopped."""
+    connection = sqlite3.connect(path, timeout=30)
+    while not stop.is_set():
+        start = time.perf_counter()
+        connection.execute(
+            "INSERT INTO journal_entries (title, date, content, created_at) "
+            "VALUES (?, ?, ?, ?)",
+            ("Load", date.today().isoformat(), "written during backup " * 50,
+             datetime.now().isoformat(" ")),
+        )
+        connection.commit()
+        latencies.append(time.perf_counter() - start)
+        time.sleep(0.001)
+    connection.close()
+
+
+def count_entries(path: str) -> int:
+    """Counts the journal entries in a database file."""
+    connection = sqlite3.connect(path)
+    try:
+        return connection.execute(
+            "SELECT COUNT(*) FROM journal_entries"
+        ).fetchone()[0]
+    finally:
+        connection.close()
+
+
+def main():
+    """Runs a backup while writers insert entries and checks the result."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=20000)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--pages", type=int, default=256,
+                        help="Pages copied per backup step")
+    parser.add_argument("--sleep", type=float, default=0.05,
+                        help="Pause between backup steps in seconds")
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp()
+    path = os.path.join(data_dir, "journal.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    # pylint: disable=import-outside-toplevel
+    from app.db.backup import check_integrity, copy_database, BackupError
+    from benchmarks.crud_analytics import seed_database
+
+    print(f"Seeding {args.entries} entries...")
+    seed_database(path, args.entries)
+    print(f"Database size: {os.path.getsize(path) // 1024} KiB")
+
+    stop = threading.Event()
+    latencies: list = []
+    threads = [
+        threading.Thread(target=writer, args=(path, stop, latencies))
+        for _ in range(args.writers)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.5)
+
+    before = count_entries(path)
+    backup_path = os.path.join(data_dir, "backup.db")
+    source = sqlite3.connect(path, timeout=30)
+    target = sqlite3.connect(backup_path)
+    start = time.perf_counter()
+    restarts = copy_database(source, target, args.pages, args.sleep)
+    duration = time.perf_counter() - start
+    target.close()
+    source.close()
+    after = count_entries(path)
+
+    time.sleep(0.5)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    failures = []
+    try:
+        check_integrity(backup_path)
+    except BackupError as exc:
+        failures.append(str(exc))
+    backed_up = count_entries(backup_path)
+    if not before <= backed_up <= after:
+        failures.append(f"Backup holds {backed_up} entries, expected between "
+                        f"{before} and {after}")
+
+    latencies_ms = sorted(latency * 1000 for latency in latencies)
+    print(f"Backup took {duration:.2f} s with {restarts} restart(s), "
+          f"{backed_up} entries (writers added {after - before} meanwhile)")
+    print(f"Writer commits: {len(latencies_ms)}, median "
+          f"{statistics.median(latencies_ms):.1f} ms, "
+          f"p99 {latencies_ms[int(len(latencies_ms) * 0.99)]:.1f} ms, "
+          f"max {latencies_ms[-1]:.1f} ms")
+    if failures:
+        print("FAILED: " + "; ".join(failures))
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Checks the journal entry batch endpoint with empty contents.
+
+Runs the API in-process against a temporary database and the fake Gemini
+backend, and checks that:
+  - a batch creating entries with and without content succeeds and every
+    entry is analyzed and has its text statistics
+  - an update that clears the content resets the text statistics and
+    replaces the analysis of the previous content
+Exits with status 1 if a check fails.
+
+Run from the backend directory:
+    python -m benchmarks.batch_entries
+"""
+
+import os
+import sys
+import tempfile
+from typing import List
+
+
+def main():
+    """Runs the checks against a temporary database."""
+    path = os.path.join(tempfile.mkdtemp(), "journal.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    os.environ["GEMINI_PROVIDER"] = "fake"
+    os.environ.setdefault("FAKE_GEMINI_LATENCY_MS", "1")
+    # pylint: disable=import-outside-toplevel
+    from fastapi.testclient import TestClient
+    from sqlalchemy import text
+    from app.db.database import engine
+    from app.main import app
+
+    failures: List[str] = []
+    with TestClient(app) as client:
+        def entry(entry_id: int) -> dict:
+            return client.get(f"/journal/entries/{entry_id}").json()
+
+        response = client.post("/journal/entries/batch", json={"operations": [
+            {"op": "create", "data": {"title": "Run", "date": "2024-05-01",
+                                      "content": "went running today"}},
+            {"op": "create", "data": {"title": "Empty", "date": "2024-05-02",
+                                      "content": ""}},
+        ]})
+        if response.status_code != 200:
+            failures.append(
+                f"mixed creates: status {response.status_code}: "
+                f"{response.text[:200]}")
+            ids = []
+        else:
+            results = response.json()["results"]
+            if [item["status"] for item in results] != [201, 201]:
+                failures.append(f"mixed creates: results {results}")
+            ids = [item["id"] for item in results]
+
+        for entry_id in ids:
+            if entry(entry_id).get("formatted_content") is None:
+                failures.append(f"create: entry {entry_id} not analyzed")
+
+        if ids:
+            before = entry(ids[0])
+            response = client.post("/journal/entries/batch", json={
+                "operations": [{"op": "update", "id": ids[0],
+                                "data": {"content": ""}}]
+            })
+            cleared = entry(ids[0])
+            if response.status_code != 200 or cleared.get("content") != "":
+                failures.append(
+                    f"clear content: status {response.status_code}, "
+                    f"content {cleared.get('content')!r}")
+            if cleared.get("formatted_content") == \
+                    before.get("formatted_content"):
+                failures.append(
+                    "clear content: analysis of the old content was kept")
+
+        # The text statistics are not part of the API response
+        with engine.connect() as connection:
+            rows = connection.execute(text(
+                "SELECT id, content, word_count, char_count "
+                "FROM journal_entries")).all()
+        for entry_id, content, words, chars in rows:
+            if (words, chars) != (len(content.split()), len(content)):
+                failures.append(
+                    f"entry {entry_id}: stored text stats {(words, chars)} "
+                    f"for {content!r}")
+
+    if failures:
+        for failure in failures:
+            print(f"FAILED: {failure}")
+        sys.exit(1)
+    print("OK, batches with empty contents are analyzed and counted")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+Micro-benchmarks for the CRUD and analytics hot paths.
+
+Seeds synthetic SQLite databases with 1k, 10k and 100k journal entries
+linked to goals, times the CRUD and AnalyticsService functions on each
+and compares the median timings against stored baselines. The run fails
+if a timing regresses beyond the threshold.
+
+Run from the backend directory:
+    python -m benchmarks.crud_analytics --save-baseline
+    python -m benchmarks.crud_analytics --check --threshold 0.25
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Dict, List
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import (
+    Base,
+    GoalModel,
+    JournalEntryModel,
+    journal_goal_association,
+)
+from app.db.crud.goal import get_goals
+from app.db.crud.journal import get_journal_entries
+from app.services.analytics import AnalyticsService
+from app.services.fake_gemini import FakeGeminiClient
+from app.services.gemini_client import set_client
+
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines.json")
+GOALS = 20
+WORDS = ["run", "work", "friends", "read", "sleep", "cook", "walk", "music"]
+
+
+def seed_database(path: str, entries: int) -> None:
+    """
+    Creates a database with synthetic goals, entries and goal links.
+    Entries are spread over the past five years, newest first, with
+    one entry for each of the most recent days.
+
+    Args:
+        path (str): The path of the SQLite file.
+        entries (int): The number of journal entries.
+    """
+    rng = random.Random(entries)
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    today = date.today()
+    now = datetime.now(timezone.utc)
+
+    with engine.begin() as connection:
+        connection.execute(insert(GoalModel), [
+            {
+                "id": goal_id,
+                "title": f"Goal {goal_id}",
+                "type": "Recurring",
+                "category": "Health",
+                "priority": rng.choice(["High", "Medium", "Low"]),
+                "description": "Synthetic benchmark goal",
+                "progress": 0,
+                "created_at": now,
+            }
+            for goal_id in range(1, GOALS + 1)
+        ])
+
+        for start in range(0, entries, 10000):
+            rows, links = [], []
+            for entry_id in range(start + 1, min(entries, start + 10000) + 1):
+                days_ago = entry_id - 1 if entry_id <= 60 \
+                    else rng.randint(0, 5 * 365)
+                rows.append({
+                    "id": entry_id,
+                    "title": f"Entry {entry_id}",
+                    "date": today - timedelta(days=days_ago),
+                    "content": " ".join(
+                        rng.choice(WORDS) for _ in range(rng.randint(20, 300))
+                    ),
+                    "created_at": now,
+                    "sentiment_level": rng.randint(1, 5),
+                    "sleep_quality": rng.randint(1, 5),
+                    "stress_level": rng.randint(1, 5),
+                    "social_engagement": rng.randint(1, 5),
+                    "formatted_content": "Formatted",
+                    "activities": "Running, Reading",
+                    "sentiments": "Happy, Calm",
+                })
+                for goal_id in rng.sample(range(1, GOALS + 1), rng.randint(0, 2)):
+                    links.append({"journal_id": entry_id, "goal_id": goal_id})
+            connection.execute(insert(JournalEntryModel), rows)
+            if links:
+                connection.execute(insert(journal_goal_association), links)
+    engine.dispose()
+
+
+BENCHMARKS: Dict[str, Callable] = {
+    "get_journal_entries": lambda db: get_journal_entries(db),
+    "get_journal_entries_365days": lambda db: get_journal_entries(
+        db, from_date=datetime.now(timezone.utc) - timedelta(days=365),
+        limit=10**9,
+    ),
+    "get_goals": lambda db: get_goals(db),
+    "calculate_trends": lambda db: AnalyticsService(db).calculate_trends(365),
+    "calculate_averages": lambda db: AnalyticsService(db).calculate_averages(365),
+    "calculate_correlations":
+        lambda db: AnalyticsService(db).calculate_correlations(365),
+    "current_streak": lambda db: AnalyticsService(db)._calculate_current_streak(),  # pylint: disable=protected-access
+}
+
+
+def run_benchmarks(path: str, repeat: int, names: List[str]) -> Dict[str, float]:
+    """
+    Times each benchmark on a database, using a fresh session per run.
+
+    Args:
+        path (str): The path of the SQLite file.
+        repeat (int): The number of runs per benchmark.
+        names (List[str]): The benchmarks to run.
+
+    Returns:
+        Dict[str, float]: The median duration in seconds per benchmark.
+    """
+    engine = create_engine(f"sqlite:///{path}")
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+    results = {}
+    for name in names:
+        durations = []
+        for _ in range(repeat):
+            db = session_factory()
+            try:
+                start = time.perf_counter()
+                BENCHMARKS[name](db)
+                durations.append(time.perf_counter() - start)
+            finally:
+                db.rollback()
+                db.close()
+        results[name] = statistics.median(durations)
+    engine.dispose()
+    return results
+
+
+def main():
+    """Runs the benchmarks and compares or stores the baselines."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS),
+                        default=list(BENCHMARKS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--data-dir", default=os.path.join(
+        tempfile.gettempdir(), "reflecta-benchmarks"))
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true",
+                        help="Fail if a timing exceeds its baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed slowdown relative to the baseline")
+    args = parser.parse_args()
+
+    # Correlation insights are generated by the model, use a zero-latency fake
+    set_client(FakeGeminiClient(latency_ms=0))
+    os.makedirs(args.data_dir, exist_ok=True)
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as file:
+            baselines = json.load(file)
+
+    timings, regressions = {}, []
+    print(f"{'benchmark':<32}{'entries':>9}{'median ms':>12}{'baseline':>12}")
+    for size in args.sizes:
+        path = os.path.join(args.data_dir, f"entries_{size}.db")
+        if not os.path.exists(path):
+            print(f"Seeding {size} entries...")
+            seed_database(path, size)
+        for name, duration in run_benchmarks(path, args.repeat, args.only).items():
+            key = f"{name}:{size}"
+            timings[key] = duration
+            baseline = baselines.get(key)
+            flag = ""
+            if baseline is not None and duration > baseline * (1 + args.threshold):
+                regressions.append(key)
+                flag = "  REGRESSION"
+            baseline_text = f"{baseline * 1000:.1f}" if baseline else "-"
+            print(f"{name:<32}{size:>9}{duration * 1000:>12.1f}"
+                  f"{baseline_text:>12}{flag}")
+
+    if args.save_baseline:
+        baselines.update(timings)
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(baselines, file, indent=2, sort_keys=True)
+        print(f"Baselines saved to {args.baseline}")
+
+    if args.check and regressions:
+        print(f"{len(regressions)} regression(s) beyond "
+              f"{args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
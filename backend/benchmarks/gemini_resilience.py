@@ -0,0 +1,256 @@
+"""
+Checks the retry, deadline and circuit breaker handling of the Gemini
+client against a local fake Gemini server.
+
+The server answers generateContent requests from a script of status
+codes, so the real google-genai client sees 429 and 5xx responses and
+slow answers exactly like it would from the API. Covers:
+  - 429 and 5xx responses are retried until a call succeeds
+  - 4xx responses other than 429 are not retried
+  - a slow upstream fails the call at its deadline
+  - the circuit opens after repeated failures, lets one trial through
+    after the reset timeout and closes again when it succeeds
+  - a trial call that hits the rate limit does not leave the circuit
+    half open
+  - an open circuit rejects calls at once, without waiting for or
+    taking rate capacity
+Exits with status 1 if a check fails.
+
+Run from the backend directory:
+    python -m benchmarks.gemini_resilience
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Tuple
+
+from app.services import gemini_client
+from app.services.gemini_client import (
+    CircuitBreaker,
+    GeminiUnavailableError,
+    TokenBucket,
+)
+
+
+MODEL = "gemini-2.0-flash"
+RESET_TIMEOUT = 0.5
+OK_BODY = {
+    "candidates": [{
+        "content": {"role": "model", "parts": [{"text": "ok"}]},
+        "finishReason": "STOP",
+    }],
+    "usageMetadata": {"promptTokenCount": 3, "candidatesTokenCount": 1},
+}
+
+
+class FakeGeminiServer(ThreadingHTTPServer):
+    """Answers each request with the next (status, delay) of a script."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FakeGeminiHandler)
+        self.lock = threading.Lock()
+        self.script: List[Tuple[int, float]] = []
+        self.requests = 0
+
+    def play(self, *steps: Tuple[int, float]) -> None:
+        """Replaces the script and resets the request count."""
+        with self.lock:
+            self.script = list(steps)
+            self.requests = 0
+
+    def next_step(self) -> Tuple[int, float]:
+        """Returns the next scripted answer, repeating the last one."""
+        with self.lock:
+            self.requests += 1
+            if len(self.script) > 1:
+                return self.script.pop(0)
+            return self.script[0] if self.script else (200, 0.0)
+
+
+class FakeGeminiHandler(BaseHTTPRequestHandler):
+    """Handler for models/*:generateContent requests."""
+
+    server: FakeGeminiServer
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """Answers with the scripted status after the scripted delay."""
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        status, delay = self.server.next_step()
+        time.sleep(delay)
+        if status == 200:
+            body = OK_BODY
+        else:
+            body = {"error": {"code": status, "message": "injected",
+                              "status": "INJECTED"}}
+        payload = json.dumps(body).encode()
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        except OSError:
+            # The client gave up waiting (deadline checks)
+            pass
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+def reset_limits(failure_threshold: int = 100) -> None:
+    """Gives each check a fresh circuit breaker and full buckets."""
+    gemini_client.circuit_breaker = CircuitBreaker(
+        failure_threshold, RESET_TIMEOUT)
+    gemini_client.request_bucket = TokenBucket(6000)
+    gemini_client.token_bucket = TokenBucket(10 ** 7)
+
+
+def call(client, timeout: float = 5.0) -> Tuple[bool, float]:
+    """Makes one call and returns whether it succeeded and its duration."""
+    start = time.monotonic()
+    try:
+        response = client.models.generate_content(
+            model=MODEL, contents="ping", timeout=timeout)
+        ok = response.text == "ok"
+    except GeminiUnavailableError:
+        ok = False
+    return ok, time.monotonic() - start
+
+
+def main():
+    """Runs the checks against a fake server on a free local port."""
+    server = FakeGeminiServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["GEMINI_PROVIDER"] = "gemini"
+    os.environ["GEMINI_API_KEY"] = "test-key"
+    os.environ["GEMINI_BASE_URL"] = \
+        f"http://127.0.0.1:{server.server_address[1]}"
+    client = gemini_client.create_client()
+    # Short backoff keeps the run fast, the retry logic is unchanged
+    gemini_client.backoff_delay = lambda attempt: 0.05
+    gemini_client.MAX_RETRIES = 3
+    failures = []
+
+    # 429 and 5xx are retried until the call succeeds
+    reset_limits()
+    server.play((429, 0), (503, 0), (500, 0), (200, 0))
+    ok, _ = call(client)
+    if not ok or server.requests != 4:
+        failures.append(
+            f"429/5xx retries: ok={ok}, requests={server.requests} "
+            "(expected success after 4 requests)")
+
+    # Retries stop after MAX_RETRIES
+    reset_limits()
+    server.play((502, 0))
+    ok, _ = call(client)
+    if ok or server.requests != gemini_client.MAX_RETRIES + 1:
+        failures.append(
+            f"retry limit: ok={ok}, requests={server.requests} "
+            f"(expected failure after {gemini_client.MAX_RETRIES + 1})")
+
+    # Client errors are not retried
+    reset_limits()
+    server.play((400, 0))
+    try:
+        client.models.generate_content(model=MODEL, contents="ping")
+        failures.append("400: call succeeded")
+    except GeminiUnavailableError:
+        failures.append("400: reported as unavailable instead of raised")
+    except Exception:  # pylint: disable=broad-except
+        if server.requests != 1:
+            failures.append(f"400: {server.requests} requests (expected 1)")
+
+    # A slow upstream fails the call at its deadline
+    reset_limits()
+    server.play((200, 3.0))
+    ok, elapsed = call(client, timeout=1.0)
+    if ok or elapsed > 2.0:
+        failures.append(
+            f"deadline: ok={ok} after {elapsed:.2f}s (expected failure "
+            "within the 1s deadline)")
+
+    # open -> half-open -> closed
+    reset_limits(failure_threshold=2)
+    breaker = gemini_client.circuit_breaker
+    server.play((500, 0))
+    call(client)
+    if breaker.state != CircuitBreaker.OPEN or server.requests != 2:
+        failures.append(
+            f"circuit: state={breaker.state}, requests={server.requests} "
+            "after 2 failures (expected open after 2 requests)")
+    server.play((200, 0))
+    ok, _ = call(client)
+    if ok or server.requests != 0:
+        failures.append("circuit: open circuit let a call through")
+    time.sleep(RESET_TIMEOUT)
+    ok, _ = call(client)
+    if not ok or breaker.state != CircuitBreaker.CLOSED:
+        failures.append(
+            f"circuit: trial call ok={ok}, state={breaker.state} "
+            "(expected closed)")
+
+    # A failed trial reopens the circuit
+    reset_limits(failure_threshold=1)
+    breaker = gemini_client.circuit_breaker
+    server.play((503, 0))
+    call(client)
+    time.sleep(RESET_TIMEOUT)
+    call(client)
+    if breaker.state != CircuitBreaker.OPEN:
+        failures.append(
+            f"circuit: failed trial left state={breaker.state}")
+
+    # A trial that cannot get rate capacity does not block recovery
+    reset_limits(failure_threshold=1)
+    breaker = gemini_client.circuit_breaker
+    server.play((503, 0))
+    call(client)
+    time.sleep(RESET_TIMEOUT)
+    gemini_client.request_bucket = TokenBucket(1)
+    gemini_client.request_bucket.tokens = 0
+    ok, _ = call(client, timeout=0.2)
+    gemini_client.request_bucket = TokenBucket(6000)
+    server.play((200, 0))
+    recovered, _ = call(client)
+    if ok or not recovered or breaker.state != CircuitBreaker.CLOSED:
+        failures.append(
+            f"circuit: after a rate limited trial ok={recovered}, "
+            f"state={breaker.state} (expected closed)")
+
+    # An open circuit fails fast even when the rate limit is exhausted
+    reset_limits(failure_threshold=1)
+    breaker = gemini_client.circuit_breaker
+    server.play((503, 0))
+    call(client)
+    # Empty, but refilled within the deadline after 2s
+    gemini_client.request_bucket = TokenBucket(30)
+    gemini_client.request_bucket.tokens = 0
+    ok, elapsed = call(client, timeout=5.0)
+    if ok or elapsed > 0.5 or breaker.state != CircuitBreaker.OPEN:
+        failures.append(
+            f"circuit: open circuit call took {elapsed:.2f}s, "
+            f"state={breaker.state} (expected an immediate rejection)")
+    gemini_client.request_bucket = TokenBucket(6000)
+    tokens = gemini_client.token_bucket.tokens
+    call(client)
+    if gemini_client.token_bucket.tokens < tokens or \
+            gemini_client.request_bucket.tokens < 6000:
+        failures.append("circuit: rejected call took rate capacity")
+
+    server.shutdown()
+    if failures:
+        for failure in failures:
+            print(f"FAILED: {failure}")
+        sys.exit(1)
+    print("OK, retries, deadlines and circuit recovery behave as expected")
+
+
+if __name__ == "__main__":
+    main()
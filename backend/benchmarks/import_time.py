@@ -0,0 +1,77 @@
+"""
+Benchmark for module import times.
+Imports each module in a fresh interpreter with `python -X importtime`
+and reports the median cumulative import time together with the
+heaviest dependencies, e.g. to check that importing the CRUD layer
+does not pull in the google-genai stack.
+
+Run from the backend directory:
+    python -m benchmarks.import_time --repeat 5
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+
+DEFAULT_MODULES = ["app.db.crud.journal", "app.services.gemini_agent", "app.main"]
+
+
+def measure(module: str) -> Dict[str, int]:
+    """
+    Imports a module in a fresh interpreter.
+
+    Args:
+        module (str): The module to import.
+
+    Returns:
+        Dict[str, int]: Cumulative import time in microseconds per
+        imported module.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main():
+    """Runs the benchmark and prints the results per module."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5,
+                        help="Number of heaviest dependencies to show")
+    args = parser.parse_args()
+
+    for module in args.modules:
+        runs: List[Dict[str, int]] = [measure(module) for _ in range(args.repeat)]
+        total = statistics.median(run[module] for run in runs)
+        genai_loaded = any(
+            name.startswith("google.genai") for name in runs[0]
+        )
+        print(f"{module}: {total / 1000:.0f} ms "
+              f"(google-genai loaded: {'yes' if genai_loaded else 'no'})")
+
+        top_level = {
+            name: statistics.median(run.get(name, 0) for run in runs)
+            for name in runs[0]
+            if "." not in name and name != module.split(".")[0]
+        }
+        heaviest = sorted(top_level.items(), key=lambda x: x[1], reverse=True)
+        for name, cumulative in heaviest[:args.top]:
+            print(f"  {name:<20}{cumulative / 1000:>8.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
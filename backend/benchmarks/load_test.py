@@ -0,0 +1,191 @@
+"""
+End-to-end load test for the Reflecta API.
+
+Simulates concurrent users issuing a weighted mix of journal, goal and
+analytics requests and reports throughput and p50/p95/p99 latency per
+endpoint. Meant to run against a server started with the fake Gemini
+backend, so no API key or quota is needed:
+
+    GEMINI_PROVIDER=fake uvicorn app.main:app
+    python -m benchmarks.load_test --base-url http://127.0.0.1:8000
+
+With --in-process the app is served through httpx's ASGI transport
+against a temporary database instead.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Tuple
+
+import httpx
+
+
+def entry_payload(rng: random.Random) -> dict:
+    """Builds a random journal entry."""
+    day = date.today() - timedelta(days=rng.randint(0, 90))
+    return {
+        "title": f"Entry {rng.randint(1, 10**6)}",
+        "date": day.isoformat(),
+        "content": " ".join(rng.choice([
+            "Went for a run.", "Worked on the project.", "Met friends.",
+            "Read a book.", "Felt tired.", "Cooked dinner.", "Slept well.",
+        ]) for _ in range(rng.randint(3, 20))),
+        "sentiment_level": rng.randint(1, 5),
+        "sleep_quality": rng.randint(1, 5),
+        "stress_level": rng.randint(1, 5),
+        "social_engagement": rng.randint(1, 5),
+    }
+
+
+def goal_payload(rng: random.Random) -> dict:
+    """Builds a random goal."""
+    return {
+        "title": rng.choice(["Run more", "Read daily", "Sleep early"]),
+        "type": "Recurring",
+        "category": rng.choice(["Health", "Personal Growth"]),
+        "priority": rng.choice(["High", "Medium", "Low"]),
+        "description": "Generated by the load test.",
+    }
+
+
+# (name, weight, request factory)
+SCENARIOS: List[Tuple[str, int, Callable]] = [
+    ("POST /journal/entries/", 2,
+     lambda c, rng: c.post("/journal/entries/", json=entry_payload(rng))),
+    ("GET /journal/entries/", 4,
+     lambda c, rng: c.get("/journal/entries/")),
+    ("GET /goals/", 3,
+     lambda c, rng: c.get("/goals/")),
+    ("POST /goals/", 1,
+     lambda c, rng: c.post("/goals/", json=goal_payload(rng))),
+    ("GET /analytics/stats/", 2,
+     lambda c, rng: c.get("/analytics/stats/", params={"period": "90days"})),
+    ("GET /analytics/trends/", 2,
+     lambda c, rng: c.get("/analytics/trends/", params={"period": "90days"})),
+    ("GET /analytics/correlations/", 1,
+     lambda c, rng: c.get("/analytics/correlations/",
+                          params={"period": "90days"})),
+]
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Returns the nearest-rank percentile of a list of values."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(p / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def user(
+    client: httpx.AsyncClient,
+    end: float,
+    seed: int,
+    results: Dict[str, List[Tuple[float, bool]]]
+) -> None:
+    """Issues requests from the scenario mix until the end time."""
+    rng = random.Random(seed)
+    names = [name for name, _, _ in SCENARIOS]
+    weights = [weight for _, weight, _ in SCENARIOS]
+    factories = {name: factory for name, _, factory in SCENARIOS}
+    while time.monotonic() < end:
+        name = rng.choices(names, weights)[0]
+        start = time.monotonic()
+        try:
+            response = await factories[name](client, rng)
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        results[name].append((time.monotonic() - start, ok))
+
+
+async def seed_data(client: httpx.AsyncClient, entries: int, goals: int) -> None:
+    """Creates goals and entries before the measurement starts."""
+    rng = random.Random(0)
+    for _ in range(goals):
+        await client.post("/goals/", json=goal_payload(rng))
+    semaphore = asyncio.Semaphore(10)
+
+    async def create():
+        async with semaphore:
+            await client.post("/journal/entries/", json=entry_payload(rng))
+
+    await asyncio.gather(*(create() for _ in range(entries)))
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Seeds data, runs the load test and prints the report."""
+    if args.in_process:
+        # pylint: disable=import-outside-toplevel
+        from app.db.database import create_tables
+        from app.main import app
+        create_tables()
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://loadtest"
+    else:
+        transport = None
+        base_url = args.base_url
+
+    limits = httpx.Limits(max_connections=args.users)
+    async with httpx.AsyncClient(
+        base_url=base_url, transport=transport, limits=limits, timeout=60
+    ) as client:
+        if args.seed_entries or args.seed_goals:
+            print(f"Seeding {args.seed_goals} goals and "
+                  f"{args.seed_entries} entries...")
+            await seed_data(client, args.seed_entries, args.seed_goals)
+
+        results: Dict[str, List[Tuple[float, bool]]] = defaultdict(list)
+        end = time.monotonic() + args.duration
+        await asyncio.gather(*(
+            user(client, end, seed, results) for seed in range(args.users)
+        ))
+
+    print(f"\n{'endpoint':<30}{'reqs':>7}{'errors':>8}{'req/s':>8}"
+          f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    total = 0
+    for name, _, _ in SCENARIOS:
+        samples = results.get(name)
+        if not samples:
+            continue
+        total += len(samples)
+        latencies = [latency * 1000 for latency, _ in samples]
+        errors = sum(1 for _, ok in samples if not ok)
+        print(f"{name:<30}{len(samples):>7}{errors:>8}"
+              f"{len(samples) / args.duration:>8.1f}"
+              f"{percentile(latencies, 50):>9.1f}"
+              f"{percentile(latencies, 95):>9.1f}"
+              f"{percentile(latencies, 99):>9.1f}")
+    print(f"\ntotal throughput: {total / args.duration:.1f} req/s "
+          f"with {args.users} users")
+
+
+def main():
+    """Parses command line arguments and runs the load test."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--in-process", action="store_true",
+                        help="Serve the app in-process with the fake "
+                        "Gemini backend and a temporary database")
+    parser.add_argument("--users", type=int, default=10,
+                        help="Number of concurrent simulated users")
+    parser.add_argument("--duration", type=float, default=30,
+                        help="Duration of the measurement in seconds")
+    parser.add_argument("--seed-entries", type=int, default=100)
+    parser.add_argument("--seed-goals", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.in_process:
+        os.environ.setdefault("GEMINI_PROVIDER", "fake")
+        os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(
+            tempfile.mkdtemp(), "loadtest.db"
+        ))
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Benchmark of JSON serialization and compression for a page of entries.
+
+Builds a page of journal entries with long content and linked goals and
+compares the CPU time of the serialization paths of the entry list
+endpoint as well as the bytes on the wire with and without gzip. Checks
+that json_response produces the same JSON as a FastAPI response_model
+for entries and goals, and exits with status 1 if it does not.
+
+Run from the backend directory:
+    python -m benchmarks.serialization --entries 100
+"""
+
+import argparse
+import gzip
+import json
+import random
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, List
+
+import orjson
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+from app.db.database import GoalModel, JournalEntryModel
+from app.models.entry_goal import Goal, GoalSummary, JournalEntry
+from app.utils.responses import json_response
+
+
+WORDS = ["run", "work", "friends", "read", "sleep", "cook", "walk", "music",
+         "morning", "coffee", "project", "planning", "tired", "happy"]
+ADAPTER = TypeAdapter(List[JournalEntry])
+GOAL_ADAPTER = TypeAdapter(List[Goal])
+SUMMARY_ADAPTER = TypeAdapter(List[GoalSummary])
+
+
+def build_entries(count: int) -> List[JournalEntryModel]:
+    """
+    Builds unsaved entries of realistic size linked to up to two of 20
+    goals. Like the API, each linked goal carries its own entries.
+
+    Args:
+        count (int): The number of entries.
+
+    Returns:
+        List[JournalEntryModel]: The entries.
+    """
+    rng = random.Random(0)
+    now = datetime.now(timezone.utc)
+
+    def text(words: int) -> str:
+        return " ".join(rng.choice(WORDS) for _ in range(words))
+
+    goals = [
+        GoalModel(id=goal_id, title=f"Goal {goal_id}", type="Recurring",
+                  category="Health", priority="Medium",
+                  description=text(30), progress=40, created_at=now)
+        for goal_id in range(1, 21)
+    ]
+    entries = []
+    for entry_id in range(1, count + 1):
+        entry = JournalEntryModel(
+            id=entry_id, title=f"Entry {entry_id}",
+            date=date.today() - timedelta(days=entry_id),
+            content=text(250), formatted_content=text(300),
+            created_at=now, sentiment_level=3, sleep_quality=4,
+            stress_level=2, social_engagement=3,
+            activities="Running, Reading", sentiments="Happy, Calm",
+        )
+        entry.goals = rng.sample(goals, rng.randint(0, 2))
+        entries.append(entry)
+    return entries
+
+
+def previous_path(entries: List[JournalEntryModel]) -> bytes:
+    """Models built in the endpoint, validated and dumped by FastAPI."""
+    models = [JournalEntry.model_validate(entry, from_attributes=True)
+              for entry in entries]
+    return ADAPTER.dump_json(ADAPTER.validate_python(models), by_alias=True)
+
+
+def encoder_path(entries: List[JournalEntryModel]) -> bytes:
+    """jsonable_encoder and json.dumps, as for routes without a model."""
+    models = [JournalEntry.model_validate(entry, from_attributes=True)
+              for entry in entries]
+    return json.dumps(jsonable_encoder(models, by_alias=True)).encode()
+
+
+def orjson_path(entries: List[JournalEntryModel]) -> bytes:
+    """Python dump of the validated models serialized by orjson."""
+    validated = ADAPTER.validate_python(entries, from_attributes=True)
+    return orjson.dumps(ADAPTER.dump_python(validated, by_alias=True))
+
+
+def adapter_path(entries: List[JournalEntryModel]) -> bytes:
+    """Single validation from attributes and dump_json (json_response)."""
+    return json_response(ADAPTER, entries).body
+
+
+PATHS: dict = {
+    "model_validate + FastAPI dump": previous_path,
+    "jsonable_encoder + json.dumps": encoder_path,
+    "TypeAdapter + orjson": orjson_path,
+    "TypeAdapter dump_json": adapter_path,
+}
+
+
+def check_response_model(entries: List[JournalEntryModel]) -> List[str]:
+    """
+    Compares json_response with the response_model serialization of
+    FastAPI for entries and for goals, which have aliased fields.
+
+    Args:
+        entries (List[JournalEntryModel]): The entries.
+
+    Returns:
+        List[str]: A description of every mismatch.
+    """
+    goals = list({goal.id: goal for entry in entries
+                  for goal in entry.goals}.values())
+    goals[0].target_date = date.today()
+    app = FastAPI()
+
+    @app.get("/model/entries", response_model=List[JournalEntry])
+    def model_entries():
+        return entries
+
+    @app.get("/adapter/entries")
+    def adapter_entries():
+        return json_response(ADAPTER, entries)
+
+    @app.get("/model/goals", response_model=List[Goal])
+    def model_goals():
+        return goals
+
+    @app.get("/adapter/goals")
+    def adapter_goals():
+        return json_response(GOAL_ADAPTER, goals)
+
+    @app.get("/model/summaries", response_model=List[GoalSummary])
+    def model_summaries():
+        return goals
+
+    @app.get("/adapter/summaries")
+    def adapter_summaries():
+        return json_response(SUMMARY_ADAPTER, goals)
+
+    failures = []
+    client = TestClient(app)
+    for name in ("entries", "goals", "summaries"):
+        expected = client.get(f"/model/{name}").json()
+        actual = client.get(f"/adapter/{name}").json()
+        if actual != expected:
+            failures.append(f"json_response differs from response_model "
+                            f"for {name}")
+    return failures
+
+
+def median_ms(function: Callable, repeat: int) -> float:
+    """Returns the median duration of a function call in milliseconds."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations) * 1000
+
+
+def main():
+    """Runs the serialization and compression benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    entries = build_entries(args.entries)
+    print(f"Serialization of {args.entries} entries")
+    print(f"{'path':<34}{'median ms':>10}")
+    for name, path in PATHS.items():
+        print(f"{name:<34}{median_ms(lambda: path(entries), args.repeat):>10.2f}")
+
+    body = adapter_path(entries)
+    print(f"\n{'encoding':<34}{'bytes':>10}{'ratio':>8}{'median ms':>11}")
+    print(f"{'identity':<34}{len(body):>10}{1:>8.2f}{0:>11.2f}")
+    for level in (1, 6, 9):
+        size = len(gzip.compress(body, compresslevel=level))
+        duration = median_ms(
+            lambda level=level: gzip.compress(body, compresslevel=level),
+            args.repeat,
+        )
+        print(f"{f'gzip level {level}':<34}{size:>10}"
+              f"{size / len(body):>8.2f}{duration:>11.2f}")
+
+    failures = check_response_model(entries)
+    if failures:
+        print("FAILED: " + "; ".join(failures))
+        sys.exit(1)
+    print("OK, json_response matches response_model")
+
+
+if __name__ == "__main__":
+    main()
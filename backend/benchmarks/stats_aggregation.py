@@ -0,0 +1,135 @@
+"""
+Benchmark of the /analytics/stats/ aggregation.
+
+Seeds databases with 1k, 10k and 100k entries, a third of them without a
+sleep rating, and compares the previous implementation (loading the
+entries as ORM objects and summing in Python) with the single aggregate
+query of AnalyticsService.calculate_averages. Reports the median time
+and the peak Python memory of each, and checks that averages skip
+missing values. Exits with status 1 if a check fails.
+
+Run from the backend directory:
+    python -m benchmarks.stats_aggregation --sizes 1000 10000 100000
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Tuple
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.database import JournalEntryModel
+from app.services.analytics import AnalyticsService
+from benchmarks.crud_analytics import seed_database
+
+
+PAST_DAYS = 6 * 365
+
+
+def python_averages(db: Session) -> dict:
+    """The previous implementation: ORM objects and Python sums."""
+    cutoff_date = datetime.now(timezone.utc) - timedelta(days=PAST_DAYS)
+    entries = db.query(JournalEntryModel).filter(
+        JournalEntryModel.date >= cutoff_date
+    ).all()
+    total = len(entries)
+    return {
+        "sleep": sum(e.sleep_quality for e in entries
+                     if e.sleep_quality is not None) / total,
+        "words": sum(len(e.content.split()) for e in entries) / total,
+    }
+
+
+def sql_averages(db: Session) -> dict:
+    """The aggregate query."""
+    averages = AnalyticsService(db).calculate_averages(PAST_DAYS)
+    return {"sleep": averages.sleep, "words": averages.average_words_per_entry}
+
+
+def measure(function: Callable, session_factory: Callable,
+            repeat: int) -> Tuple[float, float, dict]:
+    """
+    Runs a function with fresh sessions.
+
+    Returns:
+        Tuple[float, float, dict]: The median duration in milliseconds,
+        the peak traced memory in KiB and the result.
+    """
+    durations = []
+    for _ in range(repeat):
+        db = session_factory()
+        try:
+            start = time.perf_counter()
+            result = function(db)
+            durations.append(time.perf_counter() - start)
+        finally:
+            db.close()
+
+    db = session_factory()
+    try:
+        tracemalloc.start()
+        function(db)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    finally:
+        db.close()
+    return statistics.median(durations) * 1000, peak / 1024, result
+
+
+def main():
+    """Runs the stats benchmark and the null-handling check."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--data-dir", default=os.path.join(
+        tempfile.gettempdir(), "reflecta-benchmarks"))
+    args = parser.parse_args()
+    os.makedirs(args.data_dir, exist_ok=True)
+
+    failures = []
+    print(f"{'implementation':<16}{'entries':>9}{'median ms':>11}"
+          f"{'peak KiB':>11}{'sleep avg':>11}")
+    for size in args.sizes:
+        path = os.path.join(args.data_dir, f"stats_{size}.db")
+        if not os.path.exists(path):
+            print(f"Seeding {size} entries...")
+            seed_database(path, size)
+            with create_engine(f"sqlite:///{path}").begin() as connection:
+                connection.execute(text(
+                    "UPDATE journal_entries SET sleep_quality = NULL "
+                    "WHERE id % 3 = 0"
+                ))
+        engine = create_engine(f"sqlite:///{path}")
+        with engine.connect() as connection:
+            expected = connection.execute(text(
+                "SELECT AVG(sleep_quality) FROM journal_entries"
+            )).scalar()
+        session_factory = sessionmaker(bind=engine)
+
+        for name, function in (("python", python_averages),
+                               ("sql", sql_averages)):
+            duration, peak, result = measure(function, session_factory,
+                                             args.repeat)
+            print(f"{name:<16}{size:>9}{duration:>11.1f}{peak:>11.0f}"
+                  f"{result['sleep']:>11.3f}")
+            if name == "sql" and abs(result["sleep"] - expected) > 1e-9:
+                failures.append(f"sleep average {result['sleep']} != "
+                                f"{expected} for {size} entries")
+        engine.dispose()
+
+    if failures:
+        print("FAILED: " + "; ".join(failures))
+        sys.exit(1)
+    print("OK, averages skip missing values")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Checks the triggers that copy the comma-separated activities and
+sentiments of journal entries into entry_activities and entry_sentiments.
+
+Tags with tabs, newlines and other control characters, quotes and
+backslashes are written by plain INSERT and UPDATE statements, by the
+backfill of entries that existed before the triggers, and through the
+upgrade of triggers created by an older version. The normalized tables
+must then match splitting the columns in Python. Exits with status 1 if
+a check fails.
+
+Run from the backend directory:
+    python -m benchmarks.tag_triggers
+"""
+
+import os
+import sys
+import tempfile
+from datetime import date
+from typing import List, Optional, Set, Tuple
+
+from sqlalchemy import text
+
+
+TAGS = [
+    "a\tb, c",
+    "line1\nline2",
+    "cr\r\nlf, \x01ctrl\x1f",
+    'say "hi", back\\slash, \\", a\\,b',
+    "Running, running,  , ,",
+    "café, 日記",
+    "",
+    None,
+]
+
+# The split used before json_quote, kept to check the upgrade path
+OLD_SPLIT = (
+    "json_each('[\"' || replace(replace(replace({column}, '\"', ''), "
+    "'\\', ''), ',', '\",\"') || '\"]')"
+)
+
+
+def split(value: Optional[str]) -> List[str]:
+    """Splits a column like the triggers do (trim() strips spaces)."""
+    return [tag.strip(" ") for tag in (value or "").split(",")
+            if tag.strip(" ")]
+
+
+def expected_tags(connection) -> Tuple[Set[tuple], Set[tuple]]:
+    """Returns the activities and sentiments expected from the entries."""
+    activities, sentiments = set(), set()
+    for entry_id, entry_activities, entry_sentiments in connection.execute(
+        text("SELECT id, activities, sentiments FROM journal_entries")
+    ):
+        activities.update(
+            (entry_id, tag.lower()) for tag in split(entry_activities))
+        sentiments.update(
+            (entry_id, tag) for tag in split(entry_sentiments))
+    return activities, sentiments
+
+
+def stored_tags(connection) -> Tuple[Set[tuple], Set[tuple]]:
+    """Returns the activities and sentiments in the normalized tables."""
+    activities = {
+        (entry_id, name.lower()) for entry_id, name in connection.execute(
+            text("SELECT journal_id, name FROM entry_activities "
+                 "JOIN activities ON activities.id = activity_id"))
+    }
+    sentiments = set(connection.execute(
+        text("SELECT journal_id, sentiment FROM entry_sentiments")
+    ).all())
+    return activities, sentiments
+
+
+def insert_entries(connection) -> None:
+    """Inserts one entry per tag string, with the same sentiments."""
+    for tags in TAGS:
+        connection.execute(text(
+            "INSERT INTO journal_entries "
+            "(title, date, content, activities, sentiments) "
+            "VALUES ('Tags', :date, 'content', :tags, :tags)"
+        ), {"date": date.today().isoformat(), "tags": tags})
+
+
+def compare(stage: str, connection, failures: List[str]) -> None:
+    """Compares the normalized tables with the entry columns."""
+    expected = expected_tags(connection)
+    stored = stored_tags(connection)
+    for name, want, got in zip(("activities", "sentiments"), expected,
+                               stored):
+        if want != got:
+            failures.append(
+                f"{stage}: {name} missing {sorted(want - got)}, "
+                f"unexpected {sorted(got - want)}")
+
+
+def main():
+    """Runs the checks against a temporary database."""
+    path = os.path.join(tempfile.mkdtemp(), "journal.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    # pylint: disable=import-outside-toplevel
+    from app.db import database
+
+    failures: List[str] = []
+
+    # Entries that existed before the triggers are backfilled
+    database.Base.metadata.create_all(bind=database.engine)
+    with database.engine.begin() as connection:
+        insert_entries(connection)
+    try:
+        database.create_tables()
+    except Exception as exc:  # pylint: disable=broad-except
+        failures.append(f"backfill: create_tables failed: {exc}")
+    with database.engine.begin() as connection:
+        compare("backfill", connection, failures)
+
+    # Inserts, updates and deletes go through the triggers
+    with database.engine.begin() as connection:
+        try:
+            insert_entries(connection)
+            for offset, tags in enumerate(reversed(TAGS)):
+                connection.execute(text(
+                    "UPDATE journal_entries "
+                    "SET activities = :tags, sentiments = :tags "
+                    "WHERE id = :id"
+                ), {"tags": tags, "id": offset + 1})
+            connection.execute(text(
+                "DELETE FROM journal_entries WHERE id = 2"))
+        except Exception as exc:  # pylint: disable=broad-except
+            failures.append(f"triggers: statement failed: {exc}")
+    with database.engine.begin() as connection:
+        compare("triggers", connection, failures)
+
+    # Triggers of an older version are replaced and the tables rebuilt
+    new_split = database.split_tags
+    database.split_tags = lambda column: OLD_SPLIT.format(column=column)
+    old_inserts = database.tag_inserts("new")
+    database.split_tags = new_split
+    with database.engine.begin() as connection:
+        for trigger in ("insert", "update", "delete"):
+            connection.execute(text(
+                f"DROP TRIGGER journal_entries_tags_{trigger}"))
+        connection.execute(text(
+            "CREATE TRIGGER journal_entries_tags_insert "
+            f"AFTER INSERT ON journal_entries BEGIN {old_inserts}END"))
+        connection.execute(text("DELETE FROM entry_sentiments"))
+    database.create_tag_triggers()
+    with database.engine.begin() as connection:
+        triggers = dict(connection.execute(text(
+            "SELECT name, sql FROM sqlite_master "
+            "WHERE name LIKE 'journal_entries_tags_%'")).all())
+        if len(triggers) != 3 or "json_quote" not in \
+                triggers.get("journal_entries_tags_insert", ""):
+            failures.append(f"upgrade: triggers not replaced: {triggers}")
+    with database.engine.begin() as connection:
+        compare("upgrade", connection, failures)
+        try:
+            insert_entries(connection)
+        except Exception as exc:  # pylint: disable=broad-except
+            failures.append(f"upgrade: insert failed: {exc}")
+    with database.engine.begin() as connection:
+        compare("upgrade", connection, failures)
+
+    if failures:
+        for failure in failures:
+            print(f"FAILED: {failure}")
+        sys.exit(1)
+    print(f"OK, tags of {len(TAGS)} edge cases stay in sync")
+
+
+if __name__ == "__main__":
+    main()
@@ -107,6 +107,20 @@ export const deleteJournalEntry = async (entryId) => {
   return true;
 };
 
+// operations: [{ op: "create" | "update" | "delete", id, data }]
+export const batchJournalEntries = async (operations) => {
+  const response = await fetch(`${API_BASE_URL}/journal/entries/batch`, {
+    method: "POST",
+    headers: {
+      "Content-Type": "application/json",
+    },
+    body: JSON.stringify({ operations }),
+  });
+  const result = await handleResponse(response);
+  notifyCalendarUpdate();
+  return result;
+};
+
 export const fetchGoals = async () => {
   const response = await fetch(`${API_BASE_URL}/goals/`);
   return handleResponse(response);
@@ -133,6 +147,13 @@ export const getAnalyticsCorrelations = async (period) => {
   return handleResponse(response);
 };
 
+export const getAnalyticsCorrelationInsights = async (period) => {
+  const response = await fetch(
+    `${API_BASE_URL}/analytics/correlations/insights/?period=${period}`
+  );
+  return handleResponse(response);
+};
+
 export const getAnalyticsStats = async (period) => {
   const response = await fetch(
     `${API_BASE_URL}/analytics/stats/?period=${period}`
@@ -199,6 +220,20 @@ export const deleteGoal = async (goalId) => {
   return true;
 };
 
+// operations: [{ op: "create" | "update" | "delete", id, data }]
+export const batchGoals = async (operations) => {
+  const response = await fetch(`${API_BASE_URL}/goals/batch`, {
+    method: "POST",
+    headers: {
+      "Content-Type": "application/json",
+    },
+    body: JSON.stringify({ operations }),
+  });
+  const result = await handleResponse(response);
+  notifyCalendarUpdate();
+  return result;
+};
+
 export const sendChatMessage = async (message) => {
   const response = await fetch(`${API_BASE_URL}/ai/chat/`, {
     method: "POST",
@@ -211,13 +246,14 @@ export const sendChatMessage = async (message) => {
   return data.text;
 };
 
-export const getJournalQuestion = async (content) => {
+export const getJournalQuestion = async (content, signal) => {
   const response = await fetch(`${API_BASE_URL}/ai/journal-question/`, {
     method: "POST",
     headers: {
       "Content-Type": "application/json",
     },
     body: JSON.stringify({ content: content }),
+    signal,
   });
   const data = await handleResponse(response);
   return data.question;
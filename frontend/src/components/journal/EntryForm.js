@@ -26,6 +26,7 @@ const EntryForm = ({ onClose, onSave, editEntry = null }) => {
   const [aiQuestion, setAiQuestion] = useState("");
   const [loadingAiQuestion, setLoadingAiQuestion] = useState(false);
   const debounceTimeoutRef = useRef(null);
+  const aiQuestionControllerRef = useRef(null);
 
   useEffect(() => {
     if (editEntry) {
@@ -66,16 +67,35 @@ const EntryForm = ({ onClose, onSave, editEntry = null }) => {
     }
   }, [editEntry]);
 
+  const cancelAiQuestion = useCallback(() => {
+    if (aiQuestionControllerRef.current) {
+      aiQuestionControllerRef.current.abort();
+      aiQuestionControllerRef.current = null;
+      setLoadingAiQuestion(false);
+    }
+  }, []);
+
   const fetchAiQuestion = useCallback(async (currentContent) => {
+    const controller = new AbortController();
+    aiQuestionControllerRef.current = controller;
     setLoadingAiQuestion(true);
     try {
-      const question = await getJournalQuestion(currentContent);
+      const question = await getJournalQuestion(
+        currentContent,
+        controller.signal
+      );
       setAiQuestion(question);
     } catch (error) {
+      if (error.name === "AbortError") {
+        return; // Superseded by newer content, keep the previous question
+      }
       console.error("Error fetching AI question:", error);
       setAiQuestion("Could not load AI question. Please try again.");
     } finally {
-      setLoadingAiQuestion(false);
+      if (aiQuestionControllerRef.current === controller) {
+        aiQuestionControllerRef.current = null;
+        setLoadingAiQuestion(false);
+      }
     }
   }, []);
 
@@ -94,8 +114,10 @@ const EntryForm = ({ onClose, onSave, editEntry = null }) => {
       if (debounceTimeoutRef.current) {
         clearTimeout(debounceTimeoutRef.current);
       }
+      // Typing again makes the pending question stale, so abort it
+      cancelAiQuestion();
     };
-  }, [aiJournalingActive, entry.content, fetchAiQuestion]);
+  }, [aiJournalingActive, entry.content, fetchAiQuestion, cancelAiQuestion]);
 
   const handleChange = (e) => {
     const { name, value, type } = e.target;
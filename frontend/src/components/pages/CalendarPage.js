@@ -52,6 +52,7 @@ const CalendarPage = () => {
     mutationFn: createJournalEntry,
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ["calendarData"] });
+      queryClient.invalidateQueries({ queryKey: ["analytics"] });
       closeEntryFormModal();
     },
   });
@@ -61,6 +62,7 @@ const CalendarPage = () => {
       updateJournalEntry(entryId, entryData),
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ["calendarData"] });
+      queryClient.invalidateQueries({ queryKey: ["analytics"] });
       closeEntryFormModal();
     },
   });
@@ -69,6 +71,7 @@ const CalendarPage = () => {
     mutationFn: deleteJournalEntry,
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ["calendarData"] });
+      queryClient.invalidateQueries({ queryKey: ["analytics"] });
       setSelectedEntry(null); // Close detail modal if open
     },
   });
@@ -173,6 +173,7 @@ const JournalPage = () => {
     mutationFn: createJournalEntry,
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ["journalEntries"] });
+      queryClient.invalidateQueries({ queryKey: ["analytics"] });
       closeFormModal();
     },
     onError: (err) => {
@@ -186,6 +187,7 @@ const JournalPage = () => {
       updateJournalEntry(entryId, entryData),
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ["journalEntries"] });
+      queryClient.invalidateQueries({ queryKey: ["analytics"] });
       closeFormModal();
     },
     onError: (err) => {
@@ -198,6 +200,7 @@ const JournalPage = () => {
     mutationFn: deleteJournalEntry,
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ["journalEntries"] });
+      queryClient.invalidateQueries({ queryKey: ["analytics"] });
       if (showEntryDetailModal) {
         closeDetailModal();
       }